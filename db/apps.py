@@ -0,0 +1,21 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class DatabaseConfig(AppConfig):
+    """
+    Database Application Configuration.
+    """
+    name = "db"
+
+    def ready(self):
+        """
+        Perform additional setup once the database application is ready.
+        """
+        # Local level import of our connection utilities.
+        # Avoid circular imports.
+        from db.connections import configure_connection
+
+        # Every new connection (one is opened per thread) should
+        # be configured with our sqlite pragmas.
+        connection_created.connect(configure_connection, dispatch_uid="db.configure_connection")
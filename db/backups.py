@@ -0,0 +1,184 @@
+from settings import (
+    DB_FILE, DB_BUSY_TIMEOUT, LOCAL_DATA_BACKUP_DIR, BACKUP_INTERVAL, BACKUP_PAGES, BACKUP_SLEEP, BACKUP_COMPRESS,
+    BACKUP_VERIFY, BACKUP_LIMIT
+)
+
+from logger import application_logger
+
+from datetime import datetime
+
+import threading
+import sqlite3
+import shutil
+import gzip
+import time
+import os
+
+
+logger = application_logger()
+
+
+class BackupHandler(object):
+    """
+    Background database backup job, a single backup is taken each day using SQLite's online backup API.
+
+    Pages are copied in small steps, so running instances can continue to write while a backup is in progress, and a
+    consistent snapshot is always produced. Backups are optionally verified and compressed, and only the most recent
+    backups are kept.
+    """
+    def __init__(self, interval=BACKUP_INTERVAL, limit=BACKUP_LIMIT, compress=BACKUP_COMPRESS, verify=BACKUP_VERIFY):
+        """
+        Initialize backup handler, setting up default variables.
+        """
+        self._interval = interval
+        self._limit = limit
+        self._compress = compress
+        self._verify = verify
+
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """
+        Start the thread used to periodically take our database backups.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="titandash.backups", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """
+        Backup thread loop, taking a backup whenever one is not yet available for the current day.
+        """
+        while True:
+            try:
+                self.backup()
+            # Failing to take a backup should never stop the backup
+            # thread, another attempt is made on the next interval.
+            except Exception:
+                logger.exception("unable to backup database.")
+
+            time.sleep(self._interval)
+
+    @staticmethod
+    def backups():
+        """
+        Retrieve the file names of every available backup, oldest first.
+        """
+        return sorted(
+            backup for backup in os.listdir(LOCAL_DATA_BACKUP_DIR)
+            if backup.startswith("titandash_") and not backup.endswith(".tmp") and os.path.isfile(os.path.join(LOCAL_DATA_BACKUP_DIR, backup))
+        )
+
+    @staticmethod
+    def _remove_temporary():
+        """
+        Remove any temporary files left behind by a backup that was interrupted.
+        """
+        for temporary in os.listdir(LOCAL_DATA_BACKUP_DIR):
+            if temporary.startswith("titandash_") and temporary.endswith(".tmp"):
+                try:
+                    os.remove(os.path.join(LOCAL_DATA_BACKUP_DIR, temporary))
+                except OSError:
+                    logger.warning("unable to remove temporary backup file: {temporary}".format(temporary=temporary))
+
+    @staticmethod
+    def _copy(destination):
+        """
+        Copy our database into the destination file, using the online backup API in paged steps when available.
+        """
+        _source = sqlite3.connect(DB_FILE, timeout=DB_BUSY_TIMEOUT)
+        _destination = sqlite3.connect(destination)
+
+        try:
+            if hasattr(_source, "backup"):
+                _source.backup(_destination, pages=BACKUP_PAGES, sleep=BACKUP_SLEEP)
+            else:
+                # The backup API is unavailable on older python versions, dump the database
+                # from within a single read transaction instead, still producing a consistent snapshot.
+                _source.isolation_level = None
+                _source.execute("BEGIN")
+                _destination.isolation_level = None
+                _destination.execute("BEGIN")
+
+                for index, statement in enumerate(_source.iterdump()):
+                    if statement in ("BEGIN TRANSACTION;", "COMMIT;"):
+                        continue
+
+                    _destination.execute(statement)
+
+                    # Yielding periodically, keeping our own impact
+                    # on running instances to a minimum.
+                    if index and not index % BACKUP_PAGES:
+                        time.sleep(BACKUP_SLEEP)
+
+                _destination.execute("COMMIT")
+                _source.execute("COMMIT")
+        finally:
+            _destination.close()
+            _source.close()
+
+    @staticmethod
+    def _verified(backup):
+        """
+        Determine whether or not the specified backup passes an integrity check.
+        """
+        _connection = sqlite3.connect(backup)
+
+        try:
+            return _connection.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        finally:
+            _connection.close()
+
+    def backup(self, force=False):
+        """
+        Take a new database backup if one is not yet available for the current day, returning the backup path if one was taken.
+        """
+        _name = "titandash_{date}.db".format(date=datetime.now().date().strftime("%Y-%m-%d"))
+
+        self._remove_temporary()
+
+        if not force and any(backup.startswith(_name) for backup in self.backups()):
+            return None
+
+        _path = os.path.join(LOCAL_DATA_BACKUP_DIR, _name)
+        # Backups are written to a temporary file first, ensuring an
+        # incomplete backup is never mistaken for a valid backup.
+        _temp = _path + ".tmp"
+        _temp_compressed = _path + ".gz.tmp"
+
+        try:
+            self._copy(destination=_temp)
+
+            if self._verify and not self._verified(backup=_temp):
+                logger.error("database backup: {backup} failed integrity check, discarding backup.".format(backup=_name))
+                return None
+
+            if self._compress:
+                # Compressed backups are also written to a temporary file,
+                # only ever moved into place once completely written.
+                with open(_temp, "rb") as source, gzip.open(_temp_compressed, "wb") as destination:
+                    shutil.copyfileobj(source, destination)
+                _path += ".gz"
+                os.replace(_temp_compressed, _path)
+            else:
+                os.replace(_temp, _path)
+        finally:
+            for temporary in (_temp, _temp_compressed):
+                if os.path.exists(temporary):
+                    os.remove(temporary)
+
+        logger.info("database backup: {backup} has been created.".format(backup=os.path.basename(_path)))
+
+        # Removing our oldest backups once the limit
+        # of available backups has been exceeded.
+        for backup in self.backups()[:-self._limit]:
+            os.remove(os.path.join(LOCAL_DATA_BACKUP_DIR, backup))
+
+        return _path
+
+
+# Create an instance of the backup handler object
+# that can be used throughout the application.
+backup_handler = BackupHandler()
@@ -0,0 +1,46 @@
+from settings import DB_PRAGMAS
+
+from django.db import connections
+
+from contextlib import contextmanager
+from functools import wraps
+
+
+def configure_connection(sender, connection, **kwargs):
+    """
+    Apply our sqlite pragmas whenever a new database connection is opened.
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        for pragma, value in DB_PRAGMAS:
+            cursor.execute("PRAGMA {pragma} = {value}".format(pragma=pragma, value=value))
+
+
+@contextmanager
+def thread_connection():
+    """
+    Explicitly manage the lifecycle of the database connection used by the current thread.
+
+    Django opens a connection per thread lazily and never closes connections opened outside of a request, any
+    long running or pooled threads (bots, scheduled functions) should close their connection once they're done.
+    """
+    try:
+        yield
+    finally:
+        # Only the connections opened by the current
+        # thread are closed here.
+        connections.close_all()
+
+
+def with_thread_connection(function):
+    """
+    Decorate the specified function so that the current threads database connection is closed once it returns.
+    """
+    @wraps(function)
+    def wrapped(*args, **kwargs):
+        with thread_connection():
+            return function(*args, **kwargs)
+
+    return wrapped
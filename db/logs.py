@@ -0,0 +1,288 @@
+from settings import LOG_INDEX_INTERVAL, LOG_PAGE_MAX_LENGTH
+
+import math
+import json
+import os
+
+
+class LogReader(object):
+    """
+    Seekable log file reader, lines are read directly from their position within the log file.
+
+    A sparse index is kept alongside each log file, storing the byte offset of every "interval" line. The index is
+    updated incrementally, only the lines written since the last read are ever scanned, and is rebuilt whenever the
+    log file is replaced (rotated).
+    """
+    chunk_size = 1024 * 64
+
+    def __init__(self, log, interval=LOG_INDEX_INTERVAL):
+        """
+        Initialize log reader, setting up default variables.
+        """
+        self.log = log
+        self.index_file = log + ".idx"
+        self.interval = interval
+
+        self._index = None
+
+    def _load(self, stat):
+        """
+        Load the index present alongside our log file, any missing or stale index is discarded.
+        """
+        try:
+            with open(self.index_file) as file:
+                _index = json.load(file)
+        except (OSError, ValueError):
+            _index = None
+
+        # Our log file being replaced or truncated, or our interval
+        # changing, invalidates any existing index for the file.
+        if not _index or _index.get("inode") != stat.st_ino or _index.get("interval") != self.interval or _index.get("position", 0) > stat.st_size:
+            _index = {"inode": stat.st_ino, "interval": self.interval, "lines": 0, "position": 0, "offsets": []}
+
+        return _index
+
+    def index(self):
+        """
+        Update and return the index for our log file, scanning only the lines written since the index was last updated.
+        """
+        _stat = os.stat(self.log)
+        _index = self._index if self._index and self._index["inode"] == _stat.st_ino and self._index["position"] <= _stat.st_size else self._load(stat=_stat)
+
+        if _index["position"] == _stat.st_size:
+            self._index = _index
+            return _index
+
+        with open(self.log, "rb") as file:
+            file.seek(_index["position"])
+            _position = _index["position"]
+
+            for line in file:
+                # Any incomplete last line is only ever
+                # indexed once it has been completed.
+                if not line.endswith(b"\n"):
+                    break
+
+                # Storing the offset of the line starting every interval,
+                # any line can then be reached with a single seek.
+                if _index["lines"] % self.interval == 0:
+                    _index["offsets"].append(_position)
+
+                _index["lines"] += 1
+                _position += len(line)
+
+        _index["position"] = _position
+
+        try:
+            with open(self.index_file, "w") as file:
+                json.dump(_index, file)
+        # An index that can't be saved is only kept
+        # in memory, reading continues regardless.
+        except OSError:
+            pass
+
+        self._index = _index
+
+        return _index
+
+    def count(self):
+        """
+        Retrieve the amount of lines present within our log file, including any incomplete last line.
+        """
+        _index = self.index()
+
+        return _index["lines"] + (1 if os.path.getsize(self.log) > _index["position"] else 0)
+
+    @staticmethod
+    def _decode(line):
+        """
+        Decode a single line read from our log file.
+        """
+        return line.decode("utf-8", errors="replace").rstrip("\r\n")
+
+    def lines(self, start=0, count=None):
+        """
+        Retrieve "count" lines (or all remaining lines) beginning with the line number specified (starting at zero).
+        """
+        _index = self.index()
+        _lines = []
+
+        if start < 0 or count == 0:
+            return _lines
+
+        _offsets = _index["offsets"]
+        _block = min(start // self.interval, len(_offsets) - 1) if _offsets else -1
+
+        with open(self.log, "rb") as file:
+            # Seek to the closest indexed line before our start,
+            # skipping at most a single interval of lines.
+            if _block >= 0:
+                file.seek(_offsets[_block])
+
+            _number = _block * self.interval if _block >= 0 else 0
+
+            for line in file:
+                if _number >= start:
+                    _lines.append(self._decode(line=line))
+
+                    if count is not None and len(_lines) >= count:
+                        break
+
+                _number += 1
+
+        return _lines
+
+    def tail(self, count):
+        """
+        Retrieve the last "count" lines present within our log file, reading backwards from the end of the file.
+        """
+        if count <= 0:
+            return []
+
+        with open(self.log, "rb") as file:
+            file.seek(0, os.SEEK_END)
+
+            _position = file.tell()
+            _buffer = b""
+
+            # Reading blocks backwards from the end of the file, until
+            # enough lines are available (or the start is reached).
+            while _position > 0 and _buffer.count(b"\n") <= count:
+                _size = min(self.chunk_size, _position)
+                _position -= _size
+
+                file.seek(_position)
+                _buffer = file.read(_size) + _buffer
+
+        _lines = _buffer.split(b"\n")
+
+        # A trailing newline leaves an empty last line,
+        # which isn't a line of its own.
+        if _lines and not _lines[-1]:
+            _lines.pop()
+
+        return [self._decode(line=line) for line in _lines[-count:]]
+
+    def page(self, page=0, length=LOG_PAGE_MAX_LENGTH, reverse=False):
+        """
+        Retrieve a single page of lines, reverse pages begin with the last lines present within our log file.
+        """
+        length = max(1, min(length, LOG_PAGE_MAX_LENGTH))
+        page = max(0, page)
+
+        _total = self.count()
+        _start = page * length
+
+        if reverse:
+            # The first reverse page is read backwards from the end of the
+            # file, any other page is read through a seek to its start.
+            _end = _total - _start
+            _start = max(0, _end - length)
+            _lines = self.tail(count=_end - _start) if page == 0 else self.lines(start=_start, count=max(0, _end - _start))
+        else:
+            _lines = self.lines(start=_start, count=length)
+
+        return {
+            "data": [{"index": _start + number + 1, "line": line} for number, line in enumerate(_lines)],
+            "length": _total,
+            "page": page,
+            "pages": int(math.ceil(_total / length))
+        }
+
+
+class StructuredLogReader(object):
+    """
+    Structured (jsonl) log file reader, records are queried through the inverted index kept alongside the log file.
+
+    Only the records indexed for the event type and function queried are ever read, along with any records written
+    since the index was last saved. Queries without an event type or function scan the entire file.
+    """
+    fields = ("event", "function")
+
+    def __init__(self, log):
+        """
+        Initialize structured log reader, setting up default variables.
+        """
+        self.log = log
+        self.index_file = log + ".idx"
+
+    def index(self):
+        """
+        Load the index present alongside our log file, decoding each list of offsets.
+        """
+        try:
+            with open(self.index_file) as file:
+                _index = json.load(file)
+        except (OSError, ValueError):
+            return {"position": 0, "event": {}, "function": {}}
+
+        for field in self.fields:
+            for value, deltas in _index[field].items():
+                _offset, _offsets = 0, []
+                # Offsets are stored as the difference
+                # from the previous offset.
+                for delta in deltas:
+                    _offset += delta
+                    _offsets.append(_offset)
+                _index[field][value] = _offsets
+
+        return _index
+
+    @staticmethod
+    def _matches(record, filters, since=None, until=None):
+        """
+        Determine whether or not the specified record matches every filter present.
+        """
+        if since and record["time"] < since or until and record["time"] > until:
+            return False
+
+        return all(record.get(field) == value for field, value in filters.items())
+
+    def query(self, event=None, function=None, image=None, key=None, since=None, until=None, limit=None):
+        """
+        Query our log file for records matching every filter specified, dates are expected as iso formatted strings.
+        """
+        _index = self.index()
+        _filters = {field: value for field, value in (("event", event), ("function", function), ("image", image), ("key", key)) if value is not None}
+        _offsets = None
+
+        # Intersecting the offsets of every indexed filter, only
+        # records matching each of them are read from the file.
+        for field in self.fields:
+            if field in _filters:
+                _field = set(_index[field].get(_filters[field], []))
+                _offsets = _field if _offsets is None else _offsets & _field
+
+        _records = []
+
+        with open(self.log, "rb") as file:
+            def _read(offsets):
+                for offset in offsets:
+                    file.seek(offset)
+                    yield file.readline()
+
+            def _scan(position):
+                file.seek(position)
+                for line in file:
+                    yield line
+
+            # Any records written since our index was last saved
+            # are always scanned, the index only covers older records.
+            _lines = [_scan(position=0)] if _offsets is None else [_read(offsets=sorted(_offsets)), _scan(position=_index["position"])]
+
+            for lines in _lines:
+                for line in lines:
+                    # An incomplete last line is ignored until
+                    # the record has been completely written.
+                    if not line.endswith(b"\n"):
+                        break
+
+                    _record = json.loads(line.decode("utf-8"))
+
+                    if self._matches(record=_record, filters=_filters, since=since, until=until):
+                        _records.append(_record)
+
+                        if limit is not None and len(_records) >= limit:
+                            return _records
+
+        return _records
@@ -1,17 +1,21 @@
-from django.db.models import Manager
+from django.db import transaction
+from django.db.models import Manager, Prefetch, F, Min, Max, prefetch_related_objects
 
-from settings import VERSION
+from settings import VERSION, STAGE_SERIES_CHUNK_SIZE, STAGE_SERIES_ROLLUPS, STAGE_SERIES_MAX_POINTS
 
 from modules.bot.core.configurations import ARTIFACT_TIER_MAP
 from modules.bot.core.enumerations import State
+from modules.bot.core.globals import Globals
+from modules.bot.core.utilities import convert_to_number, parse_play_time
 
 from modules.auth.authenticator import Authenticator
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
+import hashlib
+import math
 import uuid
 import json
-import logging
 
 
 class ApplicationStateManager(Manager):
@@ -35,6 +39,10 @@ class ApplicationStateManager(Manager):
         """
         Set the current application state to the specified value.
         """
+        # Publish the state within this process first, running instances
+        # will pick up the new state without querying the database.
+        Globals().set_application_state(state=state)
+
         return self.grab().update(state=state)
 
     def state(self):
@@ -99,10 +107,44 @@ class UserManager(Manager):
         return False
 
 
+# Artifacts are static once seeded, serialized artifacts are kept in memory
+# keyed by both their primary key and name, "None" until first loaded.
+_ARTIFACT_JSON_CACHE = None
+
+
 class ArtifactManager(Manager):
     """
     Artifact Model Manager.
     """
+    def cached_json(self, pk=None, name=None):
+        """
+        Retrieve the serialized artifact with the specified primary key or name from our in-memory cache.
+        """
+        global _ARTIFACT_JSON_CACHE
+
+        if _ARTIFACT_JSON_CACHE is None:
+            # Loading every artifact (and tier) at once, a single
+            # query is used regardless of how many artifacts exist.
+            _cache = {}
+
+            for artifact in self.select_related("tier"):
+                _json = artifact.json()
+                _cache[("pk", artifact.pk)] = _json
+                _cache[("name", artifact.name)] = _json
+
+            _ARTIFACT_JSON_CACHE = _cache
+
+        return _ARTIFACT_JSON_CACHE.get(("pk", pk) if pk is not None else ("name", name))
+
+    @staticmethod
+    def clear_cache():
+        """
+        Clear the in-memory artifact cache, artifacts are re-loaded on the next cached lookup.
+        """
+        global _ARTIFACT_JSON_CACHE
+
+        _ARTIFACT_JSON_CACHE = None
+
     def tier(self, tier, ignore=None):
         """
         Retrieve all artifacts of the specified tier.
@@ -114,27 +156,61 @@ class ArtifactManager(Manager):
         # are of specified tier value.
         return self.filter(tier__tier=tier).exclude(name__in=ignore)
 
+    @staticmethod
+    def seed_version():
+        """
+        Generate the seed version representing our current default tiers and artifacts.
+        """
+        return hashlib.md5(json.dumps(sorted(
+            (tier, name, identifier[1]) for tier, dictionary in ARTIFACT_TIER_MAP.items() for name, identifier in dictionary.items()
+        )).encode()).hexdigest()
+
     def ensure_defaults(self):
         """
         Ensure all default artifact objects are generated and available.
+
+        Seeding is skipped entirely when the stamped seed version matches our current defaults, otherwise any missing
+        tiers and artifacts are created in bulk, and any artifacts whose tier or key has changed are updated, before the
+        new seed version is stamped.
         """
-        # Local level import of our tier model.
+        # Local level import of our tier and application state models.
         # Doing this here to avoid errors when importing managers with models.
-        from db.models import Tier
+        from db.models import Tier, ApplicationState
 
-        for tier, dictionary in ARTIFACT_TIER_MAP.items():
-            # "tier" is now available when generating artifact instances
-            # or grabbing them from the database.
-            tier = Tier.objects.get_or_create(tier=tier)[0]
+        _state = ApplicationState.objects.grab(qs=False)
+        _version = self.seed_version()
 
-            for name, identifier in dictionary.items():
-                # Get or create the required artifact object that will
-                # be used by other pieces of functionality.
-                self.get_or_create(
-                    name=name,
-                    tier=tier,
-                    key=identifier[1]  # [1] - Artifact ID.
-                )
+        if _state.seed_version == _version:
+            return
+
+        with transaction.atomic():
+            # Generating any tiers that are missing, we can then retrieve
+            # every tier to determine the tier used by each artifact.
+            _tiers = set(Tier.objects.values_list("tier", flat=True))
+            Tier.objects.bulk_create([Tier(tier=tier) for tier in ARTIFACT_TIER_MAP if tier not in _tiers])
+            _tiers = dict(Tier.objects.values_list("tier", "pk"))
+
+            # Generating any artifacts that are missing, existing artifacts
+            # are only updated when their tier or key has changed.
+            _artifacts = {name: (pk, tier, key) for pk, name, tier, key in self.values_list("pk", "name", "tier_id", "key")}
+            _missing = []
+
+            for tier, dictionary in ARTIFACT_TIER_MAP.items():
+                for name, identifier in dictionary.items():
+                    _default = (_tiers[tier], identifier[1])  # [1] - Artifact ID.
+
+                    if name not in _artifacts:
+                        _missing.append(self.model(name=name, tier_id=_default[0], key=_default[1]))
+                    elif _artifacts[name][1:] != _default:
+                        self.filter(pk=_artifacts[name][0]).update(tier_id=_default[0], key=_default[1])
+
+            self.bulk_create(_missing)
+
+            ApplicationState.objects.filter(pk=_state.pk).update(seed_version=_version)
+
+        # Any new artifacts should be
+        # picked up by our cache.
+        self.clear_cache()
 
 
 class BotInstanceManager(Manager):
@@ -233,39 +309,54 @@ class ArtifactStatisticsManager(Manager):
         """
         # Import the artifact owned model locally so we can generate
         # new instances when they don't yet exist.
-        from db.models import Tier, Artifact, ArtifactOwned
+        from db.models import Artifact, ArtifactOwned
 
-        if not self.filter(instance=instance):
+        if not self.filter(instance=instance).exists():
             # No artifact statistics are available yet for the specified
             # instance, generate a new one with all artifacts unowned by default.
-            _statistics = self.create(instance=instance)
+            Artifact.objects.ensure_defaults()
 
-            for tier, dictionary in ARTIFACT_TIER_MAP.items():
-                # "tier" is now available when generating artifact instances
-                # or grabbing them from the database.
-                tier = Tier.objects.get_or_create(tier=tier)[0]
+            with transaction.atomic():
+                _statistics = self.create(instance=instance)
 
-                for name, identifier in dictionary.items():
-                    # Name and identifier can be also be used to
-                    # generate artifact instance.
-                    if name not in _statistics.artifacts.all().values_list("artifact__name", flat=True):
-                        # Get or create the required artifact object that will
-                        # be added to the statistics instance being created.
-                        artifact = Artifact.objects.get_or_create(
-                            name=name,
-                            tier=tier,
-                            key=identifier[1]
-                        )[0]
-
-                        _statistics.artifacts.add(ArtifactOwned.objects.create(
-                            instance=instance,
-                            artifact=artifact
-                        ))
-
-        # Retrieve the artifact statistics for the specified instance.
-        # If one didn't exist, it was created above.
+                # Generating owned artifacts in bulk, any owned artifacts
+                # already present for the instance are re-used.
+                _owned = set(ArtifactOwned.objects.filter(instance=instance).values_list("artifact_id", flat=True))
+                ArtifactOwned.objects.bulk_create([
+                    ArtifactOwned(instance=instance, artifact_id=artifact) for artifact in Artifact.objects.values_list("pk", flat=True) if artifact not in _owned
+                ])
+
+                # Bulk inserting our through table rows directly,
+                # instead of adding each owned artifact individually.
+                _through = self.model.artifacts.through
+                _through.objects.bulk_create([
+                    _through(artifactstatistics_id=_statistics.pk, artifactowned_id=owned) for owned in ArtifactOwned.objects.filter(instance=instance).values_list("pk", flat=True)
+                ])
+
+            return _statistics
+
+        # Otherwise, retrieve the existing artifact
+        # statistics for the specified instance.
         return self.get(instance=instance)
 
+    @staticmethod
+    def lookups(prefix=""):
+        """
+        Retrieve the prefetch lookups required to serialize artifact statistics without any additional queries.
+        """
+        return [
+            prefix + "artifacts",
+        ]
+
+    def prefetched(self, instance):
+        """
+        Grab the artifact statistics for a specific instance, prefetching everything required for serialization.
+        """
+        _statistics = self.grab(instance=instance)
+        prefetch_related_objects([_statistics], *self.lookups())
+
+        return _statistics
+
 
 class SessionManager(Manager):
     """
@@ -286,8 +377,9 @@ class SessionManager(Manager):
         # for the file handler associated, making sure we
         # attach it to our session instance.
         for _handle in logger.handlers:
-            # Only looking for the proper file handler.
-            if isinstance(_handle, logging.FileHandler):
+            # Only looking for the proper file handler, queued
+            # handlers expose their own file handlers file name.
+            if getattr(_handle, "baseFilename", None):
                 _logs = _handle.baseFilename
                 # Break early since we now have the log filename needed.
                 break
@@ -340,6 +432,28 @@ class StatisticsManager(Manager):
         # If one didn't exist, it was created above.
         return self.get(instance=instance)
 
+    def prefetched(self, instance):
+        """
+        Grab the statistics for a specific instance, prefetching everything required for serialization.
+        """
+        # Import the statistics models locally so their
+        # lookups can be nested within our own.
+        from db.models import ArtifactStatistics, SessionStatistics, PrestigeStatistics
+
+        _statistics = self.grab(instance=instance)
+        prefetch_related_objects(
+            [_statistics],
+            "game_statistics",
+            "bot_statistics",
+            *(
+                SessionStatistics.objects.lookups(prefix="session_statistics__") +
+                ArtifactStatistics.objects.lookups(prefix="artifact_statistics__") +
+                PrestigeStatistics.objects.lookups(prefix="prestige_statistics__")
+            )
+        )
+
+        return _statistics
+
 
 class SessionStatisticsManager(Manager):
     """
@@ -358,6 +472,28 @@ class SessionStatisticsManager(Manager):
         # If one didn't exist, it was created above.
         return self.get(instance=instance)
 
+    @staticmethod
+    def lookups(prefix=""):
+        """
+        Retrieve the prefetch lookups required to serialize session statistics without any additional queries.
+        """
+        # Import the session model locally, the sessions prefetched
+        # also include their logs and prestiges.
+        from db.models import Session
+
+        return [
+            Prefetch(prefix + "sessions", queryset=Session.objects.select_related("log").prefetch_related("prestige_set")),
+        ]
+
+    def prefetched(self, instance):
+        """
+        Grab the session statistics for a specific instance, prefetching everything required for serialization.
+        """
+        _statistics = self.grab(instance=instance)
+        prefetch_related_objects([_statistics], *self.lookups())
+
+        return _statistics
+
 
 class PrestigeStatisticsManager(Manager):
     """
@@ -375,3 +511,253 @@ class PrestigeStatisticsManager(Manager):
         # Retrieve the prestige statistics for the specified instance.
         # If one didn't exist, it was created above.
         return self.get(instance=instance)
+
+    @staticmethod
+    def lookups(prefix=""):
+        """
+        Retrieve the prefetch lookups required to serialize prestige statistics without any additional queries.
+        """
+        # Import the prestige model locally, the prestiges
+        # prefetched also include their sessions.
+        from db.models import Prestige
+
+        return [
+            Prefetch(prefix + "prestiges", queryset=Prestige.objects.select_related("session")),
+        ]
+
+    def prefetched(self, instance):
+        """
+        Grab the prestige statistics for a specific instance, prefetching everything required for serialization.
+        """
+        _statistics = self.grab(instance=instance)
+        prefetch_related_objects([_statistics], *self.lookups())
+
+        return _statistics
+
+
+class StatisticsAggregateManager(Manager):
+    """
+    StatisticsAggregate Model Manager.
+    """
+    def grab(self, instance, session=None):
+        """
+        Attempt to grab the aggregates for a specific instance (or one of its sessions), generating them if required.
+        """
+        return self.get_or_create(instance=instance, session=session)[0]
+
+    def existing(self, instance_id, session_id=None):
+        """
+        Retrieve the aggregates for a specific instance (or one of its sessions) without generating them, default
+        aggregates are returned when none exist yet.
+        """
+        return self.filter(instance_id=instance_id, session_id=session_id).first() or self.model(instance_id=instance_id, session_id=session_id)
+
+    def prestige(self, prestige):
+        """
+        Include the specified prestige within the instance and session aggregates it belongs to.
+        """
+        with transaction.atomic():
+            for _session in (None, prestige.session):
+                self.grab(instance=prestige.instance, session=_session).include_prestige(prestige=prestige)
+
+    def session(self, session):
+        """
+        Include the specified (ended) session within the instance and session aggregates it belongs to.
+        """
+        with transaction.atomic():
+            for _session in (None, session):
+                self.grab(instance=session.instance, session=_session).include_session(session=session)
+
+
+class BotPropertyCounterManager(Manager):
+    """
+    BotPropertyCounter Model Manager.
+    """
+    def increment(self, counts):
+        """
+        Increment the specified counts in a single batched write.
+
+        Counts are expected to be a dictionary of (statistics pk, property name) -> amount.
+        """
+        with transaction.atomic():
+            for (statistics, name), amount in counts.items():
+                # Attempt to increment the existing counter first, a counter
+                # is only created the first time a property is executed.
+                if not self.filter(statistics_id=statistics, name=name).update(count=F("count") + amount):
+                    self.create(statistics_id=statistics, name=name, count=amount)
+
+
+class GameStatisticsSnapshotManager(Manager):
+    """
+    GameStatisticsSnapshot Model Manager.
+    """
+    def capture(self, instance, session, statistics):
+        """
+        Generate (without saving) a snapshot of the specified game statistics, with every value parsed into a number.
+        """
+        _snapshot = self.model(instance=instance, session=session, timestamp=datetime.now())
+
+        for field in self.model.NUMERIC_FIELDS:
+            try:
+                setattr(_snapshot, field, convert_to_number(value=getattr(statistics, field)))
+            # Values that are missing or can not be parsed are
+            # left empty within the snapshot.
+            except (TypeError, ValueError, IndexError):
+                pass
+
+        _snapshot.play_time = parse_play_time(value=statistics.play_time) if statistics.play_time else None
+
+        return _snapshot
+
+    def rates(self, instance, fields=("gold_earned", "titans_killed")):
+        """
+        Calculate the hourly rate of each specified field for every session of an instance, aggregated by the database.
+        """
+        _aggregates = {"{field}_{func}".format(field=field, func=func.name.lower()): func(field) for field in fields for func in (Min, Max)}
+        _rates = []
+
+        for session in self.filter(instance=instance).exclude(session=None).values("session").annotate(start=Min("timestamp"), end=Max("timestamp"), **_aggregates).order_by("start"):
+            _hours = (session["end"] - session["start"]).total_seconds() / 3600
+            _rate = {"session": session["session"], "hours": _hours}
+
+            for field in fields:
+                _minimum, _maximum = session["{field}_min".format(field=field)], session["{field}_max".format(field=field)]
+                _rate[field] = (_maximum - _minimum) / _hours if _hours and _minimum is not None else None
+
+            _rates.append(_rate)
+
+        return _rates
+
+
+def _merge_point(point, other):
+    """
+    Merge two (minimum, maximum, total, count) stage points together.
+    """
+    if point is None:
+        return other
+
+    return min(point[0], other[0]), max(point[1], other[1]), point[2] + other[2], point[3] + other[3]
+
+
+class StageSeriesManager(Manager):
+    """
+    StageSeries Model Manager.
+    """
+    def append(self, session_id, instance_id, points):
+        """
+        Append the specified (timestamp, stage) points to the raw series of a session, filling the latest row first.
+        """
+        _rows = []
+
+        with transaction.atomic():
+            _row = self.filter(session_id=session_id, resolution=0).order_by("-start").first()
+            _points = _row.points if _row else []
+
+            for timestamp, stage in points:
+                if _row is None or len(_points) >= STAGE_SERIES_CHUNK_SIZE:
+                    # Our current row is full (or no row exists yet),
+                    # a new row is started with this point.
+                    if _row is not None:
+                        _row.points_json = json.dumps(_points)
+                        _rows.append(_row)
+
+                    _row = self.model(session_id=session_id, instance_id=instance_id, resolution=0, start=timestamp)
+                    _points = []
+
+                _points.append([int((timestamp - _row.start).total_seconds()), stage])
+                _row.end = timestamp
+
+            if _row is not None:
+                _row.points_json = json.dumps(_points)
+                _rows.append(_row)
+
+            for _row in _rows:
+                _row.save()
+
+    def downsample(self, now=None):
+        """
+        Roll any rows older than each rollup threshold into coarser rows, replacing the original rows.
+        """
+        now = now or datetime.now()
+
+        for _from, _to, _after in STAGE_SERIES_ROLLUPS:
+            _rows = list(self.filter(resolution=_from, end__lt=now - timedelta(seconds=_after)).order_by("start"))
+
+            if not _rows:
+                continue
+
+            # Bucket every point from the rows being rolled up,
+            # keeping each session's points separated.
+            _buckets = {}
+
+            for _row in _rows:
+                _session = _buckets.setdefault((_row.session_id, _row.instance_id), {})
+
+                for timestamp, minimum, maximum, total, count in _row.normalized():
+                    _bucket = int(timestamp // _to * _to)
+                    _session[_bucket] = _merge_point(_session.get(_bucket), (minimum, maximum, total, count))
+
+            _rollups = []
+
+            for (session_id, instance_id), buckets in _buckets.items():
+                _sorted = sorted(buckets.items())
+
+                for index in range(0, len(_sorted), STAGE_SERIES_CHUNK_SIZE):
+                    _chunk = _sorted[index:index + STAGE_SERIES_CHUNK_SIZE]
+                    _rollups.append(self.model(
+                        session_id=session_id,
+                        instance_id=instance_id,
+                        resolution=_to,
+                        start=datetime.fromtimestamp(_chunk[0][0]),
+                        end=datetime.fromtimestamp(_chunk[-1][0]),
+                        points_json=json.dumps([[bucket - _chunk[0][0]] + list(point) for bucket, point in _chunk])
+                    ))
+
+            with transaction.atomic():
+                self.bulk_create(_rollups)
+                self.filter(pk__in=[_row.pk for _row in _rows]).delete()
+
+    def series(self, instance_id, session_id=None, start=None, end=None, max_points=STAGE_SERIES_MAX_POINTS):
+        """
+        Retrieve a chart ready stage series for an instance (or one of its sessions) within the specified time range.
+
+        Points from every resolution are merged into evenly sized buckets, ensuring no more than "max_points" points are
+        ever returned. Each point is represented as [timestamp (ms), average, minimum, maximum].
+        """
+        _rows = self.filter(instance_id=instance_id)
+
+        if session_id:
+            _rows = _rows.filter(session_id=session_id)
+        if start:
+            _rows = _rows.filter(end__gte=start)
+        if end:
+            _rows = _rows.filter(start__lte=end)
+
+        _start = start.timestamp() if start else None
+        _end = end.timestamp() if end else None
+        _points = [
+            point for _row in _rows.order_by("start") for point in _row.normalized()
+            if (_start is None or point[0] >= _start) and (_end is None or point[0] <= _end)
+        ]
+
+        if not _points:
+            return {"bucket": None, "points": []}
+
+        _start = _start if _start is not None else min(point[0] for point in _points)
+        _end = _end if _end is not None else max(point[0] for point in _points)
+        _bucket = max(int(math.ceil((_end - _start + 1) / max_points)), 1)
+
+        _buckets = {}
+
+        for timestamp, minimum, maximum, total, count in _points:
+            _index = int((timestamp - _start) // _bucket)
+            _buckets[_index] = _merge_point(_buckets.get(_index), (minimum, maximum, total, count))
+
+        return {
+            "bucket": _bucket,
+            "points": [
+                [int((_start + index * _bucket) * 1000), round(total / count, 2), minimum, maximum]
+                for index, (minimum, maximum, total, count) in sorted(_buckets.items())
+            ]
+        }
+
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+import json
+
+
+def forwards_properties(apps, schema_editor):
+    """
+    Move any existing bot property counts from the properties json into the counter table.
+    """
+    BotStatistics = apps.get_model("db", "BotStatistics")
+    BotPropertyCounter = apps.get_model("db", "BotPropertyCounter")
+
+    _counters = []
+
+    for statistics in BotStatistics.objects.exclude(properties_json=""):
+        try:
+            _properties = json.loads(statistics.properties_json)
+        except ValueError:
+            continue
+
+        for name, count in _properties.items():
+            if count:
+                _counters.append(BotPropertyCounter(statistics=statistics, name=name, count=count))
+
+    BotPropertyCounter.objects.bulk_create(_counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BotPropertyCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('statistics', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='counters', to='db.BotStatistics')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='botpropertycounter',
+            unique_together=set([('statistics', 'name')]),
+        ),
+        migrations.RunPython(forwards_properties, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='botstatistics',
+            name='properties_json',
+        ),
+    ]
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+from modules.bot.core.utilities import convert_to_number
+
+
+def forwards_highest_stage(apps, schema_editor):
+    """
+    Denormalize the highest stage reached from each instances game statistics onto the instance.
+    """
+    Statistics = apps.get_model("db", "Statistics")
+
+    for statistics in Statistics.objects.select_related("instance", "game_statistics"):
+        if not statistics.game_statistics.highest_stage_reached:
+            continue
+
+        try:
+            _highest_stage = int(convert_to_number(value=statistics.game_statistics.highest_stage_reached))
+        except (TypeError, ValueError):
+            continue
+
+        statistics.instance.highest_stage = _highest_stage
+        statistics.instance.save(update_fields=["highest_stage"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0002_botpropertycounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='botinstance',
+            name='highest_stage',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(forwards_highest_stage, migrations.RunPython.noop),
+    ]
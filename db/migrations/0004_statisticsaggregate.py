@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from settings import STATISTICS_ROLLING_WINDOW
+
+import datetime
+import json
+
+
+def forwards_aggregates(apps, schema_editor):
+    """
+    Generate the precomputed aggregates for every instance and session from any existing prestiges and sessions.
+    """
+    Prestige = apps.get_model("db", "Prestige")
+    Session = apps.get_model("db", "Session")
+    StatisticsAggregate = apps.get_model("db", "StatisticsAggregate")
+
+    _aggregates = {}
+
+    def aggregates(instance, session):
+        """
+        Retrieve the instance wide and session aggregates that should be updated.
+        """
+        return [_aggregates.setdefault(key, StatisticsAggregate(instance_id=key[0], session_id=key[1], recent_json="[]")) for key in (
+            (instance, None),
+            (instance, session)
+        )]
+
+    for prestige in Prestige.objects.order_by("timestamp", "pk").iterator():
+        for aggregate in aggregates(instance=prestige.instance_id, session=prestige.session_id):
+            aggregate.prestige_count += 1
+
+            if prestige.stage is not None:
+                aggregate.stage_count += 1
+                aggregate.stage_sum += prestige.stage
+                aggregate.best_stage = max(aggregate.best_stage or 0, prestige.stage)
+            if prestige.duration is not None:
+                aggregate.duration_count += 1
+                aggregate.duration_sum += prestige.duration
+
+            aggregate.recent_json = json.dumps((json.loads(aggregate.recent_json) + [[
+                prestige.stage,
+                prestige.duration.total_seconds() if prestige.duration is not None else None
+            ]])[-STATISTICS_ROLLING_WINDOW:])
+
+    for session in Session.objects.exclude(stopped=None).iterator():
+        for aggregate in aggregates(instance=session.instance_id, session=session.pk):
+            aggregate.session_count += 1
+            aggregate.session_duration_sum += session.stopped - session.started
+
+    StatisticsAggregate.objects.bulk_create(_aggregates.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0003_botinstance_highest_stage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatisticsAggregate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prestige_count', models.PositiveIntegerField(default=0)),
+                ('stage_count', models.PositiveIntegerField(default=0)),
+                ('stage_sum', models.BigIntegerField(default=0)),
+                ('best_stage', models.PositiveIntegerField(blank=True, null=True)),
+                ('duration_count', models.PositiveIntegerField(default=0)),
+                ('duration_sum', models.DurationField(default=datetime.timedelta(0))),
+                ('session_count', models.PositiveIntegerField(default=0)),
+                ('session_duration_sum', models.DurationField(default=datetime.timedelta(0))),
+                ('recent_json', models.TextField(default='[]')),
+                ('instance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='db.BotInstance')),
+                ('session', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='db.Session')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='statisticsaggregate',
+            unique_together=set([('instance', 'session')]),
+        ),
+        migrations.RunPython(forwards_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0004_statisticsaggregate'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='prestige',
+            index_together=set([('instance', 'timestamp')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='queuedfunction',
+            index_together=set([('instance', 'eta')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='session',
+            index_together=set([('instance', 'started')]),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0006_applicationstate_seed_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StageSeries',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.PositiveIntegerField(default=0)),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('points_json', models.TextField(default='[]')),
+                ('instance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='db.BotInstance')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='db.Session')),
+            ],
+        ),
+        migrations.AlterIndexTogether(
+            name='stageseries',
+            index_together=set([('instance', 'start'), ('session', 'resolution', 'start')]),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0007_stageseries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameStatisticsSnapshot',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField()),
+                ('highest_stage_reached', models.FloatField(blank=True, null=True)),
+                ('total_pet_level', models.FloatField(blank=True, null=True)),
+                ('gold_earned', models.FloatField(blank=True, null=True)),
+                ('taps', models.FloatField(blank=True, null=True)),
+                ('titans_killed', models.FloatField(blank=True, null=True)),
+                ('bosses_killed', models.FloatField(blank=True, null=True)),
+                ('critical_hits', models.FloatField(blank=True, null=True)),
+                ('chestersons_killed', models.FloatField(blank=True, null=True)),
+                ('prestiges', models.FloatField(blank=True, null=True)),
+                ('days_since_install', models.FloatField(blank=True, null=True)),
+                ('play_time', models.DurationField(blank=True, null=True)),
+                ('relics_earned', models.FloatField(blank=True, null=True)),
+                ('fairies_tapped', models.FloatField(blank=True, null=True)),
+                ('daily_achievements', models.FloatField(blank=True, null=True)),
+                ('instance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='db.BotInstance')),
+                ('session', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='db.Session')),
+            ],
+        ),
+        migrations.AlterIndexTogether(
+            name='gamestatisticssnapshot',
+            index_together=set([('session', 'timestamp'), ('instance', 'timestamp')]),
+        ),
+    ]
@@ -1,21 +1,33 @@
-from settings import DATETIME_FORMAT, MAX_STAGE, RELATIVE_ARTIFACT_IMAGE_DIR
+from settings import (
+    DATETIME_FORMAT, MAX_STAGE, RELATIVE_ARTIFACT_IMAGE_DIR, STATISTICS_ROLLING_WINDOW, LOG_PAGE_MAX_LENGTH,
+    DB_WRITE_BEHIND_FLUSH_TIMEOUT
+)
 
 from django.utils.text import slugify
 from django.db.models import (
-    Avg, Model, ForeignKey, CharField, TextField, BooleanField, NullBooleanField,
-    PositiveIntegerField, DateTimeField, DecimalField, DurationField, ManyToManyField, CASCADE
+    Model, ForeignKey, CharField, TextField, BooleanField, NullBooleanField,
+    PositiveIntegerField, BigIntegerField, FloatField, DateTimeField, DecimalField, DurationField, ManyToManyField, CASCADE, F
 )
 
+from logger import application_logger
+
 from db.managers import (
     ApplicationStateManager, UserManager, ArtifactManager, BotInstanceManager, ConfigurationManager,
     GlobalConfigurationManager, ArtifactStatisticsManager, SessionManager, StatisticsManager, SessionStatisticsManager,
-    PrestigeStatisticsManager
+    PrestigeStatisticsManager, BotPropertyCounterManager, StatisticsAggregateManager, StageSeriesManager,
+    GameStatisticsSnapshotManager
 )
-from db.utilities import import_model_kwargs, generate_url
+from db.utilities import import_model_kwargs, generate_url, datetime_json, duration_increment
+from db.writer import write_behind
 from db.mixins import ExportModelMixin
+from db.logs import LogReader, StructuredLogReader
 
 from modules.bot.core.utilities import convert_to_number, format_string
 from modules.bot.core.decorators import BotProperty
+from modules.bot.core.queued import queued_handler
+from modules.bot.core.counters import property_counters
+from modules.bot.core.notifier import instance_notifier
+from modules.bot.core.cancellation import stopped_event
 from modules.bot.core.exceptions import TerminationEncountered, FailsafeException
 from modules.bot.core.enumerations import Duration, Level, State, SkillLevel, Perk
 
@@ -24,6 +36,10 @@ from decimal import Decimal
 
 import json
 import eel
+import os
+
+
+logger = application_logger()
 
 
 class ApplicationState(Model):
@@ -33,6 +49,7 @@ class ApplicationState(Model):
     objects = ApplicationStateManager()
 
     state = BooleanField(max_length=255, default=False)
+    seed_version = CharField(max_length=255, blank=True, null=True)
 
 
 class User(Model):
@@ -202,7 +219,18 @@ class BotInstance(Model):
         "artifactowned",
         "artifactstatistics",
         "session_instance",
-        "statistics"
+        "statistics",
+        "highest_stage"            # Ignore highest stage because it reflects the users game statistics.
+    ]
+
+    # Every datetime field that is serialized
+    # when a bot instance is converted to json.
+    DATETIME_FIELDS = [
+        "started", "next_fairy_tap", "next_minigames_tap", "next_master_level", "next_heroes_level", "next_skills_level",
+        "next_skills_activation", "next_miscellaneous_actions", "next_headgear_swap", "next_perk_check", "next_prestige",
+        "next_randomized_prestige", "next_statistics_update", "next_daily_achievement_check", "next_milestone_check",
+        "next_raid_notifications", "next_raid_attack_reset", "next_heavenly_strike", "next_deadly_strike",
+        "next_hand_of_midas", "next_fire_sword", "next_war_cry", "next_shadow_clone", "next_break", "break_resume"
     ]
 
     objects = BotInstanceManager()
@@ -229,6 +257,9 @@ class BotInstance(Model):
     shortcuts = NullBooleanField(blank=True, null=True)
     log = ForeignKey(to="Log", blank=True, null=True, on_delete=CASCADE)
     stage = PositiveIntegerField(blank=True, null=True)
+    # Denormalized from the instances game statistics, updated
+    # whenever the highest stage reached statistic is parsed.
+    highest_stage = PositiveIntegerField(blank=True, null=True)
     newest_hero = CharField(max_length=255, blank=True, null=True)
     # Calculation Type Variables.
     next_fairy_tap = DateTimeField(blank=True, null=True)
@@ -279,6 +310,11 @@ class BotInstance(Model):
             # one automatically using a derived template name.
             self.name = "Bot Instance {max_id}".format(max_id=BotInstance.objects.max_id() + 1)
 
+            # Partial saves (only certain fields updated) should
+            # still include the generated name when present.
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = list(kwargs["update_fields"]) + ["name"]
+
         # Perform super so that our database instance is completely
         # up to date and saved.
         super(BotInstance, self).save(*args, **kwargs)
@@ -286,7 +322,15 @@ class BotInstance(Model):
         # Whenever a bot instance is saved, send a signal to our frontend
         # that will handle updating our dashboard to reflect the instances
         # current state.
-        eel.base_instance_updated(self.pk, self.json())
+        self.notify()
+
+    def notify(self):
+        """
+        Send a signal to our frontend with the changes made to the bot instance.
+        """
+        # Only the fields that have changed are sent, changes made
+        # in quick succession are coalesced into a single patch.
+        instance_notifier.notify(instance=self)
 
     @property
     def window(self):
@@ -320,8 +364,10 @@ class BotInstance(Model):
         """
         Refresh and check whether or not current state of this instance is in a stopped state.
         """
-        # Perform a refresh in the database.
-        # Making sure the state value is up-to date.
+        # Perform a refresh in the database. Making sure the state value is up-to date,
+        # any pending writes are committed first so they aren't lost through the refresh.
+        if not write_behind.flush(timeout=DB_WRITE_BEHIND_FLUSH_TIMEOUT):
+            logger.warning("pending writes could not be flushed within {timeout} second(s), refreshing instance regardless.".format(timeout=DB_WRITE_BEHIND_FLUSH_TIMEOUT))
         self.refresh_from_db()
 
         # Return whether or not our state is in the correct
@@ -337,9 +383,9 @@ class BotInstance(Model):
             # even currently available.
             return None
 
-        # Grabbing the current highest stage from our instances
-        # associated game statistics most recent value.
-        _highest_stage = Statistics.objects.grab(instance=self).game_statistics.highest_stage()
+        # Highest stage is denormalized onto our instance whenever
+        # our game statistics are updated, no queries are required.
+        _highest_stage = self.highest_stage
 
         # Maybe no highest stage is actually available yet, we can
         # also just return early with none.
@@ -365,18 +411,18 @@ class BotInstance(Model):
         """
         BotInstance as JSON.
         """
-        return {
+        _json = {
             "pk": self.pk,
             "name": self.name,
             "state": self.state,
             "shortcuts": self.shortcuts,
-            "session": self.session.json() if self.session else None,
+            "session": {
+                "pk": self.session.pk,
+                "uuid": self.session.uuid,
+                "url": self.session.url
+            } if self.session else None,
             "configuration": self.configuration.json() if self.configuration else None,
             "window": self.window if self.window_json else None,
-            "started": {
-                "datetime": self.started or None,
-                "formatted": self.started.strftime(format=DATETIME_FORMAT) if self.started else None
-            },
             "function": self.function,
             "last_prestige": self.last_prestige.json() if self.last_prestige else None,
             "log": self.log.json() if self.log else None,
@@ -386,105 +432,16 @@ class BotInstance(Model):
                 "percent": self._diff_max_stage(percent=True)
             },
             "newest_hero": self.newest_hero or None,
-            "next_artifact_upgrade": Artifact.objects.get(name=self.next_artifact_upgrade).json() if self.next_artifact_upgrade else None,
-            "next_fairy_tap": {
-                "datetime": self.next_fairy_tap or None,
-                "formatted": self.next_fairy_tap.strftime(format=DATETIME_FORMAT) if self.next_fairy_tap else None
-            },
-            "next_minigames_tap": {
-                "datetime": self.next_minigames_tap or None,
-                "formatted": self.next_minigames_tap.strftime(format=DATETIME_FORMAT) if self.next_minigames_tap else None
-            },
-            "next_master_level": {
-                "datetime": self.next_master_level or None,
-                "formatted": self.next_master_level.strftime(format=DATETIME_FORMAT) if self.next_master_level else None
-            },
-            "next_heroes_level": {
-                "datetime": self.next_heroes_level or None,
-                "formatted": self.next_heroes_level.strftime(format=DATETIME_FORMAT) if self.next_heroes_level else None
-            },
-            "next_skills_level": {
-                "datetime": self.next_skills_level or None,
-                "formatted": self.next_skills_level.strftime(format=DATETIME_FORMAT) if self.next_skills_level else None
-            },
-            "next_skills_activation": {
-                "datetime": self.next_skills_activation or None,
-                "formatted": self.next_skills_activation.strftime(format=DATETIME_FORMAT) if self.next_skills_activation else None
-            },
-            "next_miscellaneous_actions": {
-                "datetime": self.next_miscellaneous_actions or None,
-                "formatted": self.next_miscellaneous_actions.strftime(format=DATETIME_FORMAT) if self.next_miscellaneous_actions else None
-            },
-            "next_headgear_swap": {
-                "datetime": self.next_headgear_swap or None,
-                "formatted": self.next_headgear_swap.strftime(format=DATETIME_FORMAT) if self.next_headgear_swap else None
-            },
-            "next_perk_check": {
-                "datetime": self.next_perk_check or None,
-                "formatted": self.next_perk_check.strftime(format=DATETIME_FORMAT) if self.next_perk_check else None
-            },
-            "next_prestige": {
-                "datetime": self.next_prestige or None,
-                "formatted": self.next_prestige.strftime(format=DATETIME_FORMAT) if self.next_prestige else None
-            },
-            "next_randomized_prestige": {
-                "datetime": self.next_randomized_prestige or None,
-                "formatted": self.next_randomized_prestige.strftime(format=DATETIME_FORMAT) if self.next_randomized_prestige else None
-            },
-            "next_statistics_update": {
-                "datetime": self.next_statistics_update or None,
-                "formatted": self.next_statistics_update.strftime(format=DATETIME_FORMAT) if self.next_statistics_update else None
-            },
-            "next_daily_achievement_check": {
-                "datetime": self.next_daily_achievement_check or None,
-                "formatted": self.next_daily_achievement_check.strftime(format=DATETIME_FORMAT) if self.next_daily_achievement_check else None
-            },
-            "next_milestone_check": {
-                "datetime": self.next_milestone_check or None,
-                "formatted": self.next_milestone_check.strftime(format=DATETIME_FORMAT) if self.next_milestone_check else None
-            },
-            "next_raid_notifications": {
-                "datetime": self.next_raid_notifications or None,
-                "formatted": self.next_raid_notifications.strftime(format=DATETIME_FORMAT) if self.next_raid_notifications else None
-            },
-            "next_raid_attack_reset": {
-                "datetime": self.next_raid_attack_reset or None,
-                "formatted": self.next_raid_attack_reset.strftime(format=DATETIME_FORMAT) if self.next_raid_attack_reset else None
-            },
-            "next_heavenly_strike": {
-                "datetime": self.next_heavenly_strike or None,
-                "formatted": self.next_heavenly_strike.strftime(format=DATETIME_FORMAT) if self.next_heavenly_strike else None
-            },
-            "next_deadly_strike": {
-                "datetime": self.next_deadly_strike or None,
-                "formatted": self.next_deadly_strike.strftime(format=DATETIME_FORMAT) if self.next_deadly_strike else None
-            },
-            "next_hand_of_midas": {
-                "datetime": self.next_hand_of_midas or None,
-                "formatted": self.next_hand_of_midas.strftime(format=DATETIME_FORMAT) if self.next_hand_of_midas else None
-            },
-            "next_fire_sword": {
-                "datetime": self.next_fire_sword or None,
-                "formatted": self.next_fire_sword.strftime(format=DATETIME_FORMAT) if self.next_fire_sword else None
-            },
-            "next_war_cry": {
-                "datetime": self.next_war_cry or None,
-                "formatted": self.next_war_cry.strftime(format=DATETIME_FORMAT) if self.next_war_cry else None
-            },
-            "next_shadow_clone": {
-                "datetime": self.next_shadow_clone or None,
-                "formatted": self.next_shadow_clone.strftime(format=DATETIME_FORMAT) if self.next_shadow_clone else None
-            },
-            "next_break": {
-                "datetime": self.next_break or None,
-                "formatted": self.next_break.strftime(format=DATETIME_FORMAT) if self.next_break else None
-            },
-            "break_resume": {
-                "datetime": self.break_resume or None,
-                "formatted": self.break_resume.strftime(format=DATETIME_FORMAT) if self.break_resume else None
-            }
+            "next_artifact_upgrade": Artifact.objects.cached_json(name=self.next_artifact_upgrade) if self.next_artifact_upgrade else None
         }
 
+        # Every datetime field is serialized the same way, formatted
+        # values are memoized since most values rarely change.
+        for field in self.DATETIME_FIELDS:
+            _json[field] = datetime_json(value=getattr(self, field))
+
+        return _json
+
     def reset(self):
         """
         Reset all bot instance variables to their default none values.
@@ -515,6 +472,10 @@ class BotInstance(Model):
         # that our values are properly saved and signals are sent.
         self.save()
 
+        # Instance is no longer stopped, anything waiting
+        # for the instance to stop should block again.
+        stopped_event(instance=self).clear()
+
         # Send out some signals to the eel frontend
         # when a bot instance has been successfully started.
         eel.base_generate_toast("Start Instance", "<em>{name}</em> has been started successfully.".format(name=self.name), "success")
@@ -563,6 +524,10 @@ class BotInstance(Model):
         # that our values are properly saved and signals are sent.
         self.save()
 
+        # Wake up anything waiting for this
+        # instance to be stopped completely.
+        stopped_event(instance=self).set()
+
         # Only generating and sending our websocket signal
         # if the boolean above is set to true.
         if signal:
@@ -1216,6 +1181,11 @@ class Prestige(Model):
     instance = ForeignKey(to="BotInstance", on_delete=CASCADE)
     session = ForeignKey(to="Session", on_delete=CASCADE)
 
+    class Meta:
+        index_together = [
+            ("instance", "timestamp"),
+        ]
+
     def __str__(self):
         return "Prestige [{stage} - {duration}]".format(
             stage=self.stage,
@@ -1231,7 +1201,7 @@ class Prestige(Model):
         """
         return {
             "pk": self.pk,
-            "instance": self.instance.pk,
+            "instance": self.instance_id,
             "timestamp": {
                 "datetime": self.timestamp,
                 "formatted": self.timestamp.strftime(format=DATETIME_FORMAT),
@@ -1242,7 +1212,7 @@ class Prestige(Model):
                 "seconds": self.duration.total_seconds() if self.duration else None
             },
             "stage": self.stage or None,
-            "artifact": self.artifact.json() if self.artifact else None,
+            "artifact": Artifact.objects.cached_json(pk=self.artifact_id) if self.artifact_id else None,
             "session": {
                 "pk": self.session.pk,
                 "uuid": self.session.uuid,
@@ -1262,6 +1232,11 @@ class QueuedFunction(Model):
     duration_type = CharField(max_length=255, choices=Duration.choices())
     eta = DateTimeField()
 
+    class Meta:
+        index_together = [
+            ("instance", "eta"),
+        ]
+
     def __str__(self):
         return "Queued: {function} (Queued: {queued} - ETA: {eta})".format(
             function=self.function,
@@ -1289,6 +1264,9 @@ class QueuedFunction(Model):
         Remove this queued function, sending a signal to also attempt to remove the queued function from the frontend.
         """
         self.remove_from_frontend()
+        # Make sure the function is also discarded from our queued handler
+        # so that it is never released to the instance.
+        queued_handler.discard(pk=self.pk)
         self.delete()
 
     def save(self, *args, **kwargs):
@@ -1323,6 +1301,10 @@ class QueuedFunction(Model):
         # save method is correctly called (pk is present).
         self.add_to_frontend()
 
+        # Schedule the function with our queued handler, the function
+        # will be released to the instance once the eta is reached.
+        queued_handler.add(queued=self)
+
     def json(self):
         """
         QueuedFunction as JSON.
@@ -1332,6 +1314,7 @@ class QueuedFunction(Model):
             "function": self.function,
             "queued": self.queued.strftime(format=DATETIME_FORMAT),
             "eta": self.eta.strftime(format=DATETIME_FORMAT),
+            "eta_epoch": self.eta.timestamp(),
             "duration": self.duration,
             "duration_type": self.duration_type
         }
@@ -1359,8 +1342,8 @@ class ArtifactOwned(Model):
         ArtifactOwned as JSON.
         """
         return {
-            "instance": self.instance.pk,
-            "artifact": self.artifact.json(),
+            "instance": self.instance_id,
+            "artifact": Artifact.objects.cached_json(pk=self.artifact_id),
             "owned": self.owned
         }
 
@@ -1386,33 +1369,52 @@ class Log(Model):
         except FileNotFoundError:
             return False
 
+    @property
+    def reader(self):
+        """
+        Retrieve a seekable reader for the log file.
+        """
+        return LogReader(log=self.log)
+
     def contents(self, truncate=False, limit=3000):
         """
         Retrieve the current contents from the log file.
         """
-        _dct = {
-            "data": [],
-            "length": 0
+        _reader = self.reader
+
+        # Only the lines being returned are ever read, truncated
+        # contents no longer require reading the entire file.
+        return {
+            "data": [{
+                "index": index,
+                "line": line
+            } for index, line in enumerate(_reader.lines(count=limit if truncate else None), start=1)],
+            "length": _reader.count()
         }
-        # Open the log file and begin appending the data from
-        # the file into our dictionary.
-        with open(self.log) as file:
-            # Loop through each index and line in the file,
-            # we need to add each line.
-            for index, line in enumerate(file.readlines(), start=1):
-                _dct["data"].append({
-                    "index": index,
-                    "line": line
-                })
-
-                if index > limit and truncate:
-                    # Break early if we've limited this set of log data.
-                    break
-
-        _dct["length"] = index
-
-        # Return the final derived dictionary of log file information.
-        return _dct
+
+    def page(self, page=0, length=LOG_PAGE_MAX_LENGTH, reverse=False):
+        """
+        Retrieve a single page of lines from the log file, reverse pages begin with the most recent lines.
+        """
+        return self.reader.page(page=page, length=length, reverse=reverse)
+
+    @property
+    def structured(self):
+        """
+        Retrieve the path to the structured log file written alongside the log file.
+        """
+        return os.path.splitext(self.log)[0] + ".jsonl"
+
+    def query(self, **filters):
+        """
+        Query the structured log file for any records matching the filters specified.
+        """
+        # Structured logs are optional, no records
+        # are available when they weren't written.
+        if not os.path.exists(self.structured):
+            return []
+
+        return StructuredLogReader(log=self.structured).query(**filters)
 
     def json(self):
         """
@@ -1440,6 +1442,11 @@ class Session(Model):
     configuration = ForeignKey(to="Configuration", on_delete=CASCADE)
     snapshot_json = TextField()
 
+    class Meta:
+        index_together = [
+            ("instance", "started"),
+        ]
+
     def __str__(self):
         return "Session {uuid} [{version}]".format(
             uuid=self.uuid,
@@ -1486,6 +1493,10 @@ class Session(Model):
         self.stopped = datetime.now()
         self.save()
 
+        # Ensure our precomputed aggregates include
+        # the session that has just ended.
+        StatisticsAggregate.objects.session(session=self)
+
     def save(self, *args, **kwargs):
         """
         Override session save method, ensure configuration snapshot is present.
@@ -1514,7 +1525,7 @@ class Session(Model):
         """
         return {
             "pk": self.pk,
-            "instance": self.instance.pk,
+            "instance": self.instance_id,
             "url": self.url,
             "uuid": self.uuid,
             "version": self.version,
@@ -1534,7 +1545,7 @@ class Session(Model):
             },
             "log": self.log.json(),
             "configuration": self.snapshot,
-            "prestiges": [prestige.json() for prestige in Prestige.objects.filter(session=self)]
+            "prestiges": [prestige.json() for prestige in self.prestige_set.all()]
         }
 
 
@@ -1558,7 +1569,7 @@ class SessionStatistics(Model):
         SessionStatistics as JSON.
         """
         return {
-            "instance": self.instance.pk,
+            "instance": self.instance_id,
             "sessions": [session.json() for session in self.sessions.all()]
         }
 
@@ -1598,7 +1609,7 @@ class ArtifactStatistics(Model):
         ArtifactStatistics as JSON.
         """
         return {
-            "instance": self.instance.pk,
+            "instance": self.instance_id,
             "artifacts": [artifact.json() for artifact in self.artifacts.all()]
         }
 
@@ -1622,17 +1633,208 @@ class PrestigeStatistics(Model):
         """
         PrestigeStatistics as JSON.
         """
-        _qs = self.prestiges.all()
+        # Aggregate values are precomputed, an instance without
+        # any prestiges yet simply uses the default values.
+        _json = StatisticsAggregate.objects.existing(instance_id=self.instance_id).json()
 
         return {
-            "instance": self.instance.pk,
-            "count": _qs.count(),
-            "average_stage": _qs.aggregate(Avg("stage"))["stage__avg"],
-            "average_duration": _qs.aggregate(Avg("duration"))["duration__avg"],
+            "instance": self.instance_id,
+            "count": _json["count"],
+            "best_stage": _json["best_stage"],
+            "average_stage": _json["average_stage"],
+            "average_duration": _json["average_duration"],
+            "rolling_average_stage": _json["rolling_average_stage"],
+            "rolling_average_duration": _json["rolling_average_duration"],
             "prestiges": [prestige.json() for prestige in self.prestiges.all()]
         }
 
 
+class StatisticsAggregate(Model):
+    """
+    StatisticsAggregate Database Model.
+
+    Precomputed prestige and session aggregates for an instance (session is empty) or for one of its sessions, updated
+    incrementally whenever a prestige is created or a session is ended.
+    """
+    objects = StatisticsAggregateManager()
+
+    instance = ForeignKey(to="BotInstance", on_delete=CASCADE)
+    session = ForeignKey(to="Session", blank=True, null=True, on_delete=CASCADE)
+    prestige_count = PositiveIntegerField(default=0)
+    stage_count = PositiveIntegerField(default=0)
+    stage_sum = BigIntegerField(default=0)
+    best_stage = PositiveIntegerField(blank=True, null=True)
+    duration_count = PositiveIntegerField(default=0)
+    duration_sum = DurationField(default=timedelta())
+    session_count = PositiveIntegerField(default=0)
+    session_duration_sum = DurationField(default=timedelta())
+    recent_json = TextField(default="[]")
+
+    class Meta:
+        unique_together = ("instance", "session")
+
+    def __str__(self):
+        return "StatisticsAggregate ({pk})".format(pk=self.pk)
+
+    def __repr__(self):
+        return "<StatisticsAggregate: {statistics_aggregate}>".format(statistics_aggregate=self)
+
+    @property
+    def recent(self):
+        """
+        Return the list of [stage, duration seconds] values for the most recent prestiges.
+        """
+        return json.loads(self.recent_json)
+
+    @property
+    def average_stage(self):
+        """
+        Calculate the average stage reached across all included prestiges.
+        """
+        return self.stage_sum / self.stage_count if self.stage_count else None
+
+    @property
+    def average_duration(self):
+        """
+        Calculate the average duration across all included prestiges.
+        """
+        return self.duration_sum / self.duration_count if self.duration_count else None
+
+    @property
+    def average_session_duration(self):
+        """
+        Calculate the average duration across all included sessions.
+        """
+        return self.session_duration_sum / self.session_count if self.session_count else None
+
+    @property
+    def rolling_average_stage(self):
+        """
+        Calculate the average stage reached across the most recent prestiges.
+        """
+        _stages = [stage for stage, duration in self.recent if stage is not None]
+        return sum(_stages) / len(_stages) if _stages else None
+
+    @property
+    def rolling_average_duration(self):
+        """
+        Calculate the average duration across the most recent prestiges.
+        """
+        _durations = [duration for stage, duration in self.recent if duration is not None]
+        return timedelta(seconds=sum(_durations) / len(_durations)) if _durations else None
+
+    def include_prestige(self, prestige):
+        """
+        Include the specified prestige within our aggregates, only the most recent prestiges are kept around.
+        """
+        # Counters and sums are incremented within the database, so that
+        # concurrent writers never overwrite each others counts.
+        _updates = {"prestige_count": F("prestige_count") + 1}
+
+        if prestige.stage is not None:
+            _updates.update(stage_count=F("stage_count") + 1, stage_sum=F("stage_sum") + prestige.stage)
+        if prestige.duration is not None:
+            _updates.update(duration_count=F("duration_count") + 1, duration_sum=duration_increment(field="duration_sum", duration=prestige.duration))
+
+        StatisticsAggregate.objects.filter(pk=self.pk).update(**_updates)
+        self.refresh_from_db()
+
+        # Best stage and recent prestiges are merged with the
+        # latest values present, then saved on their own.
+        if prestige.stage is not None:
+            self.best_stage = max(self.best_stage or 0, prestige.stage)
+
+        self.recent_json = json.dumps((self.recent + [[
+            prestige.stage,
+            prestige.duration.total_seconds() if prestige.duration is not None else None
+        ]])[-STATISTICS_ROLLING_WINDOW:])
+
+        self.save(update_fields=["best_stage", "recent_json"])
+
+    def include_session(self, session):
+        """
+        Include the specified (ended) session within our aggregates.
+        """
+        StatisticsAggregate.objects.filter(pk=self.pk).update(
+            session_count=F("session_count") + 1,
+            session_duration_sum=duration_increment(field="session_duration_sum", duration=session.stopped - session.started)
+        )
+
+        self.refresh_from_db()
+
+    def json(self):
+        """
+        StatisticsAggregate as JSON.
+        """
+        # Durations are serialized as strings here, so that
+        # no endpoint ever sends a raw timedelta (null).
+        return {
+            "instance": self.instance_id,
+            "session": self.session_id,
+            "count": self.prestige_count,
+            "best_stage": self.best_stage,
+            "average_stage": self.average_stage,
+            "average_duration": str(self.average_duration) if self.average_duration else None,
+            "rolling_average_stage": self.rolling_average_stage,
+            "rolling_average_duration": str(self.rolling_average_duration) if self.rolling_average_duration else None,
+            "sessions": self.session_count,
+            "average_session_duration": str(self.average_session_duration) if self.average_session_duration else None
+        }
+
+
+class StageSeries(Model):
+    """
+    StageSeries Database Model.
+
+    Each row packs a chunk of stage points for a session at a single resolution (in seconds, zero for raw points), points
+    are stored as offsets from the start of the row. Raw points are [offset, stage], rolled up points are
+    [offset, minimum, maximum, total, count].
+    """
+    objects = StageSeriesManager()
+
+    instance = ForeignKey(to="BotInstance", on_delete=CASCADE)
+    session = ForeignKey(to="Session", on_delete=CASCADE)
+    resolution = PositiveIntegerField(default=0)
+    start = DateTimeField()
+    end = DateTimeField()
+    points_json = TextField(default="[]")
+
+    class Meta:
+        index_together = [
+            ("session", "resolution", "start"),
+            ("instance", "start"),
+        ]
+
+    def __str__(self):
+        return "StageSeries ({resolution}s: {start} - {end})".format(
+            resolution=self.resolution,
+            start=self.start,
+            end=self.end
+        )
+
+    def __repr__(self):
+        return "<StageSeries: {stage_series}>".format(stage_series=self)
+
+    @property
+    def points(self):
+        """
+        Return the list of packed points present within this row.
+        """
+        return json.loads(self.points_json)
+
+    def normalized(self):
+        """
+        Generate every point within this row as a (timestamp, minimum, maximum, total, count) tuple.
+        """
+        _start = self.start.timestamp()
+
+        for point in self.points:
+            if self.resolution:
+                yield (_start + point[0],) + tuple(point[1:])
+            else:
+                yield _start + point[0], point[1], point[1], point[1], 1
+
+
 class GameStatistics(Model):
     """
     GameStatistics Database Model.
@@ -1750,16 +1952,84 @@ class GameStatistics(Model):
         }
 
 
+class GameStatisticsSnapshot(Model):
+    """
+    GameStatisticsSnapshot Database Model.
+
+    A timestamped snapshot of the game statistics taken each time statistics are updated, values are stored as numbers
+    so rates can be aggregated by the database.
+    """
+    objects = GameStatisticsSnapshotManager()
+
+    NUMERIC_FIELDS = [
+        "highest_stage_reached",
+        "total_pet_level",
+        "gold_earned",
+        "taps",
+        "titans_killed",
+        "bosses_killed",
+        "critical_hits",
+        "chestersons_killed",
+        "prestiges",
+        "days_since_install",
+        "relics_earned",
+        "fairies_tapped",
+        "daily_achievements",
+    ]
+
+    instance = ForeignKey(to="BotInstance", on_delete=CASCADE)
+    session = ForeignKey(to="Session", blank=True, null=True, on_delete=CASCADE)
+    timestamp = DateTimeField()
+    highest_stage_reached = FloatField(blank=True, null=True)
+    total_pet_level = FloatField(blank=True, null=True)
+    gold_earned = FloatField(blank=True, null=True)
+    taps = FloatField(blank=True, null=True)
+    titans_killed = FloatField(blank=True, null=True)
+    bosses_killed = FloatField(blank=True, null=True)
+    critical_hits = FloatField(blank=True, null=True)
+    chestersons_killed = FloatField(blank=True, null=True)
+    prestiges = FloatField(blank=True, null=True)
+    days_since_install = FloatField(blank=True, null=True)
+    play_time = DurationField(blank=True, null=True)
+    relics_earned = FloatField(blank=True, null=True)
+    fairies_tapped = FloatField(blank=True, null=True)
+    daily_achievements = FloatField(blank=True, null=True)
+
+    class Meta:
+        index_together = [
+            ("instance", "timestamp"),
+            ("session", "timestamp"),
+        ]
+
+    def __str__(self):
+        return "GameStatisticsSnapshot ({timestamp})".format(timestamp=self.timestamp)
+
+    def __repr__(self):
+        return "<GameStatisticsSnapshot: {game_statistics_snapshot}>".format(game_statistics_snapshot=self)
+
+    def json(self):
+        """
+        GameStatisticsSnapshot as JSON.
+        """
+        _json = {
+            "instance": self.instance_id,
+            "session": self.session_id,
+            "timestamp": datetime_json(self.timestamp),
+            "play_time": self.play_time.total_seconds() if self.play_time else None
+        }
+
+        for field in self.NUMERIC_FIELDS:
+            _json[field] = getattr(self, field)
+
+        return _json
+
+
 class BotStatistics(Model):
     """
     BotStatistics Database Model.
     """
     ads_collected = PositiveIntegerField(default=0)
 
-    # Using a custom field to store json information about current bot property
-    # functions and how many times they have all ben executed by an instance.
-    properties_json = TextField()
-
     def __str__(self):
         return "BotStatistics ({pk})".format(pk=self.pk)
 
@@ -1769,105 +2039,64 @@ class BotStatistics(Model):
     @property
     def properties(self):
         """
-        Load the properties json data into a python dictionary.
-        """
-        if not self.properties_json:
-            # If not json is present yet, it's probably the first
-            # go through our statistics object, use empty dictionary to start.
-            return {}
-
-        return json.loads(self.properties_json)
-
-    def set_properties(self, dct):
-        """
-        Set the properties json to the specified dictionary of information,.
+        Retrieve a dictionary containing the amount of times each bot property has been executed.
         """
-        self.properties_json = json.dumps(dct)
-        self.save()
+        # Every available bot property is included, properties that haven't been
+        # executed yet are included with a count of zero.
+        _properties = {prop["name"]: 0 for prop in BotProperty.all()}
+        _counters = dict(self.counters.values_list("name", "count"))
 
-    def increment_property(self, prop):
-        """
-        Increment the specified property by one.
-        """
-        _original = self.get_properties()
+        # Include any counts that are still pending in memory,
+        # and haven't been flushed to the database yet.
+        for name, count in property_counters.pending(statistics=self).items():
+            _counters[name] = _counters.get(name, 0) + count
 
-        # Dynamically grabbing the property specified and incrementing the current value
-        # by one. Since our bot can have functions added or removed, we need to make sure
-        # we properly grab it and increment it.
-        _value = _original.get(prop)
+        for name in _properties:
+            _properties[name] = _counters.get(name, 0)
 
-        # If the value exists and the specified property didn't
-        # return a none value, we can increment properly.
-        if _value is not None:
-            # Dynamically set attribute.
-            # Incrementing by one.
-            _original[prop] = _value + 1
-            # Update the properties dictionary with our
-            # newly incremented value.
-            self.set_properties(dct=_original)
+        return _properties
 
-    def get_properties(self):
+    def json(self):
         """
-        Retrieve and load the property json information, updating the dictionary with missing keys if needed.
+        BotStatistics as JSON.
         """
-        _original = self.properties
-        _save = False
-
-        # Parse out all of our functions available on the base bot class.
-        # Making sure they are all present in the original dictionary of functions.
-        _bot_props = BotProperty.all()
-
-        # Parse out any of the properties that are no longer present
-        # in the bot properties available at the time of retrieval.
-        removed = {prop for prop in _original if prop not in [_prop["name"] for _prop in _bot_props]}
-
-        if removed:
-            # If any of our original bot properties are no longer available
-            # within the derived bot properties, we need to remove them from
-            # our original dictionary.
-            _original = {key: value for key, value in _original.items() if key not in removed}
-            _save = True
+        return {
+            "generic": {
+                "ads_collected": self.ads_collected
+            },
+            "functions": self.properties
+        }
 
-        # Parse out any of the missing properties that are not already
-        # present in our properties json.
-        missing = {prop["name"]: 0 for prop in _bot_props if prop["name"] not in _original}
 
-        if missing:
-            # Some properties aren't yet present in the json data for
-            # our bot properties, update the original with this information.
-            _original.update(missing)
-            _save = True
+class BotPropertyCounter(Model):
+    """
+    BotPropertyCounter Database Model.
+    """
+    objects = BotPropertyCounterManager()
 
-        # We should set the properties json to our new dictionary
-        # of information so that everything is up to date if the
-        # structure of the properties has changed.
-        if _save:
-            self.set_properties(dct=_original)
+    statistics = ForeignKey(to="BotStatistics", related_name="counters", on_delete=CASCADE)
+    name = CharField(max_length=255)
+    count = PositiveIntegerField(default=0)
 
-        # If any values were not present before, we would have updated the value
-        # above, otherwise, original values are fine to return.
-        return _original
+    class Meta:
+        unique_together = ("statistics", "name")
 
-    def save(self, *args, **kwargs):
-        """
-        Override save method to ensure that dynamic bot properties are grabbed on creation.
-        """
-        if not self.pk and not self.properties:
-            # If no primary key is yet available on the instance, it means
-            # we are creating the instance now.
-            return self.get_properties()
+    def __str__(self):
+        return "{name} ({count})".format(
+            name=self.name,
+            count=self.count
+        )
 
-        super(BotStatistics, self).save(*args, **kwargs)
+    def __repr__(self):
+        return "<BotPropertyCounter: {bot_property_counter}>".format(bot_property_counter=self)
 
     def json(self):
         """
-        BotStatistics as JSON.
+        BotPropertyCounter as JSON.
         """
         return {
-            "generic": {
-                "ads_collected": self.ads_collected
-            },
-            "functions": self.properties
+            "name": self.name,
+            "count": self.count
         }
 
 
@@ -1895,7 +2124,7 @@ class Statistics(Model):
         Statistics as JSON.
         """
         return {
-            "instance": self.instance.pk,
+            "instance": self.instance_id,
             "session_statistics": self.session_statistics.json(),
             "artifact_statistics": self.artifact_statistics.json(),
             "prestige_statistics": self.prestige_statistics.json(),
@@ -0,0 +1,226 @@
+from settings import (
+    LOCAL_DATA_ARCHIVE_DIR, LOCAL_DATA_LOG_DIR, RETENTION_SESSION_DAYS, RETENTION_INTERVAL, RETENTION_BATCH_SIZE, RETENTION_VACUUM_PAGES
+)
+
+from django.db import connection, transaction
+
+from logger import application_logger
+
+from db.connections import thread_connection
+
+from datetime import datetime, timedelta
+
+import threading
+import gzip
+import glob
+import json
+import time
+import os
+
+
+logger = application_logger()
+
+
+class RetentionHandler(object):
+    """
+    Background retention engine, sessions that ended more than the configured amount of days ago are archived.
+
+    Archived sessions (along with their prestiges and aggregates) are appended to a compressed file for the month they
+    were started in, their log files are deleted, and their rows are removed a small batch at a time. Instance wide
+    aggregates are kept. Freed database pages are then returned incrementally, so bots are never blocked for long.
+    """
+    def __init__(self, days=RETENTION_SESSION_DAYS, interval=RETENTION_INTERVAL, batch_size=RETENTION_BATCH_SIZE):
+        """
+        Initialize retention handler, setting up default variables.
+        """
+        self._days = days
+        self._interval = interval
+        self._batch_size = batch_size
+
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """
+        Start the thread used to periodically apply our retention policy.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="titandash.retention", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """
+        Retention thread loop, applying our retention policy every interval.
+        """
+        while True:
+            try:
+                # Our retention thread is idle for most of its lifetime, the
+                # connection is only kept open while the policy is applied.
+                with thread_connection():
+                    self.apply()
+            # Failing to apply our policy should never stop the retention
+            # thread, another attempt is made on the next interval.
+            except Exception:
+                logger.exception("unable to apply retention policy.")
+
+            time.sleep(self._interval)
+
+    @staticmethod
+    def _protected():
+        """
+        Retrieve the sessions and logs that must never be removed, since an instance still references them.
+        """
+        # Local level import of required models.
+        # Avoid circular imports.
+        from db.models import BotInstance
+
+        _sessions, _logs = set(), set()
+
+        for session, last_prestige_session, log in BotInstance.objects.values_list("session_id", "last_prestige__session_id", "log_id"):
+            _sessions.update([session, last_prestige_session])
+            _logs.add(log)
+
+        # Empty references are discarded, they would
+        # otherwise exclude every row when filtering.
+        return _sessions - {None}, _logs - {None}
+
+    @staticmethod
+    def _archived(archive):
+        """
+        Retrieve the uuids of every session already present within the specified archive file.
+        """
+        _uuids = set()
+
+        if not os.path.exists(archive):
+            return _uuids
+
+        try:
+            with gzip.open(archive, "rt") as file:
+                for line in file:
+                    _uuids.add(json.loads(line)["session"]["uuid"])
+        # An archive that was interrupted while being written is
+        # only read up until the last complete session present.
+        except (EOFError, ValueError, KeyError):
+            pass
+
+        return _uuids
+
+    def _archive(self, sessions, archived):
+        """
+        Append the specified sessions to the compressed archive file for the month each session was started in.
+
+        Sessions already present within their archive are skipped, so a batch that failed to be removed is never
+        archived twice when it's retried. The uuids archived are kept in the "archived" dictionary, keyed by file.
+        """
+        # Local level import of required models.
+        # Avoid circular imports.
+        from db.models import StatisticsAggregate
+
+        _archives = {}
+
+        for session in sessions:
+            _archive = os.path.join(LOCAL_DATA_ARCHIVE_DIR, "sessions_{month}.jsonl.gz".format(month=session.started.strftime("%Y-%m")))
+
+            if _archive not in archived:
+                archived[_archive] = self._archived(archive=_archive)
+            if session.uuid in archived[_archive]:
+                continue
+
+            _archives.setdefault(_archive, []).append({
+                "session": session.json(),
+                "aggregates": StatisticsAggregate.objects.existing(instance_id=session.instance_id, session_id=session.pk).json()
+            })
+
+        for archive, records in _archives.items():
+            # Gzip files can be appended to safely, each batch
+            # is simply stored as an additional gzip member.
+            with gzip.open(archive, "at") as file:
+                for record in records:
+                    file.write(json.dumps(record, default=str) + "\n")
+
+            archived[archive].update(record["session"]["uuid"] for record in records)
+
+    @staticmethod
+    def _vacuum():
+        """
+        Return free database pages to the file system incrementally, enabling incremental vacuuming when possible.
+        """
+        # Local level import of required models.
+        # Avoid circular imports.
+        from db.models import BotInstance
+
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA auto_vacuum")
+
+            if cursor.fetchone()[0] != 2:
+                # Switching to incremental vacuuming requires a single full vacuum,
+                # which is only ever performed while no instances are running.
+                if BotInstance.objects.running().exists():
+                    return
+
+                logger.info("enabling incremental vacuuming, performing full database vacuum.")
+                cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                cursor.execute("VACUUM")
+                return
+
+            cursor.execute("PRAGMA incremental_vacuum({pages})".format(pages=RETENTION_VACUUM_PAGES))
+
+    def apply(self):
+        """
+        Apply our retention policy, archiving and removing expired sessions a batch at a time.
+        """
+        # Local level import of required models.
+        # Avoid circular imports.
+        from db.models import Session, Log
+
+        if not self._days:
+            return
+
+        _protected_sessions, _protected_logs = self._protected()
+        _expired = Session.objects.filter(stopped__lt=datetime.now() - timedelta(days=self._days)).exclude(pk__in=_protected_sessions)
+        _archives = {}
+        _archived = 0
+
+        while True:
+            _batch = list(_expired.select_related("log").prefetch_related("prestige_set").order_by("pk")[:self._batch_size])
+
+            if not _batch:
+                break
+
+            self._archive(sessions=_batch, archived=_archives)
+
+            with transaction.atomic():
+                # Prestiges, stage series, snapshots and session aggregates are
+                # removed alongside their sessions, instance aggregates are kept.
+                Session.objects.filter(pk__in=[session.pk for session in _batch]).delete()
+                Log.objects.filter(pk__in=[session.log_id for session in _batch if session.log_id not in _protected_logs]).delete()
+
+            for session in _batch:
+                # Only ever removing log files that are present
+                # within our own logging directory.
+                if session.log_id in _protected_logs or not session.log.log or not os.path.abspath(session.log.log).startswith(os.path.abspath(LOCAL_DATA_LOG_DIR)):
+                    continue
+                # Rotated log files and indexes are removed
+                # alongside the log file they belong to.
+                for log in [session.log.log, session.log.reader.index_file, session.log.structured, session.log.structured + ".idx"] + glob.glob(glob.escape(session.log.log) + ".*.gz"):
+                    try:
+                        os.remove(log)
+                    except FileNotFoundError:
+                        pass
+                    except OSError:
+                        logger.warning("unable to remove log file: {log}".format(log=log))
+
+            _archived += len(_batch)
+
+            # Freed pages are returned between each batch,
+            # keeping every individual write short.
+            self._vacuum()
+
+        if _archived:
+            logger.info("{archived} session(s) older than {days} day(s) have been archived.".format(archived=_archived, days=self._days))
+
+
+# Create an instance of the retention handler object
+# that can be used throughout the application.
+retention_handler = RetentionHandler()
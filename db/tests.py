@@ -0,0 +1,141 @@
+from django.test import TestCase
+from django.utils import timezone
+from django.db import connection
+
+from db.models import BotInstance, Configuration, Log, Session, Prestige, QueuedFunction, StatisticsAggregate
+from db.utilities import datatable, summarize_prestiges
+
+from datetime import timedelta
+
+
+class PrestigeTestCase(TestCase):
+    """
+    Base prestige test case, prestiges are created for a single instance and session.
+    """
+    def setUp(self):
+        """
+        Create the instance and session that each prestige is created for.
+        """
+        self.instance = BotInstance.objects.create()
+        self.session = Session.objects.create(
+            instance=self.instance,
+            uuid="test",
+            version="test",
+            started=timezone.now(),
+            log=Log.objects.create(log="test.log"),
+            configuration=Configuration.objects.create(),
+            snapshot_json="{}"
+        )
+
+    def prestige(self, stage, duration):
+        """
+        Create a single prestige for our instance and session.
+        """
+        return Prestige.objects.create(instance=self.instance, session=self.session, stage=stage, duration=duration)
+
+
+class SummarizePrestigesTestCase(PrestigeTestCase):
+    """
+    Summarize prestiges test case.
+    """
+    def test_fractional_average_duration(self):
+        """
+        Averages that are fractional (in microseconds) are still summarized.
+        """
+        self.prestige(stage=100, duration=timedelta(seconds=1))
+        self.prestige(stage=101, duration=timedelta(microseconds=2))
+        self.prestige(stage=999, duration=timedelta(seconds=5))
+
+        summary = summarize_prestiges(queryset=Prestige.objects.filter(instance=self.instance, stage__lt=500))
+
+        self.assertEqual(summary["count"], 2)
+        self.assertEqual(summary["average_stage"], 100.5)
+        self.assertEqual(summary["average_duration"], str(timedelta(microseconds=500001)))
+
+    def test_missing_durations(self):
+        """
+        Prestiges without any duration are counted, but never averaged.
+        """
+        self.prestige(stage=100, duration=None)
+
+        summary = summarize_prestiges(queryset=Prestige.objects.filter(instance=self.instance))
+
+        self.assertEqual(summary["count"], 1)
+        self.assertIsNone(summary["average_duration"])
+
+
+class StatisticsAggregateTestCase(PrestigeTestCase):
+    """
+    Statistics aggregate test case.
+    """
+    def test_stale_aggregates(self):
+        """
+        Prestiges included through stale copies of an aggregate are never lost.
+        """
+        aggregate = StatisticsAggregate.objects.grab(instance=self.instance)
+        stale = StatisticsAggregate.objects.get(pk=aggregate.pk)
+
+        aggregate.include_prestige(prestige=self.prestige(stage=100, duration=timedelta(seconds=1)))
+        stale.include_prestige(prestige=self.prestige(stage=50, duration=timedelta(microseconds=2)))
+        aggregate.refresh_from_db()
+
+        self.assertEqual(aggregate.prestige_count, 2)
+        self.assertEqual(aggregate.stage_sum, 150)
+        self.assertEqual(aggregate.best_stage, 100)
+        self.assertEqual(aggregate.duration_sum, timedelta(seconds=1, microseconds=2))
+        self.assertEqual(len(aggregate.recent), 2)
+
+
+class CompositeIndexesTestCase(TestCase):
+    """
+    Composite indexes test case, each composite index is used by the queries it was created for.
+    """
+    def setUp(self):
+        """
+        Create the instance that each query is filtered by.
+        """
+        self.instance = BotInstance.objects.create()
+        self.request = {"start": 0, "length": 10, "dateFrom": "2020-01-01", "dateTo": "2020-12-31"}
+
+    @staticmethod
+    def plan(queryset):
+        """
+        Retrieve the query plan of the specified queryset.
+        """
+        _sql, _params = queryset.query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + _sql, _params)
+            return " ".join(row[-1] for row in cursor.fetchall())
+
+    @staticmethod
+    def index(model, fields):
+        """
+        Retrieve the name of the composite index created for the specified model fields.
+        """
+        with connection.schema_editor() as editor:
+            return editor._create_index_name(model, [model._meta.get_field(field).column for field in fields], suffix="_idx")
+
+    def test_prestiges_datatable(self):
+        """
+        Prestiges datatable uses the instance and timestamp index.
+        """
+        _total, filtered, _page = datatable(queryset=Prestige.objects.filter(instance=self.instance), request=self.request, columns=["pk"], date_field="timestamp")
+
+        self.assertIn(self.index(model=Prestige, fields=["instance", "timestamp"]), self.plan(queryset=filtered))
+
+    def test_sessions_datatable(self):
+        """
+        Sessions datatable uses the instance and started index.
+        """
+        _total, filtered, _page = datatable(queryset=Session.objects.filter(instance=self.instance), request=self.request, columns=["pk"], date_field="started")
+
+        self.assertIn(self.index(model=Session, fields=["instance", "started"]), self.plan(queryset=filtered))
+
+    def test_queued_functions(self):
+        """
+        Queued functions use the instance and eta index.
+        """
+        _queued = QueuedFunction.objects.filter(instance=self.instance).order_by("eta")
+
+        self.assertIn(self.index(model=QueuedFunction, fields=["instance", "eta"]), self.plan(queryset=_queued))
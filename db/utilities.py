@@ -1,13 +1,23 @@
 from db.mixins import ExportModelMixin
+from db.connections import with_thread_connection
 
 from logger import application_logger
 
 from modules.bot.core.bot import Bot
 from modules.bot.core.window import WindowHandler
 from modules.bot.core.enumerations import State
+from modules.bot.core.cancellation import stopped_event
+
+from settings import DATETIME_FORMAT, DATATABLE_MAX_LENGTH
+
+from django.db.models import Q, F, Avg, Count, Sum, BigIntegerField, ExpressionWrapper
+
+from functools import lru_cache, reduce
+from datetime import datetime, timedelta
+
+import operator
 
 import threading
-import time
 
 
 logger = application_logger()
@@ -23,6 +33,115 @@ def generate_url(model, key):
     )
 
 
+@lru_cache(maxsize=512)
+def _format_datetime(value):
+    """
+    Format the specified datetime using our configured datetime format, memoized since values rarely change.
+    """
+    return value.strftime(format=DATETIME_FORMAT)
+
+
+def datetime_json(value):
+    """
+    Generate the datetime and formatted datetime dictionary used when serializing a datetime field.
+    """
+    return {
+        "datetime": value or None,
+        "formatted": _format_datetime(value) if value else None
+    }
+
+
+def _parse_date(value):
+    """
+    Parse a date string ("YYYY-MM-DD") sent by a date input, returning None when no valid date is present.
+    """
+    try:
+        return datetime.strptime(value, "%Y-%m-%d") if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def datatable(queryset, request, columns, search_fields=None, date_field=None, default_order="-pk"):
+    """
+    Apply the server side processing parameters sent by a datatable (offset/limit, sort column, search string and date
+    range) to the specified queryset, every operation is performed by the database.
+
+    "columns" contains the ordering lookup for each datatable column (None if a column can not be ordered). Returns the
+    total record count, the filtered queryset and the queryset representing the requested page.
+    """
+    _total = queryset.count()
+
+    # Searching is performed against all specified fields,
+    # any field containing the search value is matched.
+    _search = (request.get("search") or {}).get("value")
+
+    if _search and search_fields:
+        queryset = queryset.filter(reduce(operator.or_, [
+            Q(**{"{field}__icontains".format(field=field): _search}) for field in search_fields
+        ]))
+
+    # Date ranges are inclusive of both the first
+    # and the last day selected.
+    if date_field:
+        _from = _parse_date(request.get("dateFrom"))
+        _to = _parse_date(request.get("dateTo"))
+
+        if _from:
+            queryset = queryset.filter(**{"{field}__gte".format(field=date_field): _from})
+        if _to:
+            queryset = queryset.filter(**{"{field}__lt".format(field=date_field): _to + timedelta(days=1)})
+
+    _filtered = queryset
+
+    # Ordering by the requested column, falling back to our default
+    # order, which is also used to keep page contents stable.
+    _ordering = []
+
+    for _order in request.get("order") or []:
+        try:
+            _lookup = columns[int(_order["column"])]
+        except (KeyError, IndexError, TypeError, ValueError):
+            continue
+        if _lookup:
+            _ordering.append("{direction}{lookup}".format(direction="-" if _order.get("dir") == "desc" else "", lookup=_lookup))
+
+    queryset = queryset.order_by(*_ordering + [default_order])
+
+    # Page length is always bounded, ensuring the
+    # payload sent back never grows with history.
+    try:
+        _start = max(int(request.get("start", 0)), 0)
+        _length = min(max(int(request.get("length", DATATABLE_MAX_LENGTH)), 1), DATATABLE_MAX_LENGTH)
+    except (TypeError, ValueError):
+        _start, _length = 0, DATATABLE_MAX_LENGTH
+
+    return _total, _filtered, queryset[_start:_start + _length]
+
+
+def summarize_prestiges(queryset):
+    """
+    Summarize the specified prestiges (count, average stage and average duration) using a single query.
+    """
+    # Averaging a duration field directly is broken on sqlite, fractional averages can't be
+    # converted back into a duration, the average is derived from the sum and count instead.
+    _summary = queryset.aggregate(count=Count("pk"), average_stage=Avg("stage"), duration_sum=Sum("duration"), duration_count=Count("duration"))
+
+    return {
+        "count": _summary["count"],
+        "average_stage": _summary["average_stage"],
+        "average_duration": str(_summary["duration_sum"] / _summary["duration_count"]) if _summary["duration_count"] else None
+    }
+
+
+def duration_increment(field, duration):
+    """
+    Build an expression incrementing the specified duration field by a duration, for use within an update.
+    """
+    # Durations are stored as microseconds on sqlite, which can't add durations
+    # natively, the stored integer value is incremented directly instead.
+    return ExpressionWrapper(F(field), output_field=BigIntegerField()) + duration // timedelta(microseconds=1)
+
+
 def play(instance, configuration, window, shortcuts):
     """
     Attempt to initiate a new bot. (Play).
@@ -37,16 +156,14 @@ def play(instance, configuration, window, shortcuts):
         # Queue up an explicit termination of the running bot.
         QueuedFunction.objects.create(instance=instance, function="terminate")
 
-    # Wait until the instance has been terminated properly in the backend.
-    # Refreshing the instance instance each time.
-    while not instance.is_stopped():
-        # Loop forever until the instance is correctly in a stopped state.
-        time.sleep(0.1)
+        # Wait until the instance has been terminated properly in the backend,
+        # the event is set once the running bot has stopped the instance.
+        stopped_event(instance=instance).wait()
 
     # Initialize a new thread to run our bot within.
     # Options present must be valid (through GUI).
     threading.Thread(
-        target=Bot,
+        target=with_thread_connection(Bot),
         kwargs={
             "instance": instance,
             "configuration": Configuration.objects.get(pk=configuration),
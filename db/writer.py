@@ -0,0 +1,204 @@
+from settings import DB_WRITE_BEHIND_INTERVAL, DB_WRITE_BEHIND_BACKOFF, DB_WRITE_BEHIND_MAX_ATTEMPTS
+
+from django.db import transaction
+
+from logger import application_logger
+
+from collections import OrderedDict
+
+import itertools
+import threading
+import atexit
+
+
+logger = application_logger()
+
+
+class WriteBehind(object):
+    """
+    Write behind persistence layer, a single writer thread commits the changes made by every instance in batches.
+
+    Changes to the same model instance are coalesced, only the names of the changed fields are recorded and their
+    values are read from the model instance when the batch is committed, the owning bot always reads its own in-memory
+    model instances, so its own writes are visible right away. Use "flush" when a write must be durable (session end),
+    any pending writes are also flushed when the application exits.
+
+    When a batch fails to commit, each record is retried within its own transaction, so a single bad record never
+    rolls back any other records. Records that continue to fail are retried with a backoff, and discarded once the
+    maximum amount of attempts has been reached.
+    """
+    def __init__(self, interval=DB_WRITE_BEHIND_INTERVAL, backoff=DB_WRITE_BEHIND_BACKOFF, max_attempts=DB_WRITE_BEHIND_MAX_ATTEMPTS):
+        """
+        Initialize write behind layer, setting up default variables.
+        """
+        self._interval = interval
+        self._backoff = backoff
+        self._max_attempts = max_attempts
+        self._pending = OrderedDict()
+        self._attempts = {}
+        self._counter = itertools.count()
+
+        # Sequence numbers are used to determine when a flush
+        # has been satisfied by a committed batch.
+        self._sequence = 0
+        self._committed = 0
+        self._flush_requested = False
+
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def _ensure_thread(self):
+        """
+        Ensure the writer thread used to commit pending writes is currently running. Lock must be held.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="titandash.writer", daemon=True)
+            self._thread.start()
+
+    def _queue(self, key, record):
+        """
+        Queue the specified record, waking the writer thread if it's waiting for work. Lock must be held.
+        """
+        if not self._pending:
+            self._condition.notify_all()
+
+        self._pending[key] = record
+        self._sequence += 1
+
+        self._ensure_thread()
+
+    def write(self, obj, fields):
+        """
+        Record that the specified fields have been changed on the model instance.
+        """
+        _key = (obj._meta.label, obj.pk)
+
+        with self._condition:
+            if _key in self._pending:
+                # Coalesce with the pending record, the
+                # values will be read on commit regardless.
+                self._pending[_key][2].update(fields)
+                self._sequence += 1
+            else:
+                self._queue(key=_key, record=("write", obj, set(fields)))
+
+    def execute(self, function, *args, **kwargs):
+        """
+        Queue the specified database operation, executed within the next batch committed by the writer thread.
+        """
+        with self._condition:
+            self._queue(key=("execute", next(self._counter)), record=("execute", function, args, kwargs))
+
+    def flush(self, timeout=None):
+        """
+        Block until every write queued before this call has been committed, returning whether or not this was successful.
+        """
+        with self._condition:
+            if not self._pending and self._committed >= self._sequence:
+                return True
+
+            _target = self._sequence
+            self._flush_requested = True
+            self._condition.notify_all()
+
+            return self._condition.wait_for(lambda: self._committed >= _target, timeout=timeout)
+
+    @staticmethod
+    def _commit(batch):
+        """
+        Commit the specified batch of records within a single transaction.
+        """
+        with transaction.atomic():
+            for record in batch.values():
+                if record[0] == "write":
+                    _, obj, fields = record
+                    obj.__class__._base_manager.filter(pk=obj.pk).update(**{field: getattr(obj, field) for field in fields})
+                else:
+                    _, function, args, kwargs = record
+                    function(*args, **kwargs)
+
+    def _commit_records(self, batch):
+        """
+        Commit each record of the specified batch within its own transaction, returning the records that should be retried.
+        """
+        _failed = OrderedDict()
+
+        for key, record in batch.items():
+            try:
+                self._commit(batch={key: record})
+            except Exception:
+                _attempts = self._attempts.get(key, 0) + 1
+
+                # Records that continue to fail would otherwise block
+                # every other write (and flush) indefinitely.
+                if _attempts >= self._max_attempts:
+                    logger.exception("unable to commit write behind record: {key} after {attempts} attempt(s), discarding...".format(key=key, attempts=_attempts))
+                    self._attempts.pop(key, None)
+                    continue
+
+                logger.warning("unable to commit write behind record: {key}, retrying...".format(key=key), exc_info=True)
+
+                self._attempts[key] = _attempts
+                _failed[key] = record
+            else:
+                self._attempts.pop(key, None)
+
+        return _failed
+
+    def _run(self):
+        """
+        Writer thread loop, wait for pending writes and commit them in batches every interval.
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                # Give other writes a chance to be batched together,
+                # unless a flush has been explicitly requested.
+                self._condition.wait_for(lambda: self._flush_requested, timeout=self._interval)
+
+                _batch, self._pending = self._pending, OrderedDict()
+                _sequence = self._sequence
+                self._flush_requested = False
+
+            # Batches containing records being retried are always committed one record
+            # at a time, so failing records are never attempted twice in a row.
+            if any(key in self._attempts for key in _batch):
+                _failed = self._commit_records(batch=_batch)
+            else:
+                try:
+                    self._commit(batch=_batch)
+                    _failed = None
+                # Unable to commit our batch, each record is committed on its own
+                # instead, only the records that fail again are retried later.
+                except Exception:
+                    logger.exception("unable to commit write behind batch, committing records individually...")
+                    _failed = self._commit_records(batch=_batch)
+
+            with self._condition:
+                if not _failed:
+                    self._committed = _sequence
+                    self._condition.notify_all()
+                    continue
+
+                # Failed records are kept ahead of any records
+                # queued while we were attempting our commit.
+                for key, record in self._pending.items():
+                    if key in _failed and record[0] == "write":
+                        _failed[key][2].update(record[2])
+                    else:
+                        _failed[key] = record
+
+                self._pending = _failed
+
+                # Backing off before our failed records are retried,
+                # the delay is doubled with each subsequent attempt.
+                self._condition.wait_for(lambda: False, timeout=self._backoff * 2 ** (max(self._attempts[key] for key in _failed if key in self._attempts) - 1))
+
+
+# Create an instance of the write behind object
+# that can be used throughout the application.
+write_behind = WriteBehind()
+
+# Any pending writes should be committed
+# before the application exits.
+atexit.register(write_behind.flush, timeout=10)
@@ -1,7 +1,7 @@
 from django.db.models import Q
 
 from settings import (
-    VERSION, TESSERACT_PATH, MAX_STAGE
+    VERSION, TESSERACT_PATH, MAX_STAGE, DB_WRITE_BEHIND_FLUSH_TIMEOUT
 )
 
 from modules.auth.authenticator import Authenticator
@@ -11,11 +11,19 @@ from modules.bot.core.configurations import (
 )
 from modules.bot.core.globals import Globals
 from modules.bot.core.shortcuts import shortcuts_handler
+from db.writer import write_behind
+
+from modules.bot.core.queued import queued_handler
+from modules.bot.core.scheduler import scheduler_handler
+from modules.bot.core.counters import property_counters
+from modules.bot.core.series import stage_buffer
+from modules.bot.core.cancellation import CancellationToken
+from modules.bot.core.deferred import DeferredQueue
 from modules.bot.core.exceptions import ServerTerminationEncountered, TerminationEncountered
 from modules.bot.core.attributes import DynamicAttributes
 from modules.bot.core.properties import Properties
 from modules.bot.core.decorators import wait_afterwards, BotProperty as bot_property
-from modules.bot.core.utilities import bot_logger, format_delta, delta_from_value_string
+from modules.bot.core.utilities import bot_logger, close_logger, format_delta, delta_from_value_string
 from modules.bot.core.enumerations import (
     Button, SkillLevel, Skill, Perk, Panel, EquipmentTab,
     Timeout, Minigame, HeroType, Color
@@ -29,9 +37,6 @@ from pytesseract import pytesseract
 
 from imagehash import average_hash
 
-from apscheduler.schedulers.base import STATE_RUNNING, STATE_STOPPED, STATE_PAUSED
-from apscheduler.triggers.interval import IntervalTrigger
-from apscheduler.schedulers.background import BackgroundScheduler
 
 from pyautogui import FailSafeException
 
@@ -51,6 +56,10 @@ import cv2
 # should be executed or not.
 _globals = Globals()
 
+# Queued functions that may still be executed
+# while a bot instance is paused.
+PAUSED_FUNCTIONS = ["resume", "terminate"]
+
 # Ensure we're using the correct tesseract executable
 # included within the distributable.
 pytesseract.tesseract_cmd = TESSERACT_PATH
@@ -70,12 +79,16 @@ class Bot(object):
 
         self._should_terminate = False
         self._should_pause = False
+        # Every wait performed by this bot is performed through our
+        # cancellation token, allowing terminations to take effect right away.
+        self.token = CancellationToken()
         self._last_stage = None
         self._last_snapshot = None
         self._advanced_start = None
 
         self.configuration = configuration
         self.window = window
+        self.window.token = self.token
         self.shortcuts = shortcuts
         self.instance = instance
 
@@ -96,13 +109,21 @@ class Bot(object):
         self.regions = DynamicAttributes(attributes=GAME_REGIONS, logger=self.logger)
 
         self.properties = Properties(instance=self.instance, logger=self.logger)
+        # Low priority work is deferred until the bot is idle,
+        # executed while waiting after each function.
+        self.deferred = DeferredQueue(logger=self.logger)
 
         self.session = Session.objects.generate(instance=self.instance, configuration=self.configuration, logger=self.logger)
         self.statistics = Statistics.objects.grab(instance=self.instance)
 
         self.statistics.session_statistics.sessions.add(self.session)
 
-        self.scheduler = self._setup_function_scheduler()
+        # Reload any pending queued functions for this instance, functions queued
+        # before a restart will still be released once their eta is reached.
+        queued_handler.reload(instance=self.instance)
+        queued_handler.register(instance=self.instance, token=self.token)
+
+        self._setup_function_scheduler()
         self.enabled_skills = self._calculate_enabled_skills()
         self.minigame_order = self._calculate_minigame_order()
         self.enabled_perks = self._calculate_enabled_perks()
@@ -140,20 +161,16 @@ class Bot(object):
 
     def _setup_function_scheduler(self):
         """
-        Setup the background function scheduler present on a bot instance, any interval based jobs are added here.
+        Setup the interval based jobs for this bot instance within our shared function scheduler.
         """
-        _scheduler = BackgroundScheduler()
-
         # Find all interval based bot properties.
         # These should be populated at run time and available
         # when instances are initialized.
         for prop in bot_property.intervals():
-            _scheduler.add_job(func=getattr(self, prop["name"]), trigger=IntervalTrigger(seconds=prop["interval"]), id=prop["name"])
+            scheduler_handler.add(instance=self.instance, name=prop["name"], func=getattr(self, prop["name"]), interval=prop["interval"])
             # Log some information about the scheduled function that's been added to the scheduler.
             self.logger.debug("function: {function} has been scheduled. (every {interval} second(s)).".format(function=prop["name"], interval=prop["interval"]))
 
-        return _scheduler
-
     def _snapshot(self, region=None, downsize=None):
         """
         Attempt to take a screenshot of the current in game screen.
@@ -191,6 +208,7 @@ class Bot(object):
         # Default our position value to the no image could be found
         # default value [-1, -1].
         _position = [-1, -1]
+        _started = time.time()
 
         # If a list of images is being searched for, begin looping through
         # all images specified, once the first image is found, the loop is broken.
@@ -207,14 +225,18 @@ class Bot(object):
         else:
             _position = imagesearcharea(window=self.window, image=image, **_search)
 
+        # Structured fields are included with our image search
+        # logs, available when structured logs are enabled.
+        _extra = {"image": str(image_name or image), "duration": round(time.time() - _started, 4)}
+
         if _position[0] != -1:
             # The image was successfully found on the screen. Log some information about the
             # successful image search.
-            self.logger.debug("successfully found image: {image}.".format(image=image_name or image))
+            self.logger.debug("successfully found image: {image}.".format(image=image_name or image), extra=dict(_extra, event="image_found"))
         else:
             # The image could not be found on the screen at all, log some information
             # about the un-successful image search.
-            self.logger.debug("could not find image: {image}.".format(image=image_name or image))
+            self.logger.debug("could not find image: {image}.".format(image=image_name or image), extra=dict(_extra, event="image_missing"))
 
         # Do we want to return both whether or not the image was found,
         # and the position that the image was found at?
@@ -390,10 +412,19 @@ class Bot(object):
         """
         Re-calculate all of the calculation based functions present on a bot instance.
         """
-        for calculate in [f for f in dir(self) if f.startswith("calculate_")]:
-            # Attempt to dynamically grab each calculation function and
-            # run them manually, ensuring that properties are all updated.
-            getattr(self, calculate)()
+        # Coalesce every calculation into as few
+        # instance saves as possible.
+        with self.properties.batch():
+            for calculate in [f for f in dir(self) if f.startswith("calculate_")]:
+                # Attempt to dynamically grab each calculation function and
+                # run them manually, ensuring that properties are all updated.
+                getattr(self, calculate)()
+
+    def wait(self, seconds, interruptible=False):
+        """
+        Wait for the specified amount of seconds, raising right away if this bot instance is terminated.
+        """
+        return self.token.wait(seconds=seconds, interruptible=interruptible)
 
     def click(self, point, clicks=1, interval=0.0, button=Button.LEFT, offset=5, pause=0.0):
         """
@@ -612,12 +643,15 @@ class Bot(object):
         _result = ''.join(filter(lambda x: x.isdigit(), _result))
         # Can we now successfully get an integer from the result?
         # If we have an integer, we can properly check conditionals.
-        if _result:
+        if not _result:
+            self.logger.debug("stage could not be parsed.", extra={"event": "ocr_failed", "key": "stage"})
+        else:
             try:
                 _result = int(_result)
             except ValueError:
                 # No stage could be parsed out at all, exit early without
                 # setting any properties or updating any instance values.
+                self.logger.debug("stage could not be parsed.", extra={"event": "ocr_failed", "key": "stage"})
                 return
 
             # Stage is available, check conditionals then update bot values.
@@ -630,6 +664,10 @@ class Bot(object):
             self._last_stage = self.properties.stage
             self.properties.stage = _result
 
+            # Every stage parsed is also recorded within
+            # the stage series for our current session.
+            stage_buffer.record(session=self.session, stage=_result)
+
     @bot_property(queueable=True, tooltip="Parse out the current levels of skills currently in game.", transition=True)
     def parse_current_skills(self, skill=None):
         """
@@ -664,7 +702,7 @@ class Bot(object):
                     _result = int(_result)
                 except ValueError:
                     self.prestige_skills_levels[_skill] = 0
-                    self.logger.warn("skill: {skill} was parsed incorrectly, defaulting to level 0 instead...".format(skill=_skill))
+                    self.logger.warn("skill: {skill} was parsed incorrectly, defaulting to level 0 instead...".format(skill=_skill), extra={"event": "ocr_failed", "key": _skill})
                     continue
 
                 # Update the current skill level for current skill in loop.
@@ -1135,6 +1173,10 @@ class Bot(object):
         """
         Update the bot statistics by travelling to the statistics page in game and grabbing the values.
         """
+        # Local level import of the snapshot model,
+        # avoid circular import issues.
+        from db.models import GameStatisticsSnapshot
+
         if self.configuration.enable_statistics:
             if force or datetime.now() > self.properties.next_statistics_update:
                 self.logger.info("{begin_or_force} in game statistics update now.".format(
@@ -1144,7 +1186,7 @@ class Bot(object):
                 with self.leave_boss():
                     # Sleep a little bit before attempting to goto the top of the heroes panel so
                     # that new hero levels do not cause the "top" of the panel to disappear after travelling.
-                    time.sleep(2)
+                    self.wait(2)
 
                     with self.goto_heroes():
                         # Make sure the top of the stats panel before attempting to travel
@@ -1156,7 +1198,7 @@ class Bot(object):
                             self.click(point=self.locations.hero_stats_collapsed, pause=1)
 
                         # Scroll to the bottom of the statistics panel.
-                        time.sleep(1)
+                        self.wait(1)
                         # Loop five times and travel down to the bottom of the statistics panel.
                         for i in range(5):
                             self.drag(start=self.locations.game_scroll_start, end=self.locations.game_scroll_bottom_end)
@@ -1220,13 +1262,27 @@ class Bot(object):
                                 # Update the statistics instance attached to this bot session with the parsed
                                 # result value. Save afterwards to update backend statistics model.
                                 setattr(self.statistics.game_statistics, key, _result)
-                                self.statistics.game_statistics.save()
+                                write_behind.write(obj=self.statistics.game_statistics, fields=[key])
+
+                                # Our highest stage is also denormalized onto our instance, keeping
+                                # our instance serialization free of any statistics lookups.
+                                if key == "highest_stage_reached":
+                                    _highest_stage = self.statistics.game_statistics.highest_stage()
+                                    self.properties.highest_stage = int(_highest_stage) if _highest_stage else None
 
                             # Gracefully continue our loop if a failure occurs.
                             # during the parsing process.
                             except ValueError:
                                 self.logger.exception("could not parse key: {key}, result: {result}.".format(key=key, result=_result))
 
+                        # Every statistics update is also stored as a numeric snapshot,
+                        # committed alongside our parsed statistics by our write behind layer.
+                        write_behind.execute(GameStatisticsSnapshot.objects.capture(
+                            instance=self.instance,
+                            session=self.session,
+                            statistics=self.statistics.game_statistics
+                        ).save)
+
     @bot_property()
     def should_prestige(self):
         """
@@ -1263,17 +1319,17 @@ class Bot(object):
                 # Prestige when the highest stage taken from the bot instances statistics
                 # is surpassed.
                 elif self.configuration.prestige_at_max_stage:
-                    if _current_stage >= self.statistics.game_statistics.highest_stage:
+                    if self.properties.highest_stage and _current_stage >= self.properties.highest_stage:
                         _ready = True
                 # Prestige at a defined percent of the current highest stage taken
                 # from the bot instances statistics.
                 elif self.configuration.prestige_at_max_stage_percent != 0:
                     _percent = float(self.configuration.prestige_at_max_stage_percent) / 100
-                    _threshold = int(self.statistics.game_statistics.highest_stage * _percent)
+                    _threshold = int((self.properties.highest_stage or 0) * _percent)
 
                     # Is the current stage greater than or equal to the derived
                     # percent threshold to ensure a prestige takes place.
-                    if _current_stage >= _threshold:
+                    if _threshold and _current_stage >= _threshold:
                         _ready = True
 
         # Ready has been hit proper, we now setup the randomized threshold values so that the next
@@ -1303,7 +1359,7 @@ class Bot(object):
         """
         # Local level import of required models to avoid circular
         # import issues.
-        from db.models import Artifact, Prestige
+        from db.models import Artifact, Prestige, StatisticsAggregate
 
         # Begin by retrieving the time since a prestige last took place.
         # We must use the proper region based on whether or not an event is in progress.
@@ -1345,6 +1401,10 @@ class Bot(object):
         self.statistics.prestige_statistics.prestiges.add(_prestige)
         self.statistics.prestige_statistics.save()
 
+        # Precomputed aggregates are updated incrementally
+        # through our write behind layer.
+        write_behind.execute(StatisticsAggregate.objects.prestige, prestige=_prestige)
+
         # We also need to retrieve the advanced start value from the same screen.
         # Advanced start will allow us to improve stage parsing.
         _region = self.regions.prestige_event["prestige_advanced_start"] if _globals.game_event_enabled() else self.regions.prestige_base["prestige_advance_start"]
@@ -1379,7 +1439,7 @@ class Bot(object):
                         break
 
                     # Sleep slightly in between each attempt to find the tournament icon.
-                    time.sleep(0.2)
+                    self.wait(0.2)
 
                 if _found:
                     self.click(point=self.locations.tournament_icon, pause=2)
@@ -1447,11 +1507,11 @@ class Bot(object):
                     with self.goto_master():
                         # Sleep slightly before even attempting to begin
                         # the prestige process.
-                        time.sleep(5)
+                        self.wait(5)
 
                         # Pause all scheduler functionality while prestige is taking place.
-                        if self.scheduler.state == STATE_RUNNING:
-                            self.scheduler.pause()
+                        if not scheduler_handler.paused(instance=self.instance):
+                            scheduler_handler.pause(instance=self.instance)
 
                         # Reset any properties that are reset or changed when a prestige takes place.
                         self.properties.newest_hero = None
@@ -1474,7 +1534,7 @@ class Bot(object):
                             self.properties.stage = advanced_start or 0
                             # Sleep explicitly if a tournament was joined. Since we update the last
                             # prestige and advanced start right after that happens.
-                            time.sleep(35)
+                            self.wait(35)
 
                             # Should perks be ran since a prestige just took place?
                             if self.configuration.enable_perk_usage and self.configuration.enable_perk_only_tournament:
@@ -1510,8 +1570,8 @@ class Bot(object):
 
                         # Prestige has been finished at this point, begin executing al functionality
                         # that should occur after a prestige is done.
-                        if self.scheduler.state == STATE_PAUSED:
-                            self.scheduler.resume()
+                        if scheduler_handler.paused(instance=self.instance):
+                            scheduler_handler.resume(instance=self.instance)
                         if self.configuration.prestige_x_minutes != 0:
                             self.calculate_next_prestige()
 
@@ -1521,7 +1581,7 @@ class Bot(object):
                         self.activate_skills(force=True)
                         # Add a small wait period after skills are activated,
                         # allowing us to gain some gold before levelling heroes.
-                        time.sleep(2)
+                        self.wait(2)
                         # Level up heroes in game, once we've waited to gain some gold.
                         self.level_heroes(force=True)
 
@@ -1647,24 +1707,27 @@ class Bot(object):
                 # Create a delta that represents how long the break should be.
                 _delta = _time_resume - _time_break
 
-                # If the break is just being forced, we should modify the break values to the current
-                # datetime plus whatever the most recent break was calculated as.
-                if force:
-                    self.properties.next_break = _now
-                    self.properties.break_resume = _now + _delta
-
-                # Modifying all our "next_" attributes to take place after their normal
-                # calculated time with a bit of padding after a break has finished.
-                for prop in [prop for prop in self.properties.fields if prop.split("_")[0] == "next" and prop not in [
-                    # Ignore any of these properties, since they should not be modified
-                    # through the break process.
-                    "next_break", "next_raid_attack_reset", "next_artifact_upgrade"
-                ]]:
-                    _value = getattr(self.properties, prop, None)
-                    # Is the value currently setting to something valid that we can change?
-                    if _value:
-                        # Add padding to the next activation value.
-                        setattr(self.properties, prop, _value + _delta + timedelta(seconds=30))
+                # All break values are re-calculated within a single atomic batch,
+                # the instance is saved (and our dashboard updated) only once.
+                with self.properties.batch(atomic=True):
+                    # If the break is just being forced, we should modify the break values to the current
+                    # datetime plus whatever the most recent break was calculated as.
+                    if force:
+                        self.properties.next_break = _now
+                        self.properties.break_resume = _now + _delta
+
+                    # Modifying all our "next_" attributes to take place after their normal
+                    # calculated time with a bit of padding after a break has finished.
+                    for prop in [prop for prop in self.properties.fields if prop.split("_")[0] == "next" and prop not in [
+                        # Ignore any of these properties, since they should not be modified
+                        # through the break process.
+                        "next_break", "next_raid_attack_reset", "next_artifact_upgrade"
+                    ]]:
+                        _value = getattr(self.properties, prop, None)
+                        # Is the value currently setting to something valid that we can change?
+                        if _value:
+                            # Add padding to the next activation value.
+                            setattr(self.properties, prop, _value + _delta + timedelta(seconds=30))
 
                 # Create the initial log datetime, we use this to determine how often
                 # a log should be outputted with information about when the bot will be resumed.
@@ -1687,7 +1750,9 @@ class Bot(object):
                         self.logger.info("waiting for break to finish... ({end})".format(end=format_delta(delta=self.properties.break_resume - _now)))
                         _log_dt = _now + _log_delta
 
-                    time.sleep(1)
+                    # Wait until our next log should be emitted, or until the break is over,
+                    # whichever comes first. Terminations will still wake us right away.
+                    self.wait((min(_log_dt, self.properties.break_resume) - _now).total_seconds())
 
     @bot_property(forceable=True, calculate="calculate_next_daily_achievement_check", shortcut="ctrl+d", tooltip="Force a daily achievement check in game.", transition=True)
     def daily_achievements(self, force=False):
@@ -1742,7 +1807,7 @@ class Bot(object):
                         self.click(point=self.locations.milestones_collect, pause=1)
                         self.click(point=self.locations.game_middle, clicks=5, interval=0.5)
                         # Wait for a little while after collecting the milestone.
-                        time.sleep(3)
+                        self.wait(3)
 
                     # Otherwise, no milestones are actually available to be completed
                     # at this time.
@@ -1825,7 +1890,7 @@ class Bot(object):
 
                 # Wait slightly after clicking has taken place to ensure that
                 # any delayed fairy ads are ready when the next transition state is checked.
-                time.sleep(1)
+                self.wait(1)
 
     @bot_property(forceable=True, calculate="calculate_next_minigames_tap", tooltip="Force minigame tapping process in game.", transition=True)
     def minigames(self, force=False):
@@ -1866,7 +1931,7 @@ class Bot(object):
 
                     # Wait slightly after clicking has taken place to ensure that
                     # any delayed fairy ads are ready when the next transition state is checked.
-                    time.sleep(2)
+                    self.wait(2)
 
     @bot_property(queueable=True, tooltip="Attempt parse out all owned artifacts from in game.", transition=True)
     def parse_artifacts(self):
@@ -1939,7 +2004,7 @@ class Bot(object):
 
                     # Wait slightly after each drag, otherwise our images could potentially
                     # never find duplicates the image is taken while the drag is in progress.
-                    time.sleep(1.5)
+                    self.wait(1.5)
 
                     self._snapshot(region=self.regions.artifact_parse, downsize=0.5)
 
@@ -1977,7 +2042,7 @@ class Bot(object):
 
                 # Update our bots artifact statistics now that
                 # we should have all found artifact in one variable.
-                self.statistics.artifact_statistics.artifacts.filter(artifact__name__in=_found).update(owned=True)
+                write_behind.execute(self.statistics.artifact_statistics.artifacts.filter(artifact__name__in=_found).update, owned=True)
 
     @bot_property(queueable=True, shortcut="shift+a", tooltip="Begin the artifact discovery/enchantment/purchase process in game.", transition=True)
     def artifacts(self):
@@ -2148,7 +2213,7 @@ class Bot(object):
 
                     # Boss fight wasn't found and clicked on yet, wait a little while
                     # before attempting to enter the boss fight again.
-                    time.sleep(0.5)
+                    self.wait(0.5)
 
             # Yield true once we've either found the image and
             # broken out of our loop, or the fight boss image was never present.
@@ -2177,7 +2242,7 @@ class Bot(object):
 
                     # Leave boss fight wasn't found and clicked on yet, wait a little while
                     # before attempting to enter the boss fight again.
-                    time.sleep(0.5)
+                    self.wait(0.5)
 
             # Yield true once we've either found the image and
             # broken out of our loop, or the leave boss image was never present.
@@ -2214,7 +2279,7 @@ class Bot(object):
                 if not _found:
                     # None of the valid images were found or clicked,
                     # Sleep slightly before continuing.
-                    time.sleep(1)
+                    self.wait(1)
 
             if _found:
                 yield True
@@ -2474,7 +2539,7 @@ class Bot(object):
                 self.click(point=self.locations.clan_icon)
 
                 # Wait slightly after attempting to open the clan panel.
-                time.sleep(3)
+                self.wait(3)
             # Reaching this point means we definitely reached the clan panel.
             # Just yield a truthy variable.
             yield True
@@ -2492,10 +2557,10 @@ class Bot(object):
         # with this bot.
         self.instance.pause()
 
-        # Make sure we also pause our function scheduler
-        # if it is currently running.
-        if self.scheduler.state == STATE_RUNNING:
-            self.scheduler.pause()
+        # Make sure we also pause our scheduled functions
+        # if they are currently running.
+        if not scheduler_handler.paused(instance=self.instance):
+            scheduler_handler.pause(instance=self.instance)
 
     @bot_property(queueable=True, shortcut="r", tooltip="Resume all bot functionality.")
     def resume(self):
@@ -2508,10 +2573,10 @@ class Bot(object):
         # with this bot.
         self.instance.resume()
 
-        # Make sure we also resume our function scheduler
-        # if it is currently running.
-        if self.scheduler.state == STATE_PAUSED:
-            self.scheduler.resume()
+        # Make sure we also resume our scheduled functions
+        # if they are currently paused.
+        if scheduler_handler.paused(instance=self.instance):
+            scheduler_handler.resume(instance=self.instance)
 
     @bot_property(queueable=True, shortcut="e", tooltip="Terminate all bot functionality.")
     def terminate(self):
@@ -2577,7 +2642,7 @@ class Bot(object):
             # Update and increment the current number of ads collected
             # for this bot instance and save.
             self.statistics.bot_statistics.ads_collected += 1
-            self.statistics.bot_statistics.save()
+            write_behind.write(obj=self.statistics.bot_statistics, fields=["ads_collected"])
 
     def welcome_screen_check(self):
         """
@@ -2649,10 +2714,9 @@ class Bot(object):
         """
         Run any pre run functionality that should happen before the main event loop takes place.
         """
-        # Boot up the scheduler instance so that it begins
-        # running all interval based functions.
-        if self.scheduler.state == STATE_STOPPED:
-            self.scheduler.start()
+        # Resume our scheduled functions so that we
+        # begin running all interval based functions.
+        scheduler_handler.resume(instance=self.instance)
 
         # Parse out the current skills from in game.
         # We do this once before starting our run to make
@@ -2683,10 +2747,6 @@ class Bot(object):
         """
         Run this bot instance, beginning the main event loop that executes all loop functions and checks for queued functions.
         """
-        # Local level import of the queued function model.
-        # Avoid circular imports.
-        from db.models import QueuedFunction
-
         # Encapsulating everything in a try catch block so that we can check for
         # our own exceptions that should resume/pause or stop bot instances, as well
         # as any exceptions that are thrown during runtime.
@@ -2708,7 +2768,6 @@ class Bot(object):
                 self.update_next_artifact_purchase()
 
             _loop_functions = self.setup_loop_functions()
-            _loop_paused_dt = datetime.now() + timedelta(seconds=10)
 
             while True:
                 for _function in _loop_functions:
@@ -2719,13 +2778,15 @@ class Bot(object):
 
                     # Explicitly queued functions should be executed (checked) once each time a new loop
                     # function is entered. Ensuring that we "resume" where we left when the queued function
-                    # was encountered.
-                    for _queued in QueuedFunction.objects.filter(instance=self.instance):
+                    # was encountered. Only functions whose eta has been reached are released to us.
+                    while True:
                         # Queued functions should only be ran if the instance
                         # is not in a paused state, a paused bot should only allow
-                        # the "resume" function to be executed.
-                        if self._should_pause and _queued.function != "resume":
-                            # Breaking here if queued function should not be
+                        # the "resume" and "terminate" functions to be executed.
+                        _queued = queued_handler.pop(instance=self.instance, functions=PAUSED_FUNCTIONS if self._should_pause else None)
+
+                        if not _queued:
+                            # Breaking here if no queued function should be
                             # executed yet. Continuing to normal functionality below.
                             break
 
@@ -2741,7 +2802,7 @@ class Bot(object):
 
                             # Generate the decorated callable that will ensure our function
                             # call sleeps for a random amount of time after being called.
-                            wait = wait_afterwards(function=getattr(self, _queued.function), floor=_wait_floor, ceiling=_wait_ceiling)
+                            wait = wait_afterwards(function=getattr(self, _queued.function), floor=_wait_floor, ceiling=_wait_ceiling, token=self.token, deferred=self.deferred)
 
                             # Make sure we use the proper "force" flag for our queued function
                             # if the function is specified as a forceable through our decorator.
@@ -2766,25 +2827,27 @@ class Bot(object):
                         # since we could be in this conditional for a while.
                         _globals.failsafe_check()
 
-                        # Bot is paused when in this function.
-                        # Check whether or not a log should be emitted
-                        # about us waiting for a resume before continuing.
-                        _now = datetime.now()
+                        # The server may be shutdown while we're paused, since
+                        # no bot properties are executed, check this explicitly.
+                        if _globals.application_state() is False:
+                            raise ServerTerminationEncountered()
 
-                        # Current timestamp is greater than the current paused datetime
-                        # timestamp, this makes sure we don't emit a log on every execution of this.
-                        if _now > _loop_paused_dt:
-                            self.logger.info("waiting for bot resume...")
+                        self.logger.info("waiting for bot resume...")
 
-                            # Update the paused datetime log value.
-                            # Ten seconds later, another one will be emitted.
-                            _loop_paused_dt = _now + timedelta(seconds=10)
+                        # Block until a function is released to this instance, no cpu time
+                        # is used while we're waiting here. Terminations and server shutdowns
+                        # wake us up right away, otherwise we emit our log every ten seconds.
+                        self.wait(10, interruptible=True)
 
                         continue
 
+                    # Bot property usage counts are flushed while we're idle,
+                    # the periodic flush only needs to handle what's left over.
+                    self.deferred.defer(property_counters.flush, key="flush_property_counters", statistics=self.statistics.bot_statistics)
+
                     # Just run the loop function normally.
                     # Queued functions are taken care of above.
-                    wait_afterwards(function=getattr(self, _function), floor=_wait_floor, ceiling=_wait_ceiling)()
+                    wait_afterwards(function=getattr(self, _function), floor=_wait_floor, ceiling=_wait_ceiling, token=self.token, deferred=self.deferred)()
 
         # The eel server has been terminated and we can end the bot instance
         # correctly to avoid running instances on restarts.
@@ -2810,10 +2873,25 @@ class Bot(object):
         # Make sure we perform any required cleanup after a bot instance
         # has stopped running, regardless of why.
         finally:
-            # Stop the function schedulers functionality once
-            # the bot session has finished execution.
-            if self.scheduler.state in [STATE_RUNNING, STATE_PAUSED]:
-                self.scheduler.shutdown(wait=False)
+            # Remove our scheduled functions once the bot session has finished
+            # execution, logging the lag and jitter encountered by each one.
+            self.logger.debug("scheduled function metrics: {metrics}".format(metrics=scheduler_handler.metrics(instance=self.instance)))
+            scheduler_handler.remove(instance=self.instance)
+
+            # Functions released to this instance no longer need
+            # to signal our cancellation token.
+            queued_handler.unregister(instance=self.instance)
+
+            # Flush any pending bot property usage counts for this
+            # instance so nothing is lost when the session ends.
+            property_counters.flush(statistics=self.statistics.bot_statistics)
+            # Flush any stages recorded within our session's stage
+            # series that haven't been written yet.
+            stage_buffer.flush(session=self.session)
+            # Any pending writes made by this instance should be committed before the
+            # session is ended, the session must end even when they can't be.
+            if not write_behind.flush(timeout=DB_WRITE_BEHIND_FLUSH_TIMEOUT):
+                self.logger.warning("pending writes could not be flushed within {timeout} second(s), ending session regardless.".format(timeout=DB_WRITE_BEHIND_FLUSH_TIMEOUT))
 
             # Ending the session here, handling the stopped datetime
             # and stopping of the instance itself.
@@ -2827,10 +2905,10 @@ class Bot(object):
             self.logger.info("{session}".format(session=self.session))
             self.logger.info("==========================================================================================")
 
-            # Ensure our logger object has all of it's handlers removed
-            # manually in case of subsequent starts and handlers being
-            # added again.s
-            self.logger.handlers = []
+            # Ensure our logger object has all of it's handlers removed and
+            # closed, in case of subsequent starts and handlers being added
+            # again, any records still queued are written before closing.
+            close_logger(logger=self.logger)
 
             # Ensure authenticator puts the account in question
             # into the proper state when the instance is shutdown.
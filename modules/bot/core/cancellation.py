@@ -0,0 +1,111 @@
+from modules.bot.core.exceptions import TerminationEncountered, ServerTerminationEncountered
+
+import threading
+import weakref
+
+# Keep track of every token that is currently alive, shutting down the
+# application server cancels all of them at once.
+_tokens = weakref.WeakSet()
+_tokens_lock = threading.Lock()
+
+# Keep track of an event for each bot instance that is set
+# whenever the instance has been stopped completely.
+_stopped = {}
+_stopped_lock = threading.Lock()
+
+
+class CancellationToken(object):
+    """
+    Cooperative cancellation token, every wait performed by a bot instance should be performed through its token.
+
+    Cancelling a token wakes any waits right away and raises the exception the token was cancelled with, interrupting
+    a token only wakes up "interruptible" waits (idle periods between functions), which return early without raising.
+    """
+    def __init__(self):
+        """
+        Initialize cancellation token, setting up default variables.
+        """
+        self._condition = threading.Condition()
+        self._exception = None
+        self._interrupted = False
+
+        with _tokens_lock:
+            _tokens.add(self)
+
+    @property
+    def cancelled(self):
+        """
+        Return whether or not this token has been cancelled.
+        """
+        return self._exception is not None
+
+    @property
+    def interrupted(self):
+        """
+        Return whether or not this token has a pending interruption (or has been cancelled).
+        """
+        return self._interrupted or self.cancelled
+
+    def cancel(self, exception=TerminationEncountered):
+        """
+        Cancel this token, any current or future waits will raise the specified exception.
+        """
+        with self._condition:
+            # The first cancellation always wins, a termination
+            # should not be replaced by a server termination.
+            if self._exception is None:
+                self._exception = exception
+
+            self._condition.notify_all()
+
+    def interrupt(self):
+        """
+        Interrupt this token, waking the current (or next) interruptible wait.
+        """
+        with self._condition:
+            self._interrupted = True
+            self._condition.notify_all()
+
+    def check(self):
+        """
+        Raise the exception this token was cancelled with, if it has been cancelled.
+        """
+        if self._exception is not None:
+            raise self._exception()
+
+    def wait(self, seconds, interruptible=False):
+        """
+        Wait for the specified amount of seconds, raising right away if the token is cancelled.
+
+        Returns whether or not the entire wait elapsed, interruptible waits may return early.
+        """
+        with self._condition:
+            _woken = self._condition.wait_for(lambda: self._exception is not None or (interruptible and self._interrupted), timeout=seconds)
+
+            # Interruptions are consumed by the
+            # first interruptible wait woken by it.
+            if interruptible:
+                self._interrupted = False
+
+        self.check()
+
+        return not _woken
+
+
+def cancel_all(exception=ServerTerminationEncountered):
+    """
+    Cancel every cancellation token currently alive with the specified exception.
+    """
+    with _tokens_lock:
+        _all = list(_tokens)
+
+    for token in _all:
+        token.cancel(exception=exception)
+
+
+def stopped_event(instance):
+    """
+    Retrieve the event that is set whenever the specified bot instance has been stopped.
+    """
+    with _stopped_lock:
+        return _stopped.setdefault(instance.pk, threading.Event())
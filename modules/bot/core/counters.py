@@ -0,0 +1,102 @@
+from settings import BOT_PROPERTY_FLUSH_INTERVAL
+
+from logger import application_logger
+
+from db.connections import thread_connection
+
+from collections import Counter
+
+import threading
+import time
+
+
+logger = application_logger()
+
+
+class PropertyCounters(object):
+    """
+    In-memory bot property usage counters, flushed to the database periodically in a single batched write.
+    """
+    def __init__(self, interval=BOT_PROPERTY_FLUSH_INTERVAL):
+        """
+        Initialize property counters, setting up default variables.
+        """
+        self._counts = Counter()
+        self._interval = interval
+
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _ensure_thread(self):
+        """
+        Ensure the thread used to periodically flush our counters is currently running.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="titandash.counters", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """
+        Flush thread loop, flushing all pending counts every interval.
+        """
+        while True:
+            time.sleep(self._interval)
+
+            try:
+                # Our flush thread is idle for most of its lifetime, the
+                # connection is only kept open while the flush takes place.
+                with thread_connection():
+                    self.flush()
+            # Failing to flush should never stop the flush thread, pending counts
+            # are kept and another attempt is made on the next interval.
+            except Exception:
+                logger.exception("unable to flush bot property counters.")
+
+    def increment(self, statistics, prop):
+        """
+        Increment the specified property for the bot statistics instance by one.
+        """
+        with self._lock:
+            self._counts[(statistics.pk, prop)] += 1
+
+        self._ensure_thread()
+
+    def pending(self, statistics):
+        """
+        Retrieve all pending (not yet flushed) counts for the specified bot statistics instance.
+        """
+        with self._lock:
+            return {name: count for (pk, name), count in self._counts.items() if pk == statistics.pk}
+
+    def flush(self, statistics=None):
+        """
+        Flush all pending counts, or only the counts for the specified bot statistics instance, to the database.
+        """
+        # Local level import of the counter model.
+        # Avoid circular imports.
+        from db.models import BotPropertyCounter
+
+        with self._lock:
+            _flush = Counter({key: count for key, count in self._counts.items() if statistics is None or key[0] == statistics.pk})
+
+            # Remove the counts being flushed from our pending counts
+            # so increments can continue while we write.
+            for key in _flush:
+                del self._counts[key]
+
+        if not _flush:
+            return
+
+        try:
+            BotPropertyCounter.objects.increment(counts=_flush)
+        except Exception:
+            # Unable to write our counts, merge them back into
+            # our pending counts so that they aren't lost.
+            with self._lock:
+                self._counts.update(_flush)
+            raise
+
+
+# Create an instance of the property counters object
+# that can be used throughout the application.
+property_counters = PropertyCounters()
@@ -1,4 +1,5 @@
 from modules.bot.core.globals import Globals
+from modules.bot.core.counters import property_counters
 from modules.bot.core.utilities import in_transition_func
 from modules.bot.core.exceptions import ServerTerminationEncountered, TerminationEncountered
 
@@ -57,16 +58,12 @@ class BotProperty(object):
             """
             Wrap the bot property callable function.
             """
-            # Ensure the application state model is available
-            # locally so we can check for our state when functions are executed.
-            from db.models import ApplicationState
-
             _property = _PROPERTIES[function.__name__]
 
             # Before anything, perform a check to see if our server is still running.
             # Since instances run in separate threads, we need to know if we should
-            # keep executing or not.
-            if ApplicationState.objects.state() is False:
+            # keep executing or not. This is an in-memory check in most cases.
+            if _globals.application_state() is False:
                 # Raise a server termination error. Ensuring we can
                 # catch and log our error properly.
                 raise ServerTerminationEncountered()
@@ -79,31 +76,38 @@ class BotProperty(object):
             # due to a manual termination.
             if bot._should_terminate:
                 raise TerminationEncountered()
-
-            # Ensure instance has its "Props" object updated to ensure
-            # that the bot instance is saved and web sockets are sent.
-            if self.wrap_name:
-                bot.properties.function = _property["name"]
-
-            # Should a transition check take place before
-            # running our function directly.
-            if self.transition:
-                in_transition_func(instance=bot, max_loops=30)
-
-            # Run our function normally once we've added it to our
-            # globally available queueable dictionary.
-            _ret = function(bot, *args, **kwargs)
-
-            # After the function is executed, we should perform
-            # any calculation functionality that's required afterwards.
-            if _property["forceable"] and _property["calculate"]:
-                # Only happens if the function is one of our forceables
-                # and also has a calculate function attached.
-                getattr(bot, _property["calculate"])()
+            # Cancellation token may also be cancelled directly,
+            # through a released termination or server shutdown.
+            bot.token.check()
+
+            # Property assignments made while this function runs are coalesced
+            # into as few instance saves (and web socket signals) as possible.
+            with bot.properties.batch():
+                # Ensure instance has its "Props" object updated to ensure
+                # that the bot instance is saved and web sockets are sent.
+                if self.wrap_name:
+                    bot.properties.function = _property["name"]
+
+                # Should a transition check take place before
+                # running our function directly.
+                if self.transition:
+                    in_transition_func(instance=bot, max_loops=30)
+
+                # Run our function normally once we've added it to our
+                # globally available queueable dictionary.
+                _ret = function(bot, *args, **kwargs)
+
+                # After the function is executed, we should perform
+                # any calculation functionality that's required afterwards.
+                if _property["forceable"] and _property["calculate"]:
+                    # Only happens if the function is one of our forceables
+                    # and also has a calculate function attached.
+                    getattr(bot, _property["calculate"])()
 
             # Increment this bot properties usage on the instances
-            # bot statistics that are available.
-            bot.statistics.bot_statistics.increment_property(prop=function.__name__)
+            # bot statistics that are available. Counts are kept in
+            # memory and flushed to the database periodically.
+            property_counters.increment(statistics=bot.statistics.bot_statistics, prop=function.__name__)
 
             # Return the _ret value only after we've executed
             # the function and incremented the property.
@@ -204,9 +208,12 @@ def not_in_transition(function, max_loops=30):
     return wrapped
 
 
-def wait_afterwards(function, floor, ceiling):
+def wait_afterwards(function, floor, ceiling, token=None, deferred=None):
     """
     Delay a function after it's been called for a random amount of seconds between the specified floor and ceiling.
+
+    When a cancellation token is specified, the delay is interruptible and ends early when the token is signalled,
+    when a deferred queue is also specified, any pending deferred tasks are executed within the delay.
     """
     @wraps(function)
     def wrapped(*args, **kwargs):
@@ -214,6 +221,11 @@ def wait_afterwards(function, floor, ceiling):
         function(*args, **kwargs)
         if ceiling:
             # Wait for a random amount of time after function finishes execution.
-            time.sleep(random.randint(floor, ceiling))
+            if token and deferred is not None:
+                deferred.run(seconds=random.randint(floor, ceiling), token=token)
+            elif token:
+                token.wait(seconds=random.randint(floor, ceiling), interruptible=True)
+            else:
+                time.sleep(random.randint(floor, ceiling))
 
     return wrapped
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+
+import itertools
+import threading
+import time
+
+
+class DeferredQueue(object):
+    """
+    Per instance deferred work queue, low priority tasks are executed within idle windows (post action waits).
+
+    Tasks are only started when their expected duration fits within the time remaining in the current window, any
+    tasks that do not fit (or are not reached) spill over into the next window. Tasks deferred with a key replace
+    any pending task using the same key, ensuring recurring work is only ever queued once.
+    """
+    def __init__(self, logger):
+        """
+        Initialize deferred queue, setting up default variables.
+        """
+        self._tasks = OrderedDict()
+        self._durations = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+        self.logger = logger
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def defer(self, func, *args, key=None, **kwargs):
+        """
+        Defer the specified function until the next idle window is available.
+        """
+        with self._lock:
+            if key is not None and key in self._tasks:
+                # Keyed tasks keep their position in the queue,
+                # only the arguments used are replaced.
+                self._tasks[key] = (func, args, kwargs)
+            else:
+                self._tasks[key if key is not None else next(self._counter)] = (func, args, kwargs)
+
+    def _next(self, remaining):
+        """
+        Retrieve and remove the first pending task whose expected duration fits within the remaining seconds.
+        """
+        with self._lock:
+            for key, (func, args, kwargs) in self._tasks.items():
+                if self._durations.get(func.__name__, 0.0) <= remaining:
+                    del self._tasks[key]
+                    return func, args, kwargs
+
+        return None
+
+    def run(self, seconds, token):
+        """
+        Run pending tasks within an idle window of the specified length, waiting out any time that remains afterwards.
+        """
+        _deadline = time.time() + seconds
+
+        while not token.interrupted:
+            _task = self._next(remaining=_deadline - time.time())
+
+            if _task is None:
+                break
+
+            func, args, kwargs = _task
+            _start = time.time()
+
+            try:
+                func(*args, **kwargs)
+            # Deferred tasks are low priority, a failure should never
+            # stop the bot, we only log the error encountered.
+            except Exception:
+                self.logger.exception("deferred task: {task} failed.".format(task=func.__name__))
+
+            # Keep a moving average of each tasks duration, used
+            # to determine whether or not a task fits in a window.
+            _duration = time.time() - _start
+            self._durations[func.__name__] = (self._durations.get(func.__name__, _duration) + _duration) / 2
+
+        # Wait out the remainder of our window, released functions
+        # and terminations will still wake us up right away.
+        return token.wait(seconds=max(_deadline - time.time(), 0.0), interruptible=True)
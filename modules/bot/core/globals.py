@@ -1,9 +1,12 @@
-from modules.bot.core.exceptions import FailsafeException
+from modules.bot.core.exceptions import FailsafeException, ServerTerminationEncountered
+from modules.bot.core.cancellation import cancel_all
 
 from pyautogui import failSafeCheck, FailSafeException as PyAutoGuiFailsafeException
 
 from cachetools import TTLCache
 
+import threading
+
 
 # Create our caching object that will persist objects
 # within memory for five seconds, we can make use of this
@@ -11,6 +14,11 @@ from cachetools import TTLCache
 # constantly taking place when performing clicks or intensive functions.
 _cache = TTLCache(maxsize=10, ttl=5)
 
+# Create our in-process application state event, this is set whenever
+# the application server is being shutdown within this process, allowing
+# bot instances to check the state without any database queries.
+_shutdown = threading.Event()
+
 
 class Globals(object):
     """
@@ -21,6 +29,7 @@ class Globals(object):
         Initialize globals checker.
         """
         self._cache_key = "GLOBALS"
+        self._state_key = "STATE"
 
     @staticmethod
     def _get_globals():
@@ -35,11 +44,22 @@ class Globals(object):
         # Acting as a (singleton).
         return GlobalConfiguration.objects.grab()
 
-    def _set_cache(self, value):
+    @staticmethod
+    def _get_state():
+        """
+        Retrieve a fresh application state value from the database.
+        """
+        # Local level import of the application state model.
+        # Avoid circular import issues with model.
+        from db.models import ApplicationState
+
+        return ApplicationState.objects.state()
+
+    def _set_cache(self, value, key=None):
         """
         Set our cache key to the specified value.
         """
-        _cache[self._cache_key] = value
+        _cache[key or self._cache_key] = value
 
         # Let's also return the last cached value
         # for use after caching.
@@ -54,6 +74,36 @@ class Globals(object):
         except KeyError:
             return self._set_cache(value=self._get_globals())
 
+    def set_application_state(self, state):
+        """
+        Publish the application state within this process, instances will see the new state right away.
+        """
+        if state:
+            _shutdown.clear()
+        else:
+            _shutdown.set()
+
+            # Wake up any bot instances that are currently waiting,
+            # they should exit right away once the server is shutdown.
+            cancel_all(exception=ServerTerminationEncountered)
+
+        self._set_cache(value=state, key=self._state_key)
+
+    def application_state(self):
+        """
+        Return whether or not the application server is still active.
+
+        The in-process state is always checked first, the database value is only checked once the
+        cached value has expired, this handles the state being changed from a different process.
+        """
+        if _shutdown.is_set():
+            return False
+
+        try:
+            return _cache[self._state_key]
+        except KeyError:
+            return self._set_cache(value=self._get_state(), key=self._state_key)
+
     def failsafe_enabled(self):
         """
         Return whether or not failsafe functionality is enabled.
@@ -0,0 +1,241 @@
+from settings import LOG_FILE_MAX_BYTES, LOG_FILE_BACKUP_COUNT, LOG_STRUCTURED_INDEX_INTERVAL
+
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from datetime import datetime
+
+import threading
+import logging
+import atexit
+import shutil
+import queue
+import gzip
+import json
+import os
+
+
+def _gzip_namer(name):
+    """
+    Name rotated log files, rotated log files are always compressed.
+    """
+    return name + ".gz"
+
+
+def _gzip_rotator(source, destination):
+    """
+    Rotate a log file, compressing the source log file into the destination.
+    """
+    with open(source, "rb") as _source, gzip.open(destination, "wb") as _destination:
+        shutil.copyfileobj(_source, _destination)
+
+    os.remove(source)
+
+
+def rotating_file_handler(filename):
+    """
+    Create a new file handler for the specified file, rotating and compressing the file once it grows too large.
+    """
+    handler = RotatingFileHandler(filename, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUP_COUNT, delay=True)
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+
+    return handler
+
+
+class StructuredFileHandler(logging.FileHandler):
+    """
+    Structured log file handler, each record is written as a single json line with our structured fields present.
+
+    A compact inverted index is kept alongside the file, mapping each event type and function to the byte offsets of
+    their records (delta encoded). Records can then be queried without scanning the entire file.
+    """
+    fields = ("event", "function")
+
+    def __init__(self, filename, instance, interval=LOG_STRUCTURED_INDEX_INTERVAL):
+        """
+        Initialize the handler with the instance name attached to each record written.
+        """
+        super(StructuredFileHandler, self).__init__(filename, encoding="utf-8", delay=True)
+
+        self.instance = instance
+        self.interval = interval
+        self.index_file = self.baseFilename + ".idx"
+
+        self._position = os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+        self._index = {field: {} for field in self.fields}
+        self._pending = 0
+
+    def _open(self):
+        """
+        Open our log file, newlines are never translated so record offsets are always exact.
+        """
+        return open(self.baseFilename, self.mode, encoding=self.encoding, newline="")
+
+    def structure(self, record):
+        """
+        Structure the specified record, retrieving the fields written for the record.
+        """
+        return {
+            "time": datetime.fromtimestamp(record.created).strftime("%Y-%m-%dT%H:%M:%S.%f"),
+            "level": record.levelname,
+            "instance": self.instance,
+            "function": record.funcName,
+            "event": getattr(record, "event", "log"),
+            "duration": getattr(record, "duration", None),
+            "image": getattr(record, "image", None),
+            "key": getattr(record, "key", None),
+            "message": getattr(record, "structured_message", record.getMessage()),
+            "exception": getattr(record, "structured_exception", None)
+        }
+
+    def emit(self, record):
+        """
+        Emit function fired whenever a log is sent, writing the record and adding it to our index.
+        """
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+
+            _structured = self.structure(record=record)
+            _line = json.dumps(_structured, default=str) + "\n"
+
+            for field in self.fields:
+                self._index[field].setdefault(_structured[field], []).append(self._position)
+
+            self.stream.write(_line)
+            self.flush()
+
+            self._position += len(_line.encode(self.encoding))
+            self._pending += 1
+
+            if self._pending >= self.interval:
+                self.save()
+        except Exception:
+            self.handleError(record)
+
+    def save(self):
+        """
+        Save our index alongside the log file, offsets are stored as the difference from the previous offset.
+        """
+        _index = {"position": self._position}
+
+        for field in self.fields:
+            _index[field] = {
+                value: [offset - previous for offset, previous in zip(offsets, [0] + offsets[:-1])]
+                for value, offsets in self._index[field].items()
+            }
+
+        # Writing to a temporary file first, ensuring readers
+        # never encounter an incomplete index.
+        with open(self.index_file + ".tmp", "w") as file:
+            json.dump(_index, file, separators=(",", ":"))
+
+        os.replace(self.index_file + ".tmp", self.index_file)
+
+        self._pending = 0
+
+    def close(self):
+        """
+        Close the handler, saving our index one last time.
+        """
+        try:
+            if self._pending:
+                self.save()
+        except OSError:
+            pass
+
+        super(StructuredFileHandler, self).close()
+
+
+class InstanceQueueHandler(QueueHandler):
+    """
+    Queue handler attached to each instance logger, records are handled by the log listener using the instances own handlers.
+    """
+    def __init__(self, queue, handlers):
+        """
+        Initialize the handler with the handlers used by the log listener for each queued record.
+        """
+        super(InstanceQueueHandler, self).__init__(queue=queue)
+
+        self.handlers = handlers
+        # File name of our file handler is available directly, so that
+        # the log file can still be attached to an instances session.
+        self.baseFilename = next((handler.baseFilename for handler in handlers if isinstance(handler, logging.FileHandler)), None)
+
+    def prepare(self, record):
+        """
+        Prepare the record for queueing, keeping the message and any exception separately for our structured logs.
+        """
+        # Preparing a record merges (and on newer python versions, also clears) any
+        # exception information, our structured fields are determined beforehand.
+        record.structured_message = record.getMessage()
+        record.structured_exception = record.exc_text or (logging.Formatter().formatException(record.exc_info) if record.exc_info else None)
+
+        return super(InstanceQueueHandler, self).prepare(record=record)
+
+    def enqueue(self, record):
+        """
+        Enqueue the record alongside the handlers that should handle it.
+        """
+        self.queue.put_nowait((self.handlers, record))
+
+    def close(self):
+        """
+        Close the handler, our handlers are closed once every record queued before now has been handled.
+        """
+        if self.handlers:
+            self.queue.put_nowait((self.handlers, None))
+            self.handlers = []
+
+        super(InstanceQueueHandler, self).close()
+
+
+class LogListener(QueueListener):
+    """
+    Single background log listener, handling the records queued by every instance logger.
+
+    Instance loggers only ever enqueue their records, so writing records to disk (or to a stream) never blocks a bot.
+    """
+    def __init__(self):
+        """
+        Initialize log listener, setting up default variables.
+        """
+        super(LogListener, self).__init__(queue.Queue())
+
+        self._lock = threading.Lock()
+
+    def _ensure_thread(self):
+        """
+        Ensure the thread used to handle our queued records is currently running.
+        """
+        with self._lock:
+            if self._thread is None:
+                self.start()
+                # Any records still queued are handled
+                # before the application exits.
+                atexit.register(self.stop)
+
+    def handler(self, handlers):
+        """
+        Create a new queue handler, records enqueued are handled by the specified handlers.
+        """
+        self._ensure_thread()
+
+        return InstanceQueueHandler(queue=self.queue, handlers=handlers)
+
+    def handle(self, record):
+        """
+        Handle a queued record with the handlers it was queued alongside, closing the handlers when no record is present.
+        """
+        handlers, record = record
+
+        for handler in handlers:
+            if record is None:
+                handler.close()
+            elif record.levelno >= handler.level:
+                handler.handle(record)
+
+
+# Create an instance of the log listener object
+# that can be used throughout the application.
+log_listener = LogListener()
@@ -0,0 +1,143 @@
+from settings import INSTANCE_UPDATE_RATE
+
+from logger import application_logger
+
+from db.connections import thread_connection
+
+import threading
+import time
+import eel
+
+
+logger = application_logger()
+
+
+def diff(previous, current, path=()):
+    """
+    Generate the field level differences between two json states, each difference is a [path, value] pair.
+    """
+    _patch = []
+
+    for key, value in current.items():
+        _previous = previous.get(key)
+
+        # Nested objects are compared field by field, anything
+        # else is replaced entirely whenever it has changed.
+        if isinstance(value, dict) and isinstance(_previous, dict):
+            _patch.extend(diff(previous=_previous, current=value, path=path + (key,)))
+        elif key not in previous or value != _previous:
+            _patch.append([list(path + (key,)), value])
+
+    return _patch
+
+
+class InstanceNotifier(object):
+    """
+    Send bot instance changes to the frontend as versioned patches, coalescing any changes made in between.
+
+    Only the fields that changed since the last patch are sent, each patch increments the instances version. The
+    frontend requests a full resync whenever a version is skipped, or no state is available yet (on reconnect).
+    """
+    def __init__(self, rate=INSTANCE_UPDATE_RATE):
+        """
+        Initialize instance notifier, setting up default variables.
+        """
+        self._interval = 1 / rate
+
+        self._pending = {}
+        self._states = {}
+        self._versions = {}
+        self._sent = {}
+
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._thread = None
+
+    def _ensure_thread(self):
+        """
+        Ensure the thread used to send our patches is currently running.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="titandash.notifier", daemon=True)
+                    self._thread.start()
+
+    def notify(self, instance):
+        """
+        Notify the frontend of changes made to the specified instance, changes are sent on the next available interval.
+        """
+        with self._lock:
+            self._pending[instance.pk] = instance
+
+        self._ensure_thread()
+        self._event.set()
+
+    def _run(self):
+        """
+        Notifier thread loop, sending a patch for each pending instance at most once every interval.
+        """
+        while True:
+            self._event.wait()
+            self._event.clear()
+
+            while self._pending:
+                try:
+                    # Instance json may require related rows, the connection
+                    # is only kept open while our patches are being sent.
+                    with thread_connection():
+                        self._send()
+                # Failing to send should never stop the notifier thread,
+                # the frontend resyncs once a version has been skipped.
+                except Exception:
+                    logger.exception("unable to send instance patches.")
+
+                time.sleep(self._interval)
+
+    def _send(self):
+        """
+        Send a patch for every pending instance that hasn't been sent a patch within the current interval.
+        """
+        _now = time.time()
+
+        with self._lock:
+            _instances = [instance for pk, instance in self._pending.items() if _now - self._sent.get(pk, 0) >= self._interval]
+
+            for instance in _instances:
+                del self._pending[instance.pk]
+
+        for instance in _instances:
+            _current = instance.json()
+
+            with self._lock:
+                _patch = diff(previous=self._states.get(instance.pk, {}), current=_current)
+
+                if not _patch:
+                    continue
+
+                self._states[instance.pk] = _current
+                self._versions[instance.pk] = self._versions.get(instance.pk, 0) + 1
+                self._sent[instance.pk] = _now
+
+                _version = self._versions[instance.pk]
+
+            eel.base_instance_patched(instance.pk, _version, _patch)
+
+    def resync(self, instance):
+        """
+        Retrieve the full state and current version of the specified instance, patches sent afterwards apply to this state.
+        """
+        with self._lock:
+            if instance.pk not in self._states:
+                self._states[instance.pk] = instance.json()
+                self._versions[instance.pk] = self._versions.get(instance.pk, 0) + 1
+
+            return {
+                "version": self._versions[instance.pk],
+                "data": self._states[instance.pk]
+            }
+
+
+# Create an instance of the instance notifier object
+# that can be used throughout the application.
+instance_notifier = InstanceNotifier()
@@ -1,11 +1,43 @@
+from settings import BOT_PROPERTIES_COALESCE_WINDOW
+
+from db.writer import write_behind
+
+from contextlib import contextmanager
+
+import threading
+import time
+
 # Create a tuple of base fields that we can safely use to use proper
 # super calls within our properties class.
-__base__ = ("fields", "instance", "logger")
+__base__ = ("fields", "instance", "logger", "lock", "local", "states", "timer")
+
+
+class PropertiesState(object):
+    """
+    Pending assignments made through our properties by a single thread, along with that threads batch nesting levels.
+    """
+    def __init__(self):
+        """
+        Initialize properties state, setting up default variables.
+        """
+        self.dirty = set()
+        self.dirty_since = None
+        # "depth" represents the current batch nesting level,
+        # "atomic" the current atomic batch nesting level.
+        self.depth = 0
+        self.atomic = 0
 
 
 class Properties(object):
     """
     Dynamic property container used to encapsulate the ability to set values on our instance and also perform a save call.
+
+    Assignments are tracked as dirty fields, outside of a batch they are written right away, inside of a batch they are
+    coalesced into a single write (and a single websocket signal) once the batch is exited, or once the coalesce window
+    has passed since the first pending assignment.
+
+    Bot properties may be executed from multiple threads at once, each thread tracks its own assignments and batches,
+    so one thread never flushes the assignments of another threads atomic batch.
     """
     def __init__(self, instance, logger):
         """
@@ -18,6 +50,13 @@ class Properties(object):
         self.fields = [field.name for field in BotInstance._meta.get_fields() if not field.name.startswith("_")]
         self.instance = instance
 
+        # Each thread has its own state, every state is also available
+        # so that expired assignments can be flushed in the background.
+        self.lock = threading.RLock()
+        self.local = threading.local()
+        self.states = []
+        self.timer = None
+
         # Setup initialized logger and ensure we log some debugging information
         # to display all properties that are available.
         self.logger = logger
@@ -54,6 +93,119 @@ class Properties(object):
             setattr(self.instance, key, value)
             # Log debugging information about property set.
             self.logger.debug("property: {key} set: {value}".format(key=key, value=value))
-            # Calling save on the instance handles the actual firing of our
-            # websocket signal.
-            self.instance.save()
+
+            _state = self._thread_state()
+
+            with self.lock:
+                if not _state.dirty:
+                    _state.dirty_since = time.time()
+                _state.dirty.add(key)
+
+                # Flush right away when we aren't within a batch, or when our pending assignments have been
+                # waiting longer than our coalesce window (atomic batches only ever flush on exit).
+                _flush = not _state.depth or not _state.atomic and time.time() - _state.dirty_since >= BOT_PROPERTIES_COALESCE_WINDOW
+
+            if _flush:
+                self.flush()
+            else:
+                self._schedule()
+
+    def _thread_state(self):
+        """
+        Retrieve the state used by the current thread, creating it when the thread has no state yet.
+        """
+        _state = getattr(self.local, "state", None)
+
+        if _state is None:
+            _state = self.local.state = PropertiesState()
+
+            with self.lock:
+                self.states.append(_state)
+
+        return _state
+
+    def _schedule(self):
+        """
+        Schedule a background flush of any assignments still pending once our coalesce window has passed.
+        """
+        with self.lock:
+            if self.timer is None:
+                self.timer = threading.Timer(BOT_PROPERTIES_COALESCE_WINDOW, self._expire)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def _expire(self):
+        """
+        Flush the pending assignments of every state whose coalesce window has passed, outside of any atomic batch.
+        """
+        with self.lock:
+            self.timer = None
+
+            _now = time.time()
+            _expired = [state for state in self.states if state.dirty and not state.atomic and _now - state.dirty_since >= BOT_PROPERTIES_COALESCE_WINDOW]
+            _remaining = any(state.dirty for state in self.states if state not in _expired)
+
+        for state in _expired:
+            self.flush(state=state)
+
+        # Assignments that haven't expired yet (or are within
+        # an atomic batch) are checked again later on.
+        if _remaining:
+            self._schedule()
+
+    def flush(self, state=None):
+        """
+        Persist all dirty fields through our write behind layer in a single write, and fire our websocket signal.
+        """
+        _state = state or self._thread_state()
+
+        # Taking a snapshot of our dirty fields, assignments
+        # made afterwards are included with the next flush.
+        with self.lock:
+            if not _state.dirty:
+                return
+
+            _fields = list(_state.dirty)
+
+            _state.dirty.clear()
+            _state.dirty_since = None
+
+        # Writes are committed in the background, our instance already reflects
+        # the changes, so our frontend can be signalled right away.
+        write_behind.write(obj=self.instance, fields=_fields)
+        self.instance.notify()
+
+    @contextmanager
+    def batch(self, atomic=False):
+        """
+        Coalesce all assignments made within this context into a single save once the outermost batch is exited.
+
+        An atomic batch always flushes its assignments before exiting, regardless of any outer batches, a single
+        flush is always committed within one transaction by our write behind layer.
+        """
+        _state = self._thread_state()
+
+        with self.lock:
+            _state.depth += 1
+            if atomic:
+                _state.atomic += 1
+
+        try:
+            yield self
+
+            # Atomic batches flush as a single write, regardless
+            # of any outer batches that may still be active.
+            if atomic:
+                self.flush()
+        finally:
+            with self.lock:
+                _state.depth -= 1
+                if atomic:
+                    _state.atomic -= 1
+
+                _outermost = not _state.depth
+
+            # Exiting the outermost batch always flushes any
+            # pending assignments, even when an exception is raised.
+            if _outermost:
+                self.flush()
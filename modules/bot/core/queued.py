@@ -0,0 +1,158 @@
+from datetime import datetime
+
+import threading
+import heapq
+
+
+class QueuedHandler(object):
+    """
+    Delayed execution engine for queued functions, releasing each function to its instance once its eta is reached.
+
+    Queued functions are kept in a single heap keyed on their eta, shared by every instance in the application. One
+    timer thread sleeps until the earliest eta is reached and moves due functions into a per instance "ready" list,
+    bot instances only ever need to read from their ready list, no database polling is required.
+    """
+    def __init__(self):
+        """
+        Initialize queued handler, setting up default variables.
+        """
+        self._heap = []
+        self._entries = {}
+        self._ready = {}
+        self._tokens = {}
+
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def _ensure_thread(self):
+        """
+        Ensure the timer thread used to release queued functions is currently running.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="titandash.queued", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """
+        Timer thread loop, release due functions and sleep until the next eta is reached or the heap is modified.
+        """
+        with self._condition:
+            while True:
+                now = datetime.now()
+
+                # Release every function that is currently due, functions that have been
+                # discarded or re-scheduled since being added are skipped silently.
+                while self._heap and self._heap[0][0] <= now:
+                    eta, pk = heapq.heappop(self._heap)
+                    queued = self._entries.get(pk)
+
+                    if queued is None or queued.eta != eta:
+                        continue
+
+                    del self._entries[pk]
+
+                    self._ready.setdefault(queued.instance_id, []).append(queued)
+                    # Wake the bot instance the function was released to.
+                    self._signal(queued=queued)
+
+                # Sleep until the next eta available, or indefinitely when the heap is empty,
+                # adding or discarding a function will always wake us back up.
+                self._condition.wait(timeout=(self._heap[0][0] - now).total_seconds() if self._heap else None)
+
+    def add(self, queued):
+        """
+        Add the specified queued function to the handler, it will be released once its eta is reached.
+
+        Adding a function that is already scheduled will re-schedule it using its current eta.
+        """
+        with self._condition:
+            self._entries[queued.pk] = queued
+            heapq.heappush(self._heap, (queued.eta, queued.pk))
+
+            self._ensure_thread()
+            self._condition.notify_all()
+
+    def discard(self, pk):
+        """
+        Discard the queued function with the specified primary key, whether it is scheduled or already released.
+        """
+        with self._condition:
+            # Scheduled functions are removed lazily from the heap, removing the
+            # entry is enough to ensure the function is never released.
+            self._entries.pop(pk, None)
+
+            for instance, ready in self._ready.items():
+                self._ready[instance] = [queued for queued in ready if queued.pk != pk]
+
+            self._condition.notify_all()
+
+    def reload(self, instance):
+        """
+        Reload all pending queued functions for the specified instance from the database.
+        """
+        # Local level import of the queued function model.
+        # Avoid circular imports.
+        from db.models import QueuedFunction
+
+        with self._condition:
+            # Functions that are already scheduled or released should
+            # be left alone so they are never released more than once.
+            _known = set(self._entries) | {queued.pk for ready in self._ready.values() for queued in ready}
+
+        for queued in QueuedFunction.objects.filter(instance=instance).exclude(pk__in=_known).order_by("eta"):
+            self.add(queued=queued)
+
+    def _signal(self, queued):
+        """
+        Signal the cancellation token registered for the instance that the specified queued function was released to.
+        """
+        token = self._tokens.get(queued.instance_id)
+
+        if token is None:
+            return
+
+        # Terminations take effect right away, any other function
+        # only wakes the instance if it's currently idle.
+        if queued.function == "terminate":
+            token.cancel()
+        else:
+            token.interrupt()
+
+    def register(self, instance, token):
+        """
+        Register the cancellation token that should be signalled when functions are released to the specified instance.
+        """
+        with self._condition:
+            self._tokens[instance.pk] = token
+
+            # Functions may have been released before our token was
+            # registered, make sure they still wake the instance.
+            for queued in self._ready.get(instance.pk, []):
+                self._signal(queued=queued)
+
+    def unregister(self, instance):
+        """
+        Unregister the cancellation token associated with the specified instance.
+        """
+        with self._condition:
+            self._tokens.pop(instance.pk, None)
+
+    def pop(self, instance, functions=None):
+        """
+        Retrieve and remove the next released function for the specified instance, optionally limited to certain functions.
+        """
+        with self._condition:
+            ready = self._ready.get(instance.pk, [])
+
+            for index, queued in enumerate(ready):
+                if functions is None or queued.function in functions:
+                    return ready.pop(index)
+
+        # No released functions are available
+        # for the specified instance.
+        return None
+
+
+# Create an instance of the queued handler object
+# that can be used throughout the application.
+queued_handler = QueuedHandler()
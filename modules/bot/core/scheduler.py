@@ -0,0 +1,180 @@
+from settings import BOT_SCHEDULER_MAX_WORKERS
+
+from db.connections import thread_connection
+
+from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR, EVENT_JOB_MISSED
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.schedulers.background import BackgroundScheduler
+
+import threading
+import time
+
+
+class SchedulerHandler(object):
+    """
+    Process wide function scheduler, every bot instance schedules its interval based functions here.
+
+    Jobs are namespaced by their instance ("<instance>.<function>") so that each instance's jobs can be paused,
+    resumed and removed independently, a single bounded worker pool executes the jobs of every instance.
+    """
+    def __init__(self, max_workers=BOT_SCHEDULER_MAX_WORKERS):
+        """
+        Initialize scheduler handler, setting up default variables.
+        """
+        self._scheduler = BackgroundScheduler(
+            executors={"default": ThreadPoolExecutor(max_workers=max_workers)},
+            job_defaults={"coalesce": True, "max_instances": 1}
+        )
+        self._scheduler.add_listener(self._listener, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED)
+
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._paused = set()
+
+        # Job metrics are derived from the time each job actually
+        # begins execution compared to its scheduled run time.
+        self._started = {}
+        self._metrics = {}
+
+    @staticmethod
+    def _job_id(instance, name):
+        """
+        Generate the namespaced job id used for the specified instance and function name.
+        """
+        return "{instance}.{name}".format(instance=instance.pk, name=name)
+
+    def _ensure_started(self):
+        """
+        Ensure our underlying scheduler is currently running. Lock must be held.
+        """
+        if not self._scheduler.running:
+            self._scheduler.start()
+
+    def _listener(self, event):
+        """
+        Update the metrics of a job whenever it's executed or its execution is missed.
+        """
+        with self._lock:
+            _metrics = self._metrics.get(event.job_id)
+
+            if _metrics is None:
+                return
+
+            if event.code == EVENT_JOB_MISSED:
+                _metrics["missed"] += 1
+                return
+
+            _start = self._started.pop(event.job_id, None)
+
+            if _start is None:
+                return
+
+            # Lag represents how late the job began compared to when it was scheduled,
+            # jitter represents how much that lag changes between consecutive executions.
+            _lag = max(_start - event.scheduled_run_time.timestamp(), 0.0)
+            _jitter = abs(_lag - _metrics["lag"]) if _metrics["runs"] else 0.0
+
+            _metrics["runs"] += 1
+            _metrics["errors"] += 1 if event.code == EVENT_JOB_ERROR else 0
+            _metrics["lag"] = _lag
+            _metrics["max_lag"] = max(_metrics["max_lag"], _lag)
+            _metrics["average_lag"] += (_lag - _metrics["average_lag"]) / _metrics["runs"]
+            _metrics["jitter"] = _jitter
+            _metrics["max_jitter"] = max(_metrics["max_jitter"], _jitter)
+            _metrics["average_jitter"] += (_jitter - _metrics["average_jitter"]) / _metrics["runs"]
+
+    def add(self, instance, name, func, interval):
+        """
+        Schedule the specified function for the instance, jobs are added in a paused state until the instance is resumed.
+        """
+        _job_id = self._job_id(instance=instance, name=name)
+
+        def _wrapped():
+            # Store the time our job actually began
+            # for use when metrics are updated.
+            self._started[_job_id] = time.time()
+
+            # Jobs run within pooled worker threads, make sure the
+            # connection used by the job is closed once it's done.
+            with thread_connection():
+                func()
+
+        with self._lock:
+            self._ensure_started()
+            self._scheduler.add_job(
+                func=_wrapped,
+                trigger=IntervalTrigger(seconds=interval),
+                id=_job_id,
+                name=name,
+                replace_existing=True,
+                next_run_time=None
+            )
+
+            self._jobs.setdefault(instance.pk, set()).add(_job_id)
+            self._paused.add(instance.pk)
+            self._metrics[_job_id] = {
+                "interval": interval,
+                "runs": 0,
+                "errors": 0,
+                "missed": 0,
+                "lag": 0.0,
+                "max_lag": 0.0,
+                "average_lag": 0.0,
+                "jitter": 0.0,
+                "max_jitter": 0.0,
+                "average_jitter": 0.0
+            }
+
+    def pause(self, instance):
+        """
+        Pause every job scheduled for the specified instance.
+        """
+        with self._lock:
+            for _job_id in self._jobs.get(instance.pk, []):
+                self._scheduler.pause_job(job_id=_job_id)
+
+            self._paused.add(instance.pk)
+
+    def resume(self, instance):
+        """
+        Resume every job scheduled for the specified instance.
+        """
+        with self._lock:
+            for _job_id in self._jobs.get(instance.pk, []):
+                self._scheduler.resume_job(job_id=_job_id)
+
+            self._paused.discard(instance.pk)
+
+    def paused(self, instance):
+        """
+        Return whether or not the jobs scheduled for the specified instance are currently paused.
+        """
+        return instance.pk in self._paused
+
+    def remove(self, instance):
+        """
+        Remove every job scheduled for the specified instance.
+        """
+        with self._lock:
+            for _job_id in self._jobs.pop(instance.pk, []):
+                self._scheduler.remove_job(job_id=_job_id)
+                self._started.pop(_job_id, None)
+                self._metrics.pop(_job_id, None)
+
+            self._paused.discard(instance.pk)
+
+    def metrics(self, instance):
+        """
+        Retrieve the current lag and jitter metrics (in seconds) for every job scheduled for the specified instance.
+        """
+        with self._lock:
+            return {
+                self._scheduler.get_job(job_id=_job_id).name: dict(self._metrics[_job_id])
+                for _job_id in self._jobs.get(instance.pk, [])
+            }
+
+
+# Create an instance of the scheduler handler object
+# that can be used throughout the application.
+scheduler_handler = SchedulerHandler()
@@ -0,0 +1,100 @@
+from settings import STAGE_SERIES_FLUSH_INTERVAL
+
+from logger import application_logger
+
+from db.connections import thread_connection
+
+from datetime import datetime
+
+import threading
+import time
+
+
+logger = application_logger()
+
+
+class StageBuffer(object):
+    """
+    In-memory stage series buffer, parsed stages are appended to each sessions stage series periodically in batches.
+
+    Older points are also rolled up into coarser resolutions whenever the buffer is periodically flushed.
+    """
+    def __init__(self, interval=STAGE_SERIES_FLUSH_INTERVAL):
+        """
+        Initialize stage buffer, setting up default variables.
+        """
+        self._points = {}
+        self._interval = interval
+
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _ensure_thread(self):
+        """
+        Ensure the thread used to periodically flush our points is currently running.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="titandash.series", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """
+        Flush thread loop, flushing all pending points and rolling up older points every interval.
+        """
+        # Local level import of the stage series model.
+        # Avoid circular imports.
+        from db.models import StageSeries
+
+        while True:
+            time.sleep(self._interval)
+
+            try:
+                # Our flush thread is idle for most of its lifetime, the
+                # connection is only kept open while the flush takes place.
+                with thread_connection():
+                    self.flush()
+                    StageSeries.objects.downsample()
+            # Failing to flush should never stop the flush thread, pending points
+            # are kept and another attempt is made on the next interval.
+            except Exception:
+                logger.exception("unable to flush stage series.")
+
+    def record(self, session, stage):
+        """
+        Record the specified stage for the session at the current time.
+        """
+        with self._lock:
+            self._points.setdefault((session.pk, session.instance_id), []).append((datetime.now(), stage))
+
+        self._ensure_thread()
+
+    def flush(self, session=None):
+        """
+        Flush all pending points, or only the points for the specified session, to the database.
+        """
+        # Local level import of the stage series model.
+        # Avoid circular imports.
+        from db.models import StageSeries
+
+        with self._lock:
+            _flush = {key: points for key, points in self._points.items() if session is None or key[0] == session.pk}
+
+            # Remove the points being flushed from our pending points
+            # so stages can continue to be recorded while we write.
+            for key in _flush:
+                del self._points[key]
+
+        for (session_id, instance_id), points in _flush.items():
+            try:
+                StageSeries.objects.append(session_id=session_id, instance_id=instance_id, points=points)
+            except Exception:
+                # Unable to write our points, merge them back ahead of
+                # any newer points so that they aren't lost.
+                with self._lock:
+                    self._points[(session_id, instance_id)] = points + self._points.get((session_id, instance_id), [])
+                raise
+
+
+# Create an instance of the stage buffer object
+# that can be used throughout the application.
+stage_buffer = StageBuffer()
@@ -0,0 +1,123 @@
+from settings import LOG_SHIPPING_INTERVAL, LOG_SHIPPING_RATE, LOG_SHIPPING_QUEUE_SIZE, LOG_SUBSCRIPTION_TTL
+
+from collections import Counter, OrderedDict
+
+import threading
+import queue
+import time
+import eel
+
+
+class LogShipper(object):
+    """
+    Ship log records to the frontend in batches, a single shipper thread sends the records queued by every instance.
+
+    Records are only queued for instances the frontend is currently subscribed to. Each instance is rate limited, any
+    records over the limit (or that do not fit within the queue) are dropped and replaced with a single marker record.
+    """
+    def __init__(self, interval=LOG_SHIPPING_INTERVAL, rate=LOG_SHIPPING_RATE, size=LOG_SHIPPING_QUEUE_SIZE, ttl=LOG_SUBSCRIPTION_TTL):
+        """
+        Initialize log shipper, setting up default variables.
+        """
+        self._interval = interval
+        self._rate = rate
+        self._ttl = ttl
+
+        self._queue = queue.Queue(maxsize=size)
+        self._dropped = Counter()
+        self._subscriptions = {}
+        self._allowance = {}
+        self._refilled = {}
+
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _ensure_thread(self):
+        """
+        Ensure the thread used to ship our queued records is currently running.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="titandash.shipper", daemon=True)
+                    self._thread.start()
+
+    def subscribe(self, instance):
+        """
+        Subscribe the frontend to the records of the specified instance (primary key), replacing any other subscription.
+        """
+        with self._lock:
+            self._subscriptions = {instance: time.time() + self._ttl}
+
+    def subscribed(self, instance):
+        """
+        Return whether or not the frontend is currently subscribed to the specified instance (primary key).
+        """
+        return self._subscriptions.get(instance, 0) > time.time()
+
+    def put(self, instance, record):
+        """
+        Queue the specified formatted record for the instance (primary key), records are dropped when the queue is full.
+        """
+        try:
+            self._queue.put_nowait((instance, record))
+        except queue.Full:
+            with self._lock:
+                self._dropped[instance] += 1
+
+        self._ensure_thread()
+
+    def _limit(self, instance, records, now):
+        """
+        Apply our rate limit to the records of an instance, returning the records kept and the amount dropped.
+        """
+        # Token bucket, each instance regains its allowance over the time since
+        # it was last refilled, bursts of up to one second worth of records are allowed.
+        _elapsed = now - self._refilled.get(instance, now)
+        _allowance = min(self._allowance.get(instance, self._rate) + _elapsed * self._rate, self._rate)
+        _kept = int(min(_allowance, len(records)))
+
+        self._allowance[instance] = _allowance - _kept
+        self._refilled[instance] = now
+
+        return records[:_kept], len(records) - _kept
+
+    def _run(self):
+        """
+        Shipper thread loop, shipping all queued records in a single batch per instance every interval.
+        """
+        while True:
+            time.sleep(self._interval)
+
+            _now = time.time()
+            _batches = OrderedDict()
+
+            while True:
+                try:
+                    instance, record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                _batches.setdefault(instance, []).append(record)
+
+            with self._lock:
+                _dropped, self._dropped = self._dropped, Counter()
+
+            for instance in set(_batches) | set(_dropped):
+                _records, _limited = self._limit(instance=instance, records=_batches.get(instance, []), now=_now)
+                _limited += _dropped.get(instance, 0)
+
+                if _limited:
+                    _records.append("... {dropped} record(s) dropped ...".format(dropped=_limited))
+
+                try:
+                    eel.base_logs_emitted(instance, _records)
+                # A frontend may not be available to receive our records,
+                # shipping should continue regardless.
+                except Exception:
+                    pass
+
+
+# Create an instance of the log shipper object
+# that can be used throughout the application.
+log_shipper = LogShipper()
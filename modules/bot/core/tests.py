@@ -0,0 +1,38 @@
+from django.test import SimpleTestCase
+
+from modules.bot.core.utilities import parse_play_time
+
+import datetime
+
+
+class ParsePlayTimeTestCase(SimpleTestCase):
+    """
+    Parse play time test case.
+    """
+    def test_clock(self):
+        """
+        Clock based values include hours, minutes and seconds.
+        """
+        self.assertEqual(parse_play_time("3d 4:10:22"), datetime.timedelta(days=3, hours=4, minutes=10, seconds=22))
+        self.assertEqual(parse_play_time("4:10:22"), datetime.timedelta(hours=4, minutes=10, seconds=22))
+
+    def test_clock_without_hours(self):
+        """
+        Clock based values with two parts are read from the right, as minutes and seconds.
+        """
+        self.assertEqual(parse_play_time("10:22"), datetime.timedelta(minutes=10, seconds=22))
+        self.assertEqual(parse_play_time("1d 10:22"), datetime.timedelta(days=1, minutes=10, seconds=22))
+
+    def test_units(self):
+        """
+        Unit based values are parsed individually.
+        """
+        self.assertEqual(parse_play_time("3d 4h"), datetime.timedelta(days=3, hours=4))
+
+    def test_malformed(self):
+        """
+        Malformed or empty values are never parsed.
+        """
+        self.assertIsNone(parse_play_time("1:2:3:4"))
+        self.assertIsNone(parse_play_time("abc"))
+        self.assertIsNone(parse_play_time(None))
@@ -1,13 +1,14 @@
-from settings import LOCAL_DATA_DIR, LOCAL_DATA_LOG_DIR
+from settings import LOCAL_DATA_DIR, LOCAL_DATA_LOG_DIR, LOG_STRUCTURED
 
 from modules.bot.core.exceptions import TransitionStateError
+from modules.bot.core.shipping import log_shipper
+from modules.bot.core.listener import log_listener, rotating_file_handler, StructuredFileHandler
 
 from string import Formatter
 
 import datetime
 import logging
-import time
-import eel
+import os
 
 
 _format = "[%(asctime)s] %(levelname)s [{instance}] [%(filename)s:%(lineno)s - %(funcName)s()] %(message)s"
@@ -31,7 +32,10 @@ class EelHandler(logging.StreamHandler):
         """
         Emit function fired whenever a log is sent.
         """
-        eel.base_log_emitted(self.instance.pk, self.format(record=record))
+        # Records are only formatted and queued while the frontend
+        # is subscribed, the log shipper sends them in batches.
+        if log_shipper.subscribed(instance=self.instance.pk):
+            log_shipper.put(instance=self.instance.pk, record=self.format(record=record))
 
 
 def bot_logger(instance, configuration):
@@ -57,10 +61,27 @@ def bot_logger(instance, configuration):
 
     _file_name = _generate_file_name(name=instance.slug())
 
-    for handler in [logging.FileHandler(_file_name), logging.StreamHandler(), EelHandler(instance=instance)]:
+    _handlers = [rotating_file_handler(_file_name), logging.StreamHandler()]
+
+    # Structured logs are optionally written alongside our log file,
+    # using the same name with the jsonl extension instead.
+    if LOG_STRUCTURED:
+        _handlers.append(StructuredFileHandler(os.path.splitext(_file_name)[0] + ".jsonl", instance=instance.name))
+
+    for handler in _handlers:
         # Make sure the handler in question has the appropriate formatter and level set.
         handler.setLevel(configuration.logging_level)
         handler.setFormatter(formatter)
+
+    # File and stream handlers are handled by our background listener, the instance
+    # only ever enqueues records, formatted by the handlers once they're handled.
+    _queue_handler = log_listener.handler(handlers=_handlers)
+    _queue_handler.setLevel(configuration.logging_level)
+    _eel_handler = EelHandler(instance=instance)
+    _eel_handler.setLevel(configuration.logging_level)
+    _eel_handler.setFormatter(formatter)
+
+    for handler in [_queue_handler, _eel_handler]:
         # Add the handler to our logger object.
         logger.addHandler(handler)
 
@@ -77,6 +98,15 @@ def bot_logger(instance, configuration):
     return logger
 
 
+def close_logger(logger):
+    """
+    Remove and close every handler present on the logger specified.
+    """
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
 def format_string(string, lower=False):
     """
     Format a string object to a readable format.
@@ -188,6 +218,37 @@ def delta_from_value_string(value):
     return _delta if _delta.total_seconds() > 0 else None
 
 
+def parse_play_time(value):
+    """
+    Attempt to parse the play time statistic into a delta. Values may look like "3d 4:10:22", "4:10:22", "10:22" or "3d 4h".
+    """
+    _kwargs = {"days": 0, "hours": 0, "minutes": 0, "seconds": 0}
+
+    try:
+        for v in value.split():
+            if ":" in v:
+                # Clock based values are always read from the right, hours
+                # are optional, "10:22" is ten minutes and twenty two seconds.
+                _parts = v.split(":")
+                if len(_parts) > 3:
+                    raise ValueError(v)
+                for key, part in zip(["hours", "minutes", "seconds"][-len(_parts):], _parts):
+                    _kwargs[key] = int(part)
+            elif v[-1] in "dhms":
+                _kwargs[{"d": "days", "h": "hours", "m": "minutes", "s": "seconds"}[v[-1]]] = int(v[:-1])
+
+    # Catch any errors that occur on malformed values
+    # and just return a none variable to use as the delta.
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+    _delta = datetime.timedelta(**_kwargs)
+
+    # Return our delta if it represents a duration longer than
+    # zero seconds, otherwise we return none similar to above.
+    return _delta if _delta.total_seconds() > 0 else None
+
+
 def in_transition_func(instance, max_loops):
     """
     Attempt to resolve transition state of the game's current state.
@@ -200,7 +261,7 @@ def in_transition_func(instance, max_loops):
         if instance.find_and_click(image=instance.images.generic_app_icon):
             # We did boot up the game... Wait a couple of seconds before
             # continuing to try and resolve the state.
-            time.sleep(5)
+            instance.wait(5)
 
         # Check for any early game or non vip game prompts
         # that may appear on the screen game load after being out of the game.
@@ -234,7 +295,7 @@ def in_transition_func(instance, max_loops):
 
         # Increment loops and wait slightly
         # before trying to resolve again.
-        time.sleep(1)
+        instance.wait(1)
         loops += 1
 
     # Transition state can not be resolved. We need to manually error our of this bot session.
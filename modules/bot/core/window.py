@@ -66,6 +66,9 @@ class Window(object):
         """
         self.hwnd = int(hwnd)
         self.subtract = 0
+        # Cancellation token of the bot instance currently
+        # using this window, used by any waits performed.
+        self.token = None
 
         # Depending on the type of emulator being used, some differences in thr way their window implementation
         # is handled exists, for example, the MEmu emulator includes the x axis value when we try to get the width
@@ -177,6 +180,15 @@ class Window(object):
         # search terms.
         return False
 
+    def _wait(self, seconds):
+        """
+        Wait for the specified amount of seconds, through our cancellation token if one is available.
+        """
+        if self.token:
+            self.token.wait(seconds=seconds)
+        else:
+            time.sleep(seconds)
+
     def click(self, point, clicks=1, interval=0.0, button=Button.LEFT, offset=5, pause=0.0):
         """
         Perform a click on this window in the background.
@@ -204,11 +216,11 @@ class Window(object):
             # Should we sleep for a bit between each click?
             # This differs from the pause amount.
             if interval:
-                time.sleep(interval)
+                self._wait(seconds=interval)
 
         # Should we pause for a bit after clicks have been performed?
         if pause:
-            time.sleep(pause)
+            self._wait(seconds=pause)
 
     def drag(self, start, end, button=Button.LEFT, pause=0.5):
         """
@@ -229,34 +241,37 @@ class Window(object):
         # mouse dragging, button is DOWN after this point.
         win32api.SendMessage(self.hwnd, self.ClickEvent[button.name].value[0], 1, _parameter_start)
 
-        # Determine which direction our mouse dragging will go,
-        # we can go up or down easily, left and right may cause issues.
-        direction = start[1] > end[1]
-        clicks = start[1] - end[1] if direction else end[1] - start[1]
-
-        time.sleep(0.05)
+        try:
+            # Determine which direction our mouse dragging will go,
+            # we can go up or down easily, left and right may cause issues.
+            direction = start[1] > end[1]
+            clicks = start[1] - end[1] if direction else end[1] - start[1]
 
-        for i in range(clicks):
-            # Looping with i for the amount of needed clicks
-            # to complete our entire mouse drag.
-            _parameter = win32api.MAKELONG(start[0], start[1] - i if direction else start[1] + i)
+            # Waits while the button is down are never cancelled, the
+            # drag is always completed once it has been started.
+            time.sleep(0.05)
 
-            # Send another message to drag the mouse down start[1] +/- i.
-            win32api.SendMessage(self.hwnd, self.Event.MOUSE_MOVE.value, 1, _parameter)
+            for i in range(clicks):
+                # Looping with i for the amount of needed clicks
+                # to complete our entire mouse drag.
+                _parameter = win32api.MAKELONG(start[0], start[1] - i if direction else start[1] + i)
 
-            # Sleep slightly after each drag. Ensuring that we don't
-            # drag too quickly and miss our drags.
-            time.sleep(0.001)
+                # Send another message to drag the mouse down start[1] +/- i.
+                win32api.SendMessage(self.hwnd, self.Event.MOUSE_MOVE.value, 1, _parameter)
 
-        time.sleep(0.1)
+                # Sleep slightly after each drag. Ensuring that we don't
+                # drag too quickly and miss our drags.
+                time.sleep(0.001)
 
-        # Send a message to the window to let go of the mouse and to
-        # stop dragging at this point.
-        win32api.SendMessage(self.hwnd, self.Event.MOUSE_MOVE.value, 0, _parameter_end)
+            time.sleep(0.1)
+        finally:
+            # Send a message to the window to let go of the mouse and to
+            # stop dragging at this point, even if the drag has failed.
+            win32api.SendMessage(self.hwnd, self.Event.MOUSE_MOVE.value, 0, _parameter_end)
 
         # Should we pause for a bit after the drag has been completed?
         if pause:
-            time.sleep(pause)
+            self._wait(seconds=pause)
 
     def screenshot(self, region=None):
         """
@@ -2,6 +2,9 @@ from settings import VERSION
 
 from db.models import User, BotInstance
 
+from modules.bot.core.shipping import log_shipper
+from modules.bot.core.notifier import instance_notifier
+
 import eel
 
 
@@ -34,3 +37,19 @@ def base_information():
         data["user"] = None
 
     return data
+
+
+@eel.expose
+def base_log_subscribe(instance):
+    """
+    Subscribe to the log records of the specified instance, subscriptions must be renewed periodically.
+    """
+    log_shipper.subscribe(instance=int(instance))
+
+
+@eel.expose
+def base_instance_resync(instance):
+    """
+    Grab the full state and current version of the specified instance, used whenever an instance patch can't be applied.
+    """
+    return instance_notifier.resync(instance=BotInstance.objects.get(pk=instance))
@@ -1,4 +1,5 @@
-from db.models import BotInstance, PrestigeStatistics, Prestige
+from db.models import BotInstance, PrestigeStatistics, Prestige, StatisticsAggregate
+from db.utilities import datatable, summarize_prestiges
 
 import eel
 
@@ -16,7 +17,7 @@ def prestiges_information(selected_instance=None):
         return {
             "pk": instance.pk,
             "name": instance.name,
-            "prestiges": PrestigeStatistics.objects.grab(instance=instance).json()
+            "prestiges": PrestigeStatistics.objects.prefetched(instance=instance).json()
         }
 
     # Otherwise, go ahead with normal functionality
@@ -29,9 +30,44 @@ def prestiges_information(selected_instance=None):
         dct["instances"].append({
             "pk": instance.pk,
             "name": instance.name,
-            "prestiges": PrestigeStatistics.objects.grab(instance=instance).json()
+            "prestiges": PrestigeStatistics.objects.prefetched(instance=instance).json()
         })
 
     # Return our dictionary once all instances and their
     # appropriate information is available.
     return dct
+
+
+@eel.expose
+def prestiges_datatable(selected_instance, request):
+    """
+    Grab a single page of prestiges for a specific instance, based on the server side processing request sent by a datatable.
+    """
+    instance = BotInstance.objects.get(pk=selected_instance)
+
+    total, filtered, page = datatable(
+        queryset=Prestige.objects.filter(instance=instance).select_related("session"),
+        request=request,
+        columns=["pk", "session__uuid", "timestamp", "duration", "stage", None],
+        search_fields=["session__uuid", "stage", "artifact__name"],
+        date_field="timestamp"
+    )
+
+    if (request.get("search") or {}).get("value") or request.get("dateFrom") or request.get("dateTo"):
+        # Summary information is derived from the
+        # filtered prestiges, using a single query.
+        summary = summarize_prestiges(queryset=filtered)
+        records = summary["count"]
+    else:
+        # Otherwise, our precomputed aggregates already
+        # represent every prestige available.
+        summary = StatisticsAggregate.objects.existing(instance_id=instance.pk).json()
+        records = total
+
+    return {
+        "draw": request.get("draw"),
+        "recordsTotal": total,
+        "recordsFiltered": records,
+        "summary": summary,
+        "data": [prestige.json() for prestige in page]
+    }
@@ -1,4 +1,11 @@
-from db.models import BotInstance, SessionStatistics
+from settings import LOG_PAGE_MAX_LENGTH, LOG_QUERY_MAX_RESULTS
+
+from db.models import BotInstance, SessionStatistics, Session
+from db.utilities import datatable, datetime_json
+
+from django.db.models import Count, F, Q, DurationField, ExpressionWrapper
+
+from datetime import datetime, timedelta
 
 import eel
 
@@ -16,7 +23,7 @@ def sessions_information(selected_instance=None):
         return {
             "pk": instance.pk,
             "name": instance.name,
-            "sessions": SessionStatistics.objects.grab(instance=instance).json()
+            "sessions": SessionStatistics.objects.prefetched(instance=instance).json()
         }
 
     # Otherwise, go ahead with normal functionality
@@ -29,9 +36,97 @@ def sessions_information(selected_instance=None):
         dct["instances"].append({
             "pk": instance.pk,
             "name": instance.name,
-            "sessions": SessionStatistics.objects.grab(instance=instance).json()
+            "sessions": SessionStatistics.objects.prefetched(instance=instance).json()
         })
 
     # Return our dictionary once all instances and their
     # appropriate information is available.
     return dct
+
+
+@eel.expose
+def sessions_datatable(selected_instance, request):
+    """
+    Grab a single page of sessions for a specific instance, based on the server side processing request sent by a datatable.
+    """
+    instance = BotInstance.objects.get(pk=selected_instance)
+
+    total, filtered, page = datatable(
+        queryset=Session.objects.filter(instance=instance).annotate(
+            prestige_count=Count("prestige"),
+            elapsed=ExpressionWrapper(F("stopped") - F("started"), output_field=DurationField())
+        ),
+        request=request,
+        columns=["uuid", "started", "stopped", "elapsed", "version", "prestige_count"],
+        search_fields=["uuid", "version"],
+        date_field="started"
+    )
+
+    # Only the information displayed within our table is sent back,
+    # configuration snapshots and prestiges are excluded.
+    return {
+        "draw": request.get("draw"),
+        "recordsTotal": total,
+        "recordsFiltered": filtered.count(),
+        "data": [{
+            "pk": session.pk,
+            "url": session.url,
+            "uuid": session.uuid,
+            "version": session.version,
+            "started": datetime_json(session.started),
+            "stopped": datetime_json(session.stopped),
+            "duration": str(session.duration),
+            "prestiges": session.prestige_count
+        } for session in page]
+    }
+
+
+@eel.expose
+def sessions_log(session, page=0, length=LOG_PAGE_MAX_LENGTH, reverse=True):
+    """
+    Grab a single page of lines from the log file of a specific session, reverse pages begin with the most recent lines.
+    """
+    session = Session.objects.select_related("log").get(pk=session)
+
+    # Sessions may no longer have a log file available,
+    # an empty page is returned in this case.
+    if not session.log or not session.log.exists():
+        return {"data": [], "length": 0, "page": 0, "pages": 0}
+
+    return session.log.page(page=int(page), length=int(length), reverse=reverse)
+
+
+@eel.expose
+def sessions_log_query(selected_instance=None, event=None, function=None, image=None, key=None, days=7, limit=LOG_QUERY_MAX_RESULTS):
+    """
+    Query the structured logs of every session active within the last amount of days specified, most recent sessions first.
+    """
+    _since = datetime.now() - timedelta(days=int(days))
+    _limit = max(1, min(int(limit), LOG_QUERY_MAX_RESULTS))
+    _records = []
+
+    _sessions = Session.objects.select_related("log").filter(Q(stopped__isnull=True) | Q(stopped__gte=_since)).order_by("-started")
+
+    if selected_instance:
+        _sessions = _sessions.filter(instance_id=selected_instance)
+
+    for session in _sessions:
+        if not session.log:
+            continue
+
+        # Each session log is queried through its own index, only the records
+        # for an event or function specified are ever read from the file.
+        for record in session.log.query(
+            event=event, function=function, image=image, key=key,
+            since=_since.strftime("%Y-%m-%dT%H:%M:%S.%f"), limit=_limit - len(_records)
+        ):
+            record["session"] = session.uuid
+            _records.append(record)
+
+        if len(_records) >= _limit:
+            break
+
+    return {
+        "data": _records,
+        "length": len(_records)
+    }
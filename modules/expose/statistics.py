@@ -1,4 +1,6 @@
-from db.models import BotInstance, Statistics
+from db.models import BotInstance, Statistics, StageSeries, GameStatisticsSnapshot
+
+from datetime import datetime
 
 import eel
 
@@ -16,7 +18,7 @@ def statistics_information(selected_instance=None):
         return {
             "pk": instance.pk,
             "name": instance.name,
-            "statistics": Statistics.objects.grab(instance=instance).json()
+            "statistics": Statistics.objects.prefetched(instance=instance).json()
         }
 
     # Otherwise, go ahead with normal functionality
@@ -29,9 +31,32 @@ def statistics_information(selected_instance=None):
         dct["instances"].append({
             "pk": instance.pk,
             "name": instance.name,
-            "statistics": Statistics.objects.grab(instance=instance).json()
+            "statistics": Statistics.objects.prefetched(instance=instance).json()
         })
 
     # Return our dictionary once all instances and their
     # appropriate information is available.
     return dct
+
+
+@eel.expose
+def statistics_stage_series(selected_instance, session=None, start=None, end=None):
+    """
+    Grab the chart ready stage series for a specific instance (or one of its sessions), within an optional time range.
+
+    Start and end are expected to be epoch timestamps (in milliseconds).
+    """
+    return StageSeries.objects.series(
+        instance_id=selected_instance,
+        session_id=session,
+        start=datetime.fromtimestamp(start / 1000) if start else None,
+        end=datetime.fromtimestamp(end / 1000) if end else None
+    )
+
+
+@eel.expose
+def statistics_rates(selected_instance):
+    """
+    Grab the hourly gold earned and titans killed rates for every session of a specific instance.
+    """
+    return GameStatisticsSnapshot.objects.rates(instance=BotInstance.objects.get(pk=selected_instance))
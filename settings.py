@@ -1,7 +1,5 @@
 import os
 import pathlib
-import shutil
-import datetime
 
 # APPLICATION VERSION.
 VERSION = "0.0.1"
@@ -57,6 +55,9 @@ LOCAL_DATA_LOG_DIR = os.path.join(LOCAL_DATA_DIR, "logging")
 # An additional directory is available within the database
 # directory that stores instances of database backups.
 LOCAL_DATA_BACKUP_DIR = os.path.join(LOCAL_DATA_DB_DIR, "backups")
+# Archived sessions are stored as compressed per month
+# files within the archive directory.
+LOCAL_DATA_ARCHIVE_DIR = os.path.join(LOCAL_DATA_DIR, "archive")
 
 # Eel Static Web Directory.
 EEL_WEB = "web"
@@ -83,10 +84,35 @@ EEL_START_OPTIONS = {
 DB_NAME = "titandash.sqlite3"
 DB_FILE = os.path.join(LOCAL_DATA_DB_DIR, DB_NAME)
 
+# Amount of seconds a connection will wait for a lock held by
+# a different connection to be released before giving up.
+DB_BUSY_TIMEOUT = 20
+# Pragmas applied to every new database connection. Write ahead logging allows
+# readers and a writer to work concurrently, "NORMAL" synchronous is safe in WAL mode.
+DB_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", -16000),      # Negative values are in KiB (~16MB).
+    ("mmap_size", 134217728),    # 128MB.
+    ("temp_store", "MEMORY"),
+)
+
+# Hot bot models are written through a single writer thread,
+# pending writes are committed in batches every x seconds.
+DB_WRITE_BEHIND_INTERVAL = 0.25
+# Records that fail to commit are retried on their own, backing off x seconds (doubled with each attempt),
+# and discarded after x attempts. Flushes performed when an instance stops wait at most x seconds.
+DB_WRITE_BEHIND_BACKOFF = 1
+DB_WRITE_BEHIND_MAX_ATTEMPTS = 3
+DB_WRITE_BEHIND_FLUSH_TIMEOUT = 30
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": DB_FILE
+        "NAME": DB_FILE,
+        "OPTIONS": {
+            "timeout": DB_BUSY_TIMEOUT
+        }
     }
 }
 
@@ -109,6 +135,75 @@ TESSERACT_PATH = os.path.join(TESSERACT_DIR, "tesseract.exe")
 
 # Bot Specific Settings.
 DATETIME_FORMAT = "%m/%d/%Y %I:%M:%S %p"
+# Bot property usage counters are kept in memory and flushed
+# to the database every x seconds (and on session end).
+BOT_PROPERTY_FLUSH_INTERVAL = 15
+# Bot instance property assignments made within a batch are coalesced
+# into a single save, unless they've been pending for x seconds.
+BOT_PROPERTIES_COALESCE_WINDOW = 1
+# Interval based bot functions for every instance are executed
+# by a single scheduler, using at most x worker threads.
+BOT_SCHEDULER_MAX_WORKERS = 4
+# Server side datatables never return more than x
+# records for a single page of information.
+DATATABLE_MAX_LENGTH = 100
+# Precomputed statistics aggregates include rolling averages
+# across the last x prestiges.
+STATISTICS_ROLLING_WINDOW = 10
+# Parsed stages are buffered in memory and appended to the stage series
+# every x seconds (and on session end), each row holds at most x points.
+STAGE_SERIES_FLUSH_INTERVAL = 30
+STAGE_SERIES_CHUNK_SIZE = 720
+# Stage series rollups, (from resolution, to resolution, after x seconds), raw points
+# (resolution 0) are rolled into one minute points after a day, and into ten minute points after a week.
+STAGE_SERIES_ROLLUPS = (
+    (0, 60, 86400),
+    (60, 600, 604800),
+)
+# Stage series retrieved through the frontend never contain more than x points.
+STAGE_SERIES_MAX_POINTS = 500
+# Sessions (and their prestiges, logs and log files) that ended more than x days
+# ago are archived and removed, checked every x seconds, x sessions at a time.
+RETENTION_SESSION_DAYS = 90
+RETENTION_INTERVAL = 3600
+RETENTION_BATCH_SIZE = 25
+# Free pages are returned by the database incrementally,
+# at most x pages after each retention batch.
+RETENTION_VACUUM_PAGES = 256
+# Database backups are taken once a day by a background job (checked every x seconds),
+# copying x pages at a time and pausing for x seconds between each step.
+BACKUP_INTERVAL = 3600
+BACKUP_PAGES = 256
+BACKUP_SLEEP = 0.05
+# Backups can be compressed and verified once they are taken,
+# only the x most recent backups are kept.
+BACKUP_COMPRESS = True
+BACKUP_VERIFY = True
+BACKUP_LIMIT = 10
+# Log records are shipped to the frontend in batches every x seconds, at most x records
+# per second for each instance, with at most x records waiting to be shipped.
+LOG_SHIPPING_INTERVAL = 0.1
+LOG_SHIPPING_RATE = 200
+LOG_SHIPPING_QUEUE_SIZE = 10000
+# Log records are only shipped for instances the frontend has subscribed
+# to, subscriptions expire unless renewed within x seconds.
+LOG_SUBSCRIPTION_TTL = 10
+# Instance log files are rotated once they reach x bytes, at most
+# x rotated (and compressed) log files are kept for each log file.
+LOG_FILE_MAX_BYTES = 1024 * 1024 * 10
+LOG_FILE_BACKUP_COUNT = 5
+# Log files are indexed every x lines, reading any line only requires skipping at most x lines,
+# a single page of log lines never contains more than x lines.
+LOG_INDEX_INTERVAL = 1000
+LOG_PAGE_MAX_LENGTH = 1000
+# Structured (jsonl) session logs are written alongside each log file when enabled, their index
+# is saved every x records, a single log query never returns more than x records.
+LOG_STRUCTURED = False
+LOG_STRUCTURED_INDEX_INTERVAL = 500
+LOG_QUERY_MAX_RESULTS = 500
+# Bot instance changes are sent to the frontend as patches,
+# at most x times per second for each instance.
+INSTANCE_UPDATE_RATE = 4
 
 
 def __user_directories():
@@ -119,7 +214,7 @@ def __user_directories():
     We ensure that this function runs before any others, making sure that directories are
     always available where needed.
     """
-    for path in [d for d in [LOCAL_DATA_DIR, LOCAL_DATA_DB_DIR, LOCAL_DATA_LOG_DIR, LOCAL_DATA_BACKUP_DIR] if not os.path.exists(d)]:
+    for path in [d for d in [LOCAL_DATA_DIR, LOCAL_DATA_DB_DIR, LOCAL_DATA_LOG_DIR, LOCAL_DATA_BACKUP_DIR, LOCAL_DATA_ARCHIVE_DIR] if not os.path.exists(d)]:
         os.makedirs(path)
 
     # At this point, we can be sure that the database data directories are at least present,
@@ -128,47 +223,4 @@ def __user_directories():
         open(DB_FILE, "w")
 
 
-def __backup_database(limit=10):
-    """
-    Perform required functionality to create database backups (pseudo lazily).
-
-    We only attempt to backup the database when the settings file is imported somewhere. if a backup
-    is not currently available for the current day, we create a new backup.
-    """
-    def create():
-        """
-        Create a new database backup file with the current date appended to the database name.
-        """
-        shutil.copyfile(
-            src=DB_FILE,
-            dst=os.path.join(LOCAL_DATA_BACKUP_DIR, "titandash_{date}.db".format(date=datetime.datetime.now().date().strftime("%Y-%m-%d")))
-        )
-
-    def backup_date(backup):
-        """
-        Given a backup file's name, parse out the date string from the filename.
-        """
-        return datetime.date(*[int(s) for s in backup.split("_")[1].split(".")[0].split("-")])
-
-    # Grab all available backups first.
-    backups = [backup for backup in os.listdir(LOCAL_DATA_BACKUP_DIR) if os.path.isfile(os.path.join(LOCAL_DATA_BACKUP_DIR, backup))]
-
-    # No backups present yet. Let's just create one now.
-    if len(backups) == 0:
-        create()
-    # Some backups are currently present, but the limit has not been hit yet.
-    # Checking if one needs to be created based on the most recent backups date.
-    elif len(backups) < limit:
-        # If the current date is greater than the last available backup, generate
-        # a brand new database backup file.
-        if datetime.datetime.now().date() > backup_date(backup=backups[-1]):
-            create()
-
-            # New backup created, should we also remove a backup now that a new
-            # one has been created?
-            if len(backups) + 1 >= limit:
-                os.remove(path=os.path.join(LOCAL_DATA_BACKUP_DIR, backups[0]))
-
-
 __user_directories()
-__backup_database()
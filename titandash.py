@@ -46,8 +46,9 @@ def close_callback(*args, **kwargs):
 
         logger.info("exiting application now.")
 
-        # Set our active state to the proper value. Using database level
-        # value to ensure different processes can read this value.
+        # Set our active state to the proper value. The state is published in-process
+        # so running instances notice right away, the database level value ensures
+        # different processes can also read this value.
         ApplicationState.objects.set(state=False)
         sys.exit()
 
@@ -82,6 +83,8 @@ class TitandashApplication(object):
         from django.core.management import call_command
         from db.models import ApplicationState
         from db.utilities import generate_models
+        from db.retention import retention_handler
+        from db.backups import backup_handler
 
         # Run the migrate command within django.
         # Making sure our models are upto date.
@@ -95,6 +98,13 @@ class TitandashApplication(object):
         # to be available by default.
         generate_models()
 
+        # Expired sessions are archived and removed
+        # in the background once the server is started.
+        retention_handler.start()
+        # Database backups are also taken in the background,
+        # without blocking the application from starting.
+        backup_handler.start()
+
         _url = EEL_DASHBOARD if User.objects.valid() else EEL_LOGIN
 
         logger.info("starting titandash application with options: '{options}'".format(options={"path": _url, **EEL_START_OPTIONS}))
@@ -14,48 +14,66 @@ $(document).ready(async function() {
         }
     };
 
-    function removeFirstRecord() {
-        // Remove the first available record from the log content.
-        $(".log-record").first().remove();
-    }
+    // Maximum amount of log records present at any
+    // given time, older records are removed first.
+    let maxRecords = 3000;
 
     function currentRecords() {
-        return $(".log-record").length;
+        return panel.elements.content.children(".log-record").length;
     }
 
-    function addRecord(instance, record) {
-        // Only even attempt to add the log record when
+    function addRecords(instance, records) {
+        // Only even attempt to add the log records when
         // the selected instance is the same as the emitted one.
-        if (activeInstance() === instance) {
-            // If there's already the maximum amount of log records present,
-            // go ahead and remove the first one to avoid lagging.
-            if (currentRecords() >= 3000) {
-                removeFirstRecord();
-            }
-            // If no logs are present yet, make sure we remove the initial
-            // text before adding any logs.
-            if (currentRecords() === 0) {
-                panel.elements.initial.hide();
-            }
+        if (activeInstance() !== instance || records.length === 0) {
+            return;
+        }
+        // If no logs are present yet, make sure we remove the initial
+        // text before adding any logs.
+        if (currentRecords() === 0) {
+            panel.elements.initial.hide();
+        }
 
-            let encodedElement = $("<div>");
+        let encodedElement = $("<div>");
+        let html = "";
 
+        // Build the entire batch up front so the records
+        // are added to the panel in a single operation.
+        records.forEach(function(record) {
             // Set the text of our encoded element
             // to the records current state.
             encodedElement.text(record);
 
-            panel.elements.content.append(`
-                <code class="text-dark text-uppercase">
-                    <small>
-                        <strong>${encodedElement.html()}</strong>
-                    </small>
-                 </code>
-                 <br/>
-            `);
+            html += `
+                <div class="log-record">
+                    <code class="text-dark text-uppercase">
+                        <small>
+                            <strong>${encodedElement.html()}</strong>
+                        </small>
+                    </code>
+                </div>
+            `;
+        });
+
+        panel.elements.content.append(html);
+
+        // If there's now more than the maximum amount of log records present,
+        // go ahead and remove the oldest ones to avoid lagging.
+        let excess = currentRecords() - maxRecords;
+        if (excess > 0) {
+            panel.elements.content.children(".log-record").slice(0, excess).remove();
+        }
+
+        // Make sure we auto-scroll to the bottom of the panel
+        // since many logs can be present.
+        panel.elements.body.scrollTop(panel.elements.body.prop("scrollHeight"));
+    }
 
-            // Make sure we auto-scroll to the bottom of the panel
-            // since many logs can be present.
-            panel.elements.body.scrollTop(panel.elements.body.prop("scrollHeight"));
+    function subscribe(instance) {
+        // Log records are only sent for the instance subscribed to,
+        // subscriptions expire unless they are renewed periodically.
+        if (instance !== undefined) {
+            eel.base_log_subscribe(instance)();
         }
     }
 
@@ -77,7 +95,16 @@ $(document).ready(async function() {
     function setupLogPanelHandlers() {
         // Setup the event listeners and handlers used
         // that deal with the log panel.
-        panel.elements.instancesTable.on("click", ".instance-select", initializeLogPanel);
+        panel.elements.instancesTable.on("click", ".instance-select", function() {
+            initializeLogPanel();
+            subscribe($(this).closest("tr").data("pk"));
+        });
+        // Renewing our subscription to the active instance,
+        // this also subscribes once the instances are first loaded.
+        subscribe(activeInstance());
+        setInterval(function() {
+            subscribe(activeInstance());
+        }, 5000);
     }
 
     // Setup all of the handlers associated
@@ -86,9 +113,9 @@ $(document).ready(async function() {
 
     // The initialize function should also be included as a global.
     updateFunctions["initLogs"] = initializeLogPanel;
-    // Make sure the add record function is available as a global
+    // Make sure the add records function is available as a global
     // function so that we can use it elsewhere.
-    updateFunctions["addLog"] = addRecord;
+    updateFunctions["addLogs"] = addRecords;
     // Make sure the clear function is included as a global function
     // as well so we can clear logs from anywhere.
     updateFunctions["clearLogs"] = clearLogs;
@@ -11,6 +11,10 @@ $(document).ready(async function() {
         return await eel.dashboard_queue_function_information(activeInstance())();
     }
 
+    // Countdowns.
+    // Keyed by the primary key of each queued function.
+    let countdowns = {};
+
     let panel = {
         data: await grabData(),
         elements: {
@@ -87,25 +91,75 @@ $(document).ready(async function() {
         });
     }
 
+    /**
+     * Generate a queued function table row, including a live countdown until the functions eta is reached.
+     */
+    function generateQueuedRow(queued) {
+        let tableRow = $(`
+            <tr data-pk="${queued.pk}">
+                <td>${formatString(queued.function)}</td>
+                <td>${queued.queued}</td>
+                <td>${queued.eta} <small class="queued-countdown text-muted"></small></td>
+            </tr>
+        `);
+
+        // Destroy any countdown already present for this queued function
+        // before creating the new one, re-queued functions use a new eta.
+        destroyQueuedCountdown(queued.pk);
+        countdowns[queued.pk] = new Countdown(queued.eta_epoch * 1000, null, tableRow.find(".queued-countdown"));
+
+        return tableRow;
+    }
+
+    /**
+     * Destroy the countdown associated with the specified queued function if one exists.
+     */
+    function destroyQueuedCountdown(pk) {
+        if (countdowns[pk]) {
+            countdowns[pk].destroy();
+            delete countdowns[pk];
+        }
+    }
+
+    /**
+     * Add a single queued function to the queued functions table.
+     */
+    function addQueued(queued) {
+        // Add the row to our table and fade it in afterwords.
+        generateQueuedRow(queued).hide().appendTo(panel.elements.queuedTableBody).fadeIn(100);
+    }
+
+    /**
+     * Remove a single queued function from the queued functions table.
+     */
+    function removeQueued(pk) {
+        destroyQueuedCountdown(pk);
+        // Since we are using the unique primary key associated with a queued
+        // function, we can just look to see if any queued function are present
+        // within the table that match.
+        panel.elements.queuedTableBody.find(`tr[data-pk="${pk}"]`).fadeOut(100, function() {
+            $(this).remove();
+        });
+    }
+
     /**
      * Clear and regenerate the available queued functions within the container for them.
      */
     function generateAvailableQueued() {
-        // Clear out any content present in the table before.
+        // Clear out any content present in the table before,
+        // making sure any running countdowns are destroyed as well.
         panel.elements.queuedTableBody.empty();
 
+        $.each(countdowns, function(pk) {
+            destroyQueuedCountdown(pk);
+        });
+
         // Loop through all current queued functions, adding them to the
         // table that contains all queued for the current instance.
         $(panel.data.queued).each(function(i, v) {
             // Add function to available current queued functions.
             // Note that only the ones that exist on request are shown.
-            panel.elements.queuedTableBody.append(`
-                <tr data-pk="${v.pk}">
-                    <td>${formatString(v.function)}</td>
-                    <td>${v.queued}</td>
-                    <td>${v.eta}</td>
-                </tr>
-            `);
+            panel.elements.queuedTableBody.append(generateQueuedRow(v));
         });
     }
 
@@ -296,4 +350,8 @@ $(document).ready(async function() {
     // Ensure our queue function panel os present within the globally
     // available update functions, so that we can properly update on instance selection change.
     updateFunctions["queueFunction"] = updateQueueFunctions;
+    // Make sure the add and remove queued functions are available as globals
+    // so that our websockets can modify the queued functions table.
+    updateFunctions["addQueued"] = addQueued;
+    updateFunctions["removeQueued"] = removeQueued;
 });
\ No newline at end of file
@@ -5,8 +5,7 @@ $(document).ready(function() {
     // Place all elements that may be needed or used
     // by any of our websocket functionality.
     let elements = {
-        instancesTable: $("#dashboardInstancesTable"),
-        queueFunctionTableBody: $("#dashboardQueueFunctionQueuedTableBody")
+        instancesTable: $("#dashboardInstancesTable")
     };
 
     function updateInstanceState(instance, state) {
@@ -105,8 +104,30 @@ $(document).ready(function() {
         }
     }
 
-    eel.expose(base_instance_updated);
-    function base_instance_updated(pk, data) {
+    // Current state and version of each instance, patches
+    // sent by the server are applied to these states.
+    let instances = {
+        states: {},
+        versions: {},
+        resyncing: {}
+    };
+
+    function applyPatch(state, patch) {
+        // Each patch is a list of [path, value] pairs, setting
+        // the value at the path specified within our state.
+        patch.forEach(function([path, value]) {
+            let target = state;
+            path.slice(0, -1).forEach(function(key) {
+                if (target[key] === null || typeof target[key] !== "object") {
+                    target[key] = {};
+                }
+                target = target[key];
+            });
+            target[path[path.length - 1]] = value;
+        });
+    }
+
+    function instanceUpdated(pk, data) {
         // Whenever the selected instance is updated properly, we can go ahead
         // and try to update the selected instance table.
         let selected = activeInstance();
@@ -120,34 +141,62 @@ $(document).ready(function() {
         }
     }
 
+    async function resyncInstance(pk) {
+        // Retrieve the full state of the instance, used whenever no state is available
+        // yet (reconnect) or a version has been skipped, any patches sent while
+        // we're resyncing are ignored, a later gap simply resyncs again.
+        instances.resyncing[pk] = true;
+
+        try {
+            let resync = await eel.base_instance_resync(pk)();
+
+            instances.states[pk] = resync.data;
+            instances.versions[pk] = resync.version;
+
+            instanceUpdated(pk, instances.states[pk]);
+        } finally {
+            instances.resyncing[pk] = false;
+        }
+    }
+
+    eel.expose(base_instance_patched);
+    function base_instance_patched(pk, version, patch) {
+        if (instances.resyncing[pk]) {
+            return;
+        }
+        // Patches older than our current state have
+        // already been included within that state.
+        if (instances.versions[pk] !== undefined && version <= instances.versions[pk]) {
+            return;
+        }
+        if (instances.states[pk] === undefined || version !== instances.versions[pk] + 1) {
+            resyncInstance(pk);
+            return;
+        }
+
+        applyPatch(instances.states[pk], patch);
+        instances.versions[pk] = version;
+
+        instanceUpdated(pk, instances.states[pk]);
+    }
+
     eel.expose(base_queue_function_remove);
     function base_queue_function_remove(pk) {
-        // Since we are using the unique primary key associated with a queued
-        // function, we can just look to see if any queued function are present
-        // within the table that match.
-        elements.queueFunctionTableBody.find(`tr[data-pk="${pk}"`).fadeOut(100, function() {
-            $(this).remove();
-        });
+        // Removal (and countdown cleanup) is handled by the queue function panel.
+        updateFunctions["removeQueued"](pk);
     }
 
     eel.expose(base_queue_function_add);
     function base_queue_function_add(instance) {
         // Using the unique primary key to add the queued function directly
-        // to the table that contains all functions.
-        let tableRow = $(`
-            <tr data-pk="${instance.pk}" style="display: none;">
-                <td>${formatString(instance.function)}</td>
-                <td>${instance.queued}</td>
-                <td>${instance.eta}</td>
-            </tr>
-        `);
-
-        // Add the row to our table and fade it in afterwords.
-        tableRow.appendTo(elements.queueFunctionTableBody).fadeIn(100);
+        // to the table that contains all functions, a live countdown is included.
+        updateFunctions["addQueued"](instance);
     }
 
-    eel.expose(base_log_emitted);
-    function base_log_emitted(instance, record) {
-        updateFunctions["addLog"](instance, record);
+    eel.expose(base_logs_emitted);
+    function base_logs_emitted(instance, records) {
+        // Log records are shipped in batches, each batch
+        // is added to the log panel in a single operation.
+        updateFunctions["addLogs"](instance, records);
     }
 });
\ No newline at end of file
@@ -10,6 +10,14 @@ $(document).ready(function() {
         prestigesTableContainer: $("#prestigesTableContainer")
     };
 
+    function updateSummary(summary) {
+        // Update the summary information displayed above our table,
+        // summary information represents the currently filtered prestiges.
+        $("#prestigesCount").text(summary.count ? summary.count : "N/A");
+        $("#prestigesAverageDuration").text(summary.average_duration ? summary.average_duration : "N/A");
+        $("#prestigesAverageStage").text(summary.average_stage ? summary.average_stage : "N/A");
+    }
+
     function buildTable(instance) {
         // Build the actual prestiges table.
         // Ensuring we empty the table before anything.
@@ -20,17 +28,28 @@ $(document).ready(function() {
                 <div class="col-sm text-center">
                     <small>Total Prestiges</small>   
                     <br/>
-                    <strong>${instance.prestiges.count ? instance.prestiges.count : "N/A"}</strong> 
+                    <strong id="prestigesCount">N/A</strong> 
                 </div>
                 <div class="col-sm text-center">
                     <small>Average Duration</small>
                     <br/>
-                    <strong>${instance.prestiges.average_duration ? instance.prestiges.average_duration : "N/A"}</strong>
+                    <strong id="prestigesAverageDuration">N/A</strong>
                 </div>
                 <div class="col-sm text-center">
                     <small>Average Stage</small>
                     <br/>
-                    <strong>${instance.prestiges.average_stage ? instance.prestiges.average_stage : "N/A"}</strong>
+                    <strong id="prestigesAverageStage">N/A</strong>
+                </div>
+            </div>
+            <br/>
+            <div class="row">
+                <div class="col-sm">
+                    <small>From</small>
+                    <input type="date" class="form-control form-control-sm" id="prestigesDateFrom">
+                </div>
+                <div class="col-sm">
+                    <small>To</small>
+                    <input type="date" class="form-control form-control-sm" id="prestigesDateTo">
                 </div>
             </div>
             <br/>
@@ -45,23 +64,9 @@ $(document).ready(function() {
                         <th>Artifact</th>
                     </tr>
                 </thead>
-                <tbody>        
+                <tbody></tbody>
+            </table>
         `;
-        for (let prestige of instance.prestiges.prestiges) {
-            html += `
-                <tr>
-                    <td>${prestige.pk}</td>
-                    <td><a href="${prestige.session.url}">${prestige.session.uuid}</a></td>
-                    <td data-order="${prestige.timestamp.epoch}">${prestige.timestamp.formatted}</td>
-                    <td data-order="${prestige.duration.seconds}">${prestige.duration.formatted}</td>
-                    <td>${prestige.stage}</td>
-                    <td>${prestige.artifact ? `<img height="25" width="25" src="${prestige.artifact.image}">` : "N/A"}</td>
-                </tr>   
-            `;
-        }
-        // Ensurwe we include the ending element before appending our
-        // table to the table element.
-        html += "</tbody></table>";
 
         // Add dynamic content to the prestiges table now.
         elements.prestigesTableContainer.append(html);
@@ -71,26 +76,57 @@ $(document).ready(function() {
         // with any additional functionality required.
         let table = $("#prestigesTable");
 
-        // Initialize datatable proper.
-        table.DataTable({
-            searching: false,
+        // Initialize datatable proper. Paging, sorting and filtering
+        // are all processed server side, only a single page is retrieved.
+        let datatable = table.DataTable({
+            serverSide: true,
+            processing: true,
             lengthChange: false,
             pageLength: 50,
             order: [[2, "desc"]],
             columnDefs: [
                 {targets: [5], orderable: false}
-            ]
+            ],
+            columns: [
+                {data: "pk"},
+                {data: "session", render: function(session) {
+                    return `<a href="${session.url}">${session.uuid}</a>`;
+                }},
+                {data: "timestamp.formatted"},
+                {data: "duration.formatted", defaultContent: "N/A"},
+                {data: "stage", defaultContent: "N/A"},
+                {data: "artifact", render: function(artifact) {
+                    return artifact ? `<img height="25" width="25" src="${artifact.image}">` : "N/A";
+                }}
+            ],
+            ajax: function(data, callback) {
+                // Include our date range with the request
+                // sent through to our server side processing.
+                data.dateFrom = $("#prestigesDateFrom").val();
+                data.dateTo = $("#prestigesDateTo").val();
+
+                eel.prestiges_datatable(instance.pk, data)(function(response) {
+                    updateSummary(response.summary);
+                    callback(response);
+                });
+            }
+        });
+
+        // Changing our date range should redraw the table
+        // with the newly filtered prestiges.
+        $("#prestigesDateFrom, #prestigesDateTo").change(function() {
+            datatable.draw();
         });
     }
 
-    async function reloadPrestigesTable(instance, hideAndShow) {
+    function reloadPrestigesTable(instance, hideAndShow) {
         // Reload the prestiges table (or just load). Based on whether or not
         // we are initializing or selecting a different instance. Show information
         // required within the table.
         if (typeof instance !== "object") {
             // Instance is not an object, so it's probably an id of the
-            // instance selected, grab the data we need.
-            instance = await eel.prestiges_information(instance)();
+            // instance selected, the table retrieves its own data.
+            instance = {pk: instance};
         }
 
         if (hideAndShow) {
@@ -111,20 +147,20 @@ $(document).ready(function() {
         }
     }
 
-    function buildPrestigesTable(data) {
+    function buildPrestigesTable(instances) {
         // Build out the prestiges table.
         // We display all prestiges and provide
         // a simple table to view information.
 
         // If multiple instances are currently available, we should display
         // a selector to change the selected instances information.
-        if (data.instances.length > 1) {
+        if (instances.length > 1) {
             // Make sure the container has been properly shown, so that
             // on main display, it can be used by the user.
             elements.prestigesSelectorContainer.show();
             // Update the selector to contain all proper options
             // that can choose from as a user.
-            for (let instance of data.instances) {
+            for (let instance of instances) {
                 elements.prestigesSelectorSelect.append($("<option>", {value: instance.pk, text: instance.name}));
             }
 
@@ -137,7 +173,7 @@ $(document).ready(function() {
 
         // Load the base table with our current information.
         // Regardless of whether or not multiple instances are available.
-        reloadPrestigesTable(data.instances[0]);
+        reloadPrestigesTable(instances[0]);
 
         // Hide our loader and display the table once it's been built
         // out properly and everything is now ready.
@@ -145,13 +181,13 @@ $(document).ready(function() {
     }
 
     async function loadPrestigesTable() {
-        // Load the prestiges table by grabbing the prestiges information
-        // asyynchronously to display all prestiges available.
-        let data = await eel.prestiges_information()();
+        // Load the prestiges table by grabbing the instances available,
+        // prestiges themselves are retrieved a page at a time.
+        let instances = await eel.base_instances_available()();
 
         // Using the data retrieved through eel to ensure
         // that we properly build the table.
-        buildPrestigesTable(data);
+        buildPrestigesTable(instances);
     }
 
     // Run our load prestiges function once everything is ready.
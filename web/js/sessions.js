@@ -16,6 +16,17 @@ $(document).ready(function() {
         elements.sessionsTableContainer.empty();
 
         let html = `
+            <div class="row">
+                <div class="col-sm">
+                    <small>From</small>
+                    <input type="date" class="form-control form-control-sm" id="sessionsDateFrom">
+                </div>
+                <div class="col-sm">
+                    <small>To</small>
+                    <input type="date" class="form-control form-control-sm" id="sessionsDateTo">
+                </div>
+            </div>
+            <br/>
             <table id="sessionsTable" class="table table-sm table-hover">
                 <thead>
                     <tr>
@@ -27,23 +38,9 @@ $(document).ready(function() {
                         <th>Prestiges</th>
                     </tr>
                 </thead>
-                <tbody>        
+                <tbody></tbody>
+            </table>
         `;
-        for (let session of instance.sessions.sessions) {
-            html += `
-                <tr>
-                    <td><a href="${session.url}">${session.uuid}</a></td>
-                    <td data-order="${session.started.epoch}">${session.started.formatted}</td>
-                    <td data-order="${session.stopped.epoch}">${session.stopped.formatted}</td>
-                    <td data-order="${session.duration.seconds}">${session.duration.formatted}</td>
-                    <td>${session.version}</td>
-                    <td>${session.prestiges.length}</td>
-                </tr>   
-            `;
-        }
-        // Ensurwe we include the ending element before appending our
-        // table to the table element.
-        html += "</tbody></table>";
 
         // Add dynamic content to the sessions table now.
         elements.sessionsTableContainer.append(html);
@@ -53,26 +50,51 @@ $(document).ready(function() {
         // with any additional functionality required.
         let table = $("#sessionsTable");
 
-        // Initialize datatable proper.
-        table.DataTable({
-            searching: false,
+        // Initialize datatable proper. Paging, sorting and filtering
+        // are all processed server side, only a single page is retrieved.
+        let datatable = table.DataTable({
+            serverSide: true,
+            processing: true,
             lengthChange: false,
             pageLength: 50,
             order: [[1, "desc"]],
-            columnDefs: [
-                {targets: [5], orderable: false}
-            ]
+            columns: [
+                {data: "uuid", render: function(uuid, type, session) {
+                    return `<a href="${session.url}">${uuid}</a>`;
+                }},
+                {data: "started.formatted"},
+                {data: "stopped.formatted", defaultContent: "N/A"},
+                {data: "duration"},
+                {data: "version"},
+                {data: "prestiges"}
+            ],
+            ajax: function(data, callback) {
+                // Include our date range with the request
+                // sent through to our server side processing.
+                data.dateFrom = $("#sessionsDateFrom").val();
+                data.dateTo = $("#sessionsDateTo").val();
+
+                eel.sessions_datatable(instance.pk, data)(function(response) {
+                    callback(response);
+                });
+            }
+        });
+
+        // Changing our date range should redraw the table
+        // with the newly filtered sessions.
+        $("#sessionsDateFrom, #sessionsDateTo").change(function() {
+            datatable.draw();
         });
     }
 
-    async function reloadSessionsTable(instance, hideAndShow) {
+    function reloadSessionsTable(instance, hideAndShow) {
         // Reload the sessions table (or just load). Based on whether or not
         // we are initializing or selecting a different instance. Show information
         // required within the table.
         if (typeof instance !== "object") {
             // Instance is not an object, so it's probably an id of the
-            // instance selected, grab the data we need.
-            instance = await eel.sessions_information(instance)();
+            // instance selected, the table retrieves its own data.
+            instance = {pk: instance};
         }
 
         if (hideAndShow) {
@@ -93,20 +115,20 @@ $(document).ready(function() {
         }
     }
 
-    function buildSessionsTable(data) {
+    function buildSessionsTable(instances) {
         // Build out the sessions table.
         // We display all sessions and provide
         // a simple table to view information.
 
         // If multiple instances are currently available, we should display
         // a selector to change the selected instances information.
-        if (data.instances.length > 1) {
+        if (instances.length > 1) {
             // Make sure the container has been properly shown, so that
             // on main display, it can be used by the user.
             elements.sessionsSelectorContainer.show();
             // Update the selector to contain all proper options
             // that can choose from as a user.
-            for (let instance of data.instances) {
+            for (let instance of instances) {
                 elements.sessionsSelectorSelect.append($("<option>", {value: instance.pk, text: instance.name}));
             }
 
@@ -119,7 +141,7 @@ $(document).ready(function() {
 
         // Load the base table with our current information.
         // Regardless of whether or not multiple instances are available.
-        reloadSessionsTable(data.instances[0]);
+        reloadSessionsTable(instances[0]);
 
         // Hide our loader and display the table once it's been built
         // out properly and everything is now ready.
@@ -127,13 +149,13 @@ $(document).ready(function() {
     }
 
     async function loadSessionsTable() {
-        // Load the sessions table by grabbing the sessions information
-        // asyynchronously to display all sessions available.
-        let data = await eel.sessions_information()();
+        // Load the sessions table by grabbing the instances available,
+        // sessions themselves are retrieved a page at a time.
+        let instances = await eel.base_instances_available()();
 
         // Using the data retrieved through eel to ensure
         // that we properly build the table.
-        buildSessionsTable(data);
+        buildSessionsTable(instances);
     }
 
     // Run our load sessions function once everything is ready.